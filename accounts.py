@@ -0,0 +1,95 @@
+import sys
+import threading
+
+import pandas as pd
+
+import events
+import storage
+from config import SUGGESTION_FILE, USER_FILE
+
+# --- 설정: 회원 인덱스 ---
+# users.csv를 사번 -> 회원 정보(dict)로 색인해 두고 파일이 바뀔 때만 다시 만든다.
+# 로그인/가입/비밀번호 변경/부서 매핑/계정 삭제가 모두 이 인덱스를 사용한다.
+USER_KEY = '사번'
+USER_COLUMNS = ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"]
+
+_lock = threading.Lock()
+_index = {'sig': None, 'users': {}, 'dept': {}}
+
+
+# --- 함수: 회원 테이블/인덱스 로드 ---
+def load_users():
+    return storage.load_table(USER_FILE, USER_COLUMNS, key=USER_KEY)
+
+
+def _load_index():
+    with _lock:
+        sig = storage.file_signature(USER_FILE)
+        if _index['sig'] != sig or sig[0] is None:
+            index = {}
+            for row in load_users().to_dict('records'):
+                uid = row.get(USER_KEY)
+                if uid is not None and not pd.isna(uid):
+                    # 사번 중복 시 먼저 등록된 행을 사용
+                    index.setdefault(uid, row)
+            dept = {uid: row.get('부서') for uid, row in index.items() if not pd.isna(row.get('부서'))}
+            _index.update({'sig': storage.file_signature(USER_FILE), 'users': index, 'dept': dept})
+        return _index
+
+
+# --- 함수: 조회 ---
+def get_user(user_id):
+    row = _load_index()['users'].get(user_id)
+    return dict(row) if row is not None else None
+
+
+def user_exists(user_id):
+    return user_id in _load_index()['users']
+
+
+def dept_map():
+    return _load_index()['dept']
+
+
+def get_dept(user_id, default="-"):
+    return dept_map().get(user_id, default)
+
+
+# --- 함수: 변경 (행 단위 저널 기록) ---
+def add_user(record):
+    storage.insert_row(USER_FILE, record, key=USER_KEY)
+
+
+def update_user(user_id, changes):
+    storage.update_row(USER_FILE, user_id, changes, key=USER_KEY)
+
+
+def delete_user(user_id):
+    storage.delete_row(USER_FILE, user_id, key=USER_KEY)
+
+
+# --- 일회성 작업: 기존 제안에 작성 당시 부서 기록 ---
+def backfill_suggestion_dept():
+    # 읽기 -> 수정 -> 전체 저장 동안 다른 쓰기를 막음
+    with storage.locked(SUGGESTION_FILE):
+        df = storage.load_table(SUGGESTION_FILE, [])
+        if df.empty or '작성자ID' not in df.columns:
+            return 0
+        # 부서는 범주형으로 읽히므로 새 부서명을 넣을 수 있도록 일반 객체 컬럼으로 변환
+        df['부서'] = df['부서'].astype(object) if '부서' in df.columns else None
+        missing = df['부서'].isna() | (df['부서'].astype(str).str.strip() == "")
+        filled = df.loc[missing, '작성자ID'].map(dept_map())
+        count = int(filled.notna().sum())
+        if count:
+            df.loc[missing, '부서'] = filled
+            storage.save_table(SUGGESTION_FILE, df)
+            events.record_rewrite(SUGGESTION_FILE, df, 'backfill_dept')
+        return count
+
+
+if __name__ == '__main__':
+    # 사용법: python accounts.py backfill-dept
+    if len(sys.argv) > 1 and sys.argv[1] == 'backfill-dept':
+        print(f"{SUGGESTION_FILE}: {backfill_suggestion_dept()}건에 부서를 기록했습니다.")
+    else:
+        print("사용법: python accounts.py backfill-dept")
@@ -1,164 +1,135 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
-import time
+import uuid
 import base64 # 이미지 처리를 위해 추가
 import altair as alt  # 차트 라이브러리 추가
 from datetime import datetime
 from streamlit_quill import st_quill  # 텍스트 에디터
+import storage  # CSV 저장소 (변경 저널)
+import images   # 본문 이미지 저장소
+import ledger   # 사용자별 포인트 원장
+import levels   # 레벨 기준 테이블
+import leaderboard  # 명예의 전당 집계 스냅샷
+import cube     # 부서별 활동 집계 큐브 (부서 x 연 x 월 x 상태)
+import accounts  # 회원 인덱스 (사번 기준)
+import query    # 제안 목록 조회 인덱스
+import uploads  # 첨부파일 저장소 (청크 저장, 해시 중복 제거, 용량 한도)
+import ids      # 프로세스 간 중복 없는 시간순 ID 발급
+import tracing  # 리런 단위 성능 추적 (TPM_TRACE=1 일 때만)
+import schema   # 컬럼 타입 / 데이터 파일 버전 마이그레이션
+import dataservice  # 테이블/인덱스 미리 읽기 + 파일 변경 감시 (서버 프로세스당 하나)
+import auth     # 비밀번호 해시 / 검증 캐시 / 로그인 시도 제한
+import drafts   # 임시 저장 글 (자동 저장, 제출 시 제안 테이블로 이동)
+import events   # 상태 변경 이벤트 로그 (events.jsonl, 추가 전용)
+import grading  # 평가 항목 / 등급 기준
+from levels import load_level_settings
 
 # --- 설정: 페이지 제목 ---
 st.set_page_config(page_title="제조 현장 TPM 통합 시스템", layout="wide")
 
-# --- 파일 및 폴더 경로 설정 ---
-USER_FILE = 'users.csv'           # 회원 정보
-SUGGESTION_FILE = 'suggestions.csv' # 제안제도 데이터
-CIRCLE_FILE = 'circle_activity.csv' # 분임조 데이터
-LEVEL_SETTINGS_FILE = 'level_settings.csv' # 레벨 기준 설정
-UPLOAD_DIR = 'uploads'            # 파일 저장 폴더
-HEADER_IMAGE = 'header_image.png'  # 로그인 화면 상단 이미지
+# --- 파일 및 폴더 경로 설정 (config.py) ---
+from config import (
+    USER_FILE, SUGGESTION_FILE, CIRCLE_FILE, LEVEL_SETTINGS_FILE,
+    UPLOAD_DIR, HEADER_IMAGE, TRACE_LOG_FILE
+)
 
 # --- 초기화: 폴더 생성 ---
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
 # --- 함수: 데이터 로드/저장 ---
-def load_csv(file_path, columns):
-    if not os.path.exists(file_path):
-        df = pd.DataFrame(columns=columns)
-        df.to_csv(file_path, index=False)
-        return df
-    return pd.read_csv(file_path, dtype=str)
+# 로드 시 저널(행 단위 변경 기록)이 원본 CSV 위에 재생되어 반환됨
+# usecols 지정 시 해당 컬럼만 파싱하며, 결과는 파일이 바뀔 때까지 프로세스 전체에서 캐시됨
+@tracing.traced('load_csv')
+def load_csv(file_path, columns, usecols=None):
+    # 프로세스 공유 스냅샷 (읽기 전용: 화면에서 수정할 때는 필터링한 사본 사용)
+    return storage.snapshot(file_path, columns, usecols=usecols)
 
+@tracing.traced('save_csv')
 def save_csv(file_path, df):
-    df.to_csv(file_path, index=False)
-
-def save_uploaded_file(uploaded_file):
-    if uploaded_file is not None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{uploaded_file.name}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        return filename
-    return ""
-
-# --- 함수: 레벨 설정 로드 ---
-def load_level_settings():
-    if not os.path.exists(LEVEL_SETTINGS_FILE):
-        data = {
-            "이모지": ["🌱", "🥉", "🥈", "🥇", "👑"],
-            "등급명": ["새싹", "브론즈", "실버", "골드", "마스터"],
-            "필요점수": [0, 50, 200, 500, 1000]
-        }
-        df = pd.DataFrame(data)
-        df.to_csv(LEVEL_SETTINGS_FILE, index=False)
-        return df
-    
-    df = pd.read_csv(LEVEL_SETTINGS_FILE)
-    # 기존 파일에 '이모지' 컬럼이 없으면 추가 (하위 호환성)
-    if '이모지' not in df.columns:
-        def get_emoji(name):
-            val = str(name)
-            if "새싹" in val: return "🌱"
-            elif "브론즈" in val: return "🥉"
-            elif "실버" in val: return "🥈"
-            elif "골드" in val: return "🥇"
-            elif "마스터" in val: return "👑"
-            else: return "🔹"
-        
-        # '등급명' 컬럼이 있으면 그 앞에, 없으면 맨 앞에 추가
-        loc_idx = df.columns.get_loc('등급명') if '등급명' in df.columns else 0
-        df.insert(loc_idx, '이모지', df['등급명'].apply(get_emoji))
-        
-    return df
+    storage.save_table(file_path, df)
 
-# --- 함수: 등급 이모지 제거 (평가 등급: S, A, B, C) ---
-def add_grade_emoji(grade):
-    if pd.isna(grade) or str(grade).strip() == "": return ""
-    g_str = str(grade)
-    
-    # 구버전 데이터(골드 등)를 신버전(S~C)으로 매핑하여 표시
-    if "골드" in g_str: return "S"
-    if "실버" in g_str: return "A"
-    if "브론즈" in g_str: return "B"
-    if "참가상" in g_str: return "C"
-    
-    # 신버전 데이터 (이미 S, A, B, C인 경우 그대로 반환하거나, 이모지가 포함된 경우 제거)
-    if "S" in g_str: return "S"
-    if "A" in g_str: return "A"
-    if "B" in g_str: return "B"
-    if "C" in g_str: return "C"
-    
-    return g_str
+# --- 함수: 화면에 표시한 행 버전 기억 (동시 수정 검사용) ---
+# 버튼 클릭 시의 재실행에서는 직전 화면(사용자가 보고 판단한 화면)의 버전을 돌려주고,
+# 기록은 이번 화면의 버전으로 갱신한다. 그 사이 다른 사용자가 수정했다면 저장이 거부됨
+def seen_version(row):
+    seen = st.session_state.setdefault('seen_versions', {})
+    current = storage.row_version(row)
+    previous = seen.get(row['ID'], current)
+    seen[row['ID']] = current
+    return previous
+
+STALE_WRITE_MSG = "⚠️ 다른 사용자가 먼저 이 글을 수정했습니다. 최신 내용을 확인한 뒤 다시 시도해주세요."
+
+# --- 함수: 처리 결과 알림 (다음 화면에서 표시) ---
+# 저장/삭제 후 바로 st.rerun() 하면 그 전에 띄운 메시지는 사라지므로, 메시지를 세션에 넣어 두고
+# 다시 그린 화면에서 토스트로 한 번 보여준다. (확인 메시지를 보여주려고 서버 스레드를 재우지 않음)
+FLASH_ICONS = {"success": "✅", "info": "ℹ️", "warning": "⚠️", "error": "🚫"}
+
+def flash(message, kind="success"):
+    st.session_state.setdefault('flash_messages', []).append((kind, message))
+
+def show_flash():
+    for kind, message in st.session_state.pop('flash_messages', []):
+        st.toast(message, icon=FLASH_ICONS.get(kind))
+
+# 첨부파일은 청크 단위로 저장하며 내용 해시로 중복 제거, 크기/용량 한도 초과 시 오류 표시 후 중단
+def save_uploaded_file(uploaded_file, user_id):
+    try:
+        return uploads.save_upload(uploaded_file, user_id)
+    except uploads.UploadError as e:
+        st.error(f"❌ 첨부파일 저장 실패: {e}")
+        st.stop()
 
 # --- 함수: 사용자 레벨 계산 ---
-def calculate_user_level(user_id, suggestions_df, level_df):
-    if suggestions_df.empty:
-        user_points = 0
-    elif '포인트' in suggestions_df.columns:
-        # 포인트 컬럼 숫자 변환 및 합계 (작성자ID 일치 & 채택 상태)
-        valid_points = pd.to_numeric(
-            suggestions_df.loc[
-                (suggestions_df['작성자ID'] == user_id) & (suggestions_df['상태'] == '채택'), 
-                '포인트'
-            ], 
-            errors='coerce'
-        ).fillna(0)
-        user_points = valid_points.sum()
-    else:
-        user_points = 0
-        
-    # 레벨 데이터 숫자 변환
-    level_df['필요점수'] = pd.to_numeric(level_df['필요점수'], errors='coerce')
-    level_df = level_df.sort_values('필요점수', ascending=True)
-    
-    current_level = "새싹" # 기본값
-    next_level_name = "MAX"
-    points_needed = 0
-    next_level_total = user_points
+@tracing.traced('calculate_user_level')
+def calculate_user_level(user_id):
+    # 채택 포인트 합계는 포인트 원장(ledger)에서 조회 (전체 제안 테이블을 다시 합산하지 않음)
+    user_points = ledger.get_user_points(user_id)
     
-    # 레벨 판별 (누적 점수 기준)
-    # 점수가 높은 순이 아니라 낮은 순으로 정렬해서 순차적으로 확인하면, 마지막으로 만족하는 레벨이 현재 레벨임.
-    # 하지만 여기서는 '다음 레벨'을 찾아야 하므로 낮은 순 정렬이 맞음.
-    
-    # 현재 달성한 가장 높은 레벨 찾기
-    passed_levels = level_df[level_df['필요점수'] <= user_points]
-    if not passed_levels.empty:
-        row = passed_levels.iloc[-1]
-        emoji = row['이모지'] if '이모지' in row else ""
-        current_level = f"{emoji} {row['등급명']}"
-        
-    # 다음 레벨 찾기
-    future_levels = level_df[level_df['필요점수'] > user_points]
-    if not future_levels.empty:
-        next_level_row = future_levels.iloc[0]
-        next_level_name = next_level_row['등급명']
-        next_level_total = next_level_row['필요점수']
-        points_needed = next_level_total - user_points
-    else:
-        # 더 이상 레벨이 없는 경우
-        next_level_name = "MAX"
-        points_needed = 0
+    # 레벨 판별은 미리 정렬해 둔 레벨 테이블에서 이진 탐색
+    current_level, next_level_name, points_needed, next_level_total, _ = levels.level_status(
+        user_points, levels.load_level_table()
+    )
             
     return current_level, int(user_points), next_level_name, int(points_needed), int(next_level_total)
 
 # --- 시스템 초기화: 관리자 계정 자동 생성 ---
 def init_admin():
-    users = load_csv(USER_FILE, ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"])
-    if 'administrator' not in users['사번'].values:
+    if not accounts.user_exists('administrator'):
         admin_data = {
             "사번": "administrator",
-            "비밀번호": "admin07@",
+            "비밀번호": auth.hash_password("admin07@"),
             "이름": "시스템관리자",
             "권한": "Root",
             "부서": "관리팀",
             "직책": "관리자",
             "가입날짜": datetime.now().strftime("%y/%m/%d")
         }
-        users = pd.concat([users, pd.DataFrame([admin_data])], ignore_index=True)
-        save_csv(USER_FILE, users)
+        accounts.add_user(admin_data)
+
+# --- 성능 추적: 이번 리런 기록 시작 (종료는 파일 맨 아래) ---
+if 'trace_session' not in st.session_state:
+    st.session_state['trace_session'] = uuid.uuid4().hex[:8]
+tracing.begin_rerun(st.session_state['trace_session'], st.session_state.get('user_id', ""))
+
+
+def trace_context():
+    # 프래그먼트만 다시 실행될 때의 추적 기록용 (세션 ID, 사번)
+    return st.session_state.get('trace_session', ""), st.session_state.get('user_id', "")
+
 
+# 데이터 파일이 구버전이면 한 번 변환 (프로세스당 한 번만 확인)
+schema.ensure_current()
+
+# 서버 프로세스당 한 번: 백그라운드에서 테이블/인덱스를 미리 읽고 파일 변경을 감시
+@st.cache_resource
+def start_data_service():
+    return dataservice.start()
+
+start_data_service()
 init_admin()
 
 # --- 세션 상태 초기화 ---
@@ -206,18 +177,20 @@ def login_page():
         login_pw = st.text_input("비밀번호", type="password", key="login_pw")
         
         if st.button("로그인"):
-            users = load_csv(USER_FILE, ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"])
-            user = users[(users['사번'] == login_id) & (users['비밀번호'] == login_pw)]
-            
-            if not user.empty:
-                st.session_state['logged_in'] = True
-                st.session_state['user_id'] = login_id
-                st.session_state['user_name'] = user.iloc[0]['이름']
-                st.session_state['user_role'] = user.iloc[0]['권한']
-                st.success(f"{user.iloc[0]['이름']}님 환영합니다!")
-                st.rerun()
+            try:
+                user = auth.authenticate(login_id, login_pw, ip=st.context.ip_address or "")
+            except auth.LoginThrottled as e:
+                st.error(f"⏳ {e}")
             else:
-                st.error("사번 또는 비밀번호가 일치하지 않습니다.")
+                if user is not None:
+                    st.session_state['logged_in'] = True
+                    st.session_state['user_id'] = login_id
+                    st.session_state['user_name'] = user['이름']
+                    st.session_state['user_role'] = user['권한']
+                    flash(f"{user['이름']}님 환영합니다!")
+                    st.rerun()
+                else:
+                    st.error("사번 또는 비밀번호가 일치하지 않습니다.")
 
     # [탭 2] 회원가입
     with tab2:
@@ -238,9 +211,7 @@ def login_page():
             submit_signup = st.form_submit_button("가입하기")
             
             if submit_signup:
-                users = load_csv(USER_FILE, ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"])
-                
-                if new_id in users['사번'].values:
+                if accounts.user_exists(new_id):
                     st.error("❌ 이미 가입된 사번(ID)입니다.")
                 elif new_pw != new_pw_chk:
                     st.error("❌ 비밀번호가 서로 일치하지 않습니다.")
@@ -248,12 +219,11 @@ def login_page():
                     st.warning("필수 정보를 모두 입력해주세요.")
                 else:
                     new_user = {
-                        "사번": new_id, "비밀번호": new_pw, "이름": new_name,
+                        "사번": new_id, "비밀번호": auth.hash_password(new_pw), "이름": new_name,
                         "권한": "일반", "부서": new_dept, "직책": new_rank,
                         "가입날짜": datetime.now().strftime("%y/%m/%d")
                     }
-                    users = pd.concat([users, pd.DataFrame([new_user])], ignore_index=True)
-                    save_csv(USER_FILE, users)
+                    accounts.add_user(new_user)
                     st.success("✅ 가입 완료! 로그인해주세요.")
 
     # [탭 3] 비밀번호 변경
@@ -265,17 +235,18 @@ def login_page():
         chg_new_chk = st.text_input("새 비밀번호 확인", type="password", key="chg_chk")
         
         if st.button("비밀번호 변경"):
-            users = load_csv(USER_FILE, ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"])
-            user_idx = users.index[(users['사번'] == chg_id) & (users['비밀번호'] == chg_old_pw)].tolist()
-            
-            if not user_idx:
-                st.error("정보가 일치하지 않습니다.")
-            elif chg_new_pw != chg_new_chk:
-                st.error("새 비밀번호가 일치하지 않습니다.")
+            try:
+                user = auth.authenticate(chg_id, chg_old_pw, ip=st.context.ip_address or "")
+            except auth.LoginThrottled as e:
+                st.error(f"⏳ {e}")
             else:
-                users.at[user_idx[0], '비밀번호'] = chg_new_pw
-                save_csv(USER_FILE, users)
-                st.success("✅ 비밀번호 변경 완료.")
+                if user is None:
+                    st.error("정보가 일치하지 않습니다.")
+                elif chg_new_pw != chg_new_chk:
+                    st.error("새 비밀번호가 일치하지 않습니다.")
+                else:
+                    auth.set_password(chg_id, chg_new_pw)
+                    st.success("✅ 비밀번호 변경 완료.")
     
     # 로그인 화면 하단 로고 이미지 (중심 정렬 - HTML/CSS 사용)
     st.markdown("<br>", unsafe_allow_html=True)  # 여백 추가
@@ -295,6 +266,349 @@ def login_page():
 # ==========================================
 # 2. 메인 애플리케이션
 # ==========================================
+# --- 프래그먼트: 사이드바 레벨/포인트 (포인트 원장과 레벨 테이블만 조회) ---
+@st.fragment
+@tracing.fragment('fragment_level_badge', trace_context)
+def render_level_badge(user_id):
+    try:
+        # 레벨 계산
+        lv_name, total_pts, next_lv, pts_need, next_total = calculate_user_level(user_id)
+
+        st.write(f"**🏅 현재 레벨:** {lv_name}")
+        st.write(f"**💰 총 포인트:** {total_pts} P")
+
+        if next_lv != "MAX":
+            st.caption(f"다음 레벨({next_lv})까지 {pts_need} P 남음")
+
+            # 프로그레스 바 계산
+            # (현재점수 - 이전레벨컷) / (다음레벨컷 - 이전레벨컷)
+            prev_threshold = levels.level_status(total_pts, levels.load_level_table())[4]
+
+            denom = next_total - prev_threshold
+            if denom > 0:
+                progress = (total_pts - prev_threshold) / denom
+            else:
+                progress = 0.0
+
+            st.progress(min(max(progress, 0.0), 1.0))
+        else:
+            st.success("🎉 최고 레벨 달성!")
+
+    except Exception as e:
+        st.error(f"레벨 정보 로드 오류: {e}")
+
+# --- 프래그먼트: 임시 저장 상태 (미뤄 둔 자동 저장을 주기적으로 기록) ---
+# 입력을 멈추면 리런이 없으므로, 마지막 변경은 이 프래그먼트가 AUTOSAVE_INTERVAL초마다 다시 실행되며 기록한다
+@st.fragment(run_every=drafts.AUTOSAVE_INTERVAL)
+@tracing.fragment('fragment_autosave', trace_context)
+def render_autosave_status(user_id):
+    editor = st.session_state.get('draft_editor')
+    try:
+        autosave_state = drafts.flush(editor, user_id)
+    except drafts.DraftError as e:
+        st.warning(f"⚠️ 자동 저장 실패: {e}")
+        return
+    if autosave_state == 'pending':
+        st.caption("✏️ 변경 내용은 잠시 후 자동 저장됩니다.")
+    elif editor and editor['saved_label']:
+        st.caption(f"💾 자동 저장됨 ({editor['saved_label']})")
+
+# --- 함수: 작성 중인 글 기록 (메뉴 이동/로그아웃 시 미뤄 둔 자동 저장을 바로 기록) ---
+def flush_draft(user_id):
+    try:
+        drafts.flush(st.session_state.get('draft_editor'), user_id, force=True)
+    except drafts.DraftError as e:
+        st.warning(f"⚠️ 자동 저장 실패: {e}")
+
+# --- 프래그먼트: 명예의 전당 (집계 스냅샷만 조회) ---
+@st.fragment
+@tracing.fragment('fragment_hall_of_fame', trace_context)
+def render_hall_of_fame():
+    col_hof, col_dept = st.columns([1, 1])
+    
+    # 집계 스냅샷 조회 (채택 포인트가 바뀔 때만 갱신됨)
+    with col_hof:
+        st.markdown("##### 👑 이달의 제안왕 (Top 3)")
+        today = datetime.now()
+        # 이달의 채택된 제안 - 작성자별 합계
+        user_ranks = leaderboard.monthly_top(today.year, today.month, 3)
+        
+        if not user_ranks.empty:
+            for idx, row in user_ranks.iterrows():
+                medal = ["🥇", "🥈", "🥉"][idx] if idx < 3 else ""
+                st.write(f"**{medal} {idx+1}위**: {row['작성자']} ({row['부서']}) - {int(row['포인트'])} P")
+        else:
+            st.info(f"{today.month}월 채택된 제안이 아직 없습니다.")
+            
+    with col_dept:
+        st.markdown("##### 🏢 부서별 포인트 랭킹 (누적)")
+        # 전체 채택 건 - 부서별 합계
+        dept_ranks = leaderboard.dept_ranking(5)
+        if not dept_ranks.empty:
+            # 차트 표시
+            chart = alt.Chart(dept_ranks).mark_bar().encode(
+                x=alt.X('부서', sort='-y', title=None),
+                y=alt.Y('포인트', title=None),
+                color=alt.value('#FFAA00'),
+                tooltip=['부서', '포인트']
+            ).properties(height=150)
+            st.altair_chart(chart, use_container_width=True)
+        else:
+            st.info("채택된 제안이 없습니다.")
+
+# --- 프래그먼트: 제안 목록 + 페이지 이동 (페이지 버튼은 이 부분만 다시 실행) ---
+@st.fragment
+@tracing.fragment('fragment_suggestion_table', trace_context)
+def render_suggestion_table(filters):
+    # --- 페이지네이션 (Pagination) 설정 ---
+    if 'page_number' not in st.session_state:
+        st.session_state['page_number'] = 1
+
+    ROWS_PER_PAGE = 15
+    current_page = st.session_state['page_number']
+
+    # 인덱스에서 현재 페이지 행과 전체 건수만 조회
+    df_display, total_rows = query.query_suggestions(filters, current_page, ROWS_PER_PAGE)
+    total_pages = (total_rows - 1) // ROWS_PER_PAGE + 1
+
+    # 페이지 번호가 범위를 벗어나지 않도록 조정
+    if current_page > total_pages:
+        st.session_state['page_number'] = max(1, total_pages)
+        current_page = st.session_state['page_number']
+        df_display, total_rows = query.query_suggestions(filters, current_page, ROWS_PER_PAGE)
+
+    start_idx = (current_page - 1) * ROWS_PER_PAGE
+    end_idx = start_idx + ROWS_PER_PAGE
+
+    # [추가] 작성자 레벨(누적 포인트 기준) 계산
+    try:
+        # 작성자별 누적 포인트 (포인트 원장)
+        user_total_points = ledger.points_by_user()
+
+        # 표시 중인 작성자 전체를 한 번의 searchsorted로 판별
+        author_points = df_display['작성자ID'].map(user_total_points).fillna(0)
+        df_display['작성자등급'] = levels.level_labels(author_points, levels.load_level_table())
+    except Exception:
+        df_display['작성자등급'] = "-"
+
+    # 표시용 컬럼 (현재 페이지 행만): 작성날짜 문자열, 평가등급(S~C), 빈 부서는 '-'
+    df_display['작성날짜'] = pd.to_datetime(df_display['날짜'], errors='coerce').dt.strftime('%Y-%m-%d')
+    df_display['평가등급'] = df_display['등급'].astype(object).fillna("")
+    df_display['부서'] = df_display['부서'].astype(object).fillna("-")
+
+    # [수정] 상태별 글자 색상 적용 (Pandas Styler)
+    def color_status_text(val):
+        if val == '미채택': return 'color: red; font-weight: bold;'
+        if val == '심사대기': return 'color: orange; font-weight: bold;'
+        if val == '접수': return 'color: blue;'
+        if val == '채택': return 'color: green; font-weight: bold;'
+        return ''
+
+    # 데이터프레임 표시 (작성자등급 컬럼 추가, 등급 -> 평가등급 변경)
+    st.dataframe(
+        df_display[['작성자', '작성자등급', '부서', '작성날짜', '제목', '상태', '평가등급', '포인트', '평가점수']].style.applymap(color_status_text, subset=['상태']),
+        use_container_width=True
+    )
+
+    # --- 페이지네이션 UI (하단 번호) ---
+    if total_pages > 1:
+        st.write("---")
+        # 중앙 정렬을 위해 컬럼 사용
+        _, col_center, _ = st.columns([1, 2, 1])
+        with col_center:
+            # 페이지 번호 버튼 생성
+            # 번호가 많을 경우 처리가 필요하지만, 여기서는 간단히 10개 단위 혹은 전체 표시
+            # 버튼 콜백으로 페이지 상태 변경 -> 프래그먼트만 다시 실행
+
+            def set_page(i):
+                st.session_state['page_number'] = i
+
+            # 이전, 다음 버튼과 페이지 번호들을 나열
+            # 10페이지 이상일 경우 슬라이딩 윈도우 방식이 좋으나 여기선 단순 나열
+            cols = st.columns(min(total_pages + 2, 12)) # 최대 12개 컬럼 제한
+
+            # [이전] 버튼
+            if current_page > 1:
+                cols[0].button("◀", key="prev_page", on_click=set_page, args=(current_page - 1,))
+
+            # 페이지 번호 버튼들 (현재 페이지 주변 보여주기 등 로직 간소화: 전체 표시 시도하되 많으면 끊기)
+            # 여기서는 간단히 1~10페이지까지만 표시하거나 전체 표시 (사용자 요청: mail함 처럼)
+            # 전체를 다 보여주기엔 칸이 모자랄 수 있으므로 현재 페이지 중심으로 표시
+
+            start_p = max(1, current_page - 4)
+            end_p = min(total_pages, start_p + 9)
+
+            col_idx = 1
+            for p in range(start_p, end_p + 1):
+                if col_idx < len(cols) - 1:
+                    cols[col_idx].button(f"{p}", key=f"page_{p}", type="primary" if p == current_page else "secondary",
+                                         on_click=set_page, args=(p,))
+                    col_idx += 1
+
+            # [다음] 버튼
+            if current_page < total_pages:
+                cols[col_idx].button("▶", key="next_page", on_click=set_page, args=(current_page + 1,))
+
+    st.caption(f"총 {total_rows}건 중 {start_idx + 1} - {min(end_idx, total_rows)}건 표시 (Page {current_page}/{total_pages})")
+
+# --- 프래그먼트: 상세 본문 (원본 이미지 보기 전환은 이 부분만 다시 실행) ---
+@st.fragment
+@tracing.fragment('fragment_detail_body', trace_context)
+def render_detail_body(row_id, html):
+    # 본문 이미지는 썸네일로 표시하고 원본은 요청 시에만 전송
+    show_original = False
+    if images.has_images(html):
+        show_original = st.toggle("🔍 원본 이미지 보기", key=f"orig_img_{row_id}")
+    st.markdown(images.render_detail(row_id, html, originals=show_original), unsafe_allow_html=True)
+
+# --- 프래그먼트: 등급 평가 패널 (평가 항목 클릭은 이 부분만 다시 실행) ---
+@st.fragment
+@tracing.fragment('fragment_scoring_panel', trace_context)
+def render_scoring_panel(row_id, expected_version):
+    st.write("---")
+    st.markdown("#### 📝 등급 평가")
+
+    # 평가 항목 (라디오 버튼)
+    e_col1, e_col2 = st.columns(2)
+    with e_col1:
+        st.markdown("##### **창의성 (30점)**")
+        sc_creative = st.radio("창의성", grading.SCORE_OPTIONS["창의성"], horizontal=True, label_visibility="collapsed", key=f"sc_c_{row_id}", format_func=lambda x: f"{x}점")
+
+        st.markdown("##### **효과성 (30점)**")
+        sc_effective = st.radio("효과성", grading.SCORE_OPTIONS["효과성"], horizontal=True, label_visibility="collapsed", key=f"sc_e_{row_id}", format_func=lambda x: f"{x}점")
+
+        st.markdown("##### **실행성 (20점)**")
+        sc_execute = st.radio("실행성", grading.SCORE_OPTIONS["실행성"], horizontal=True, label_visibility="collapsed", key=f"sc_x_{row_id}", format_func=lambda x: f"{x}점")
+
+    with e_col2:
+        st.markdown("##### **지속성 (10점)**")
+        sc_sustain = st.radio("지속성", grading.SCORE_OPTIONS["지속성"], horizontal=True, label_visibility="collapsed", key=f"sc_s_{row_id}", format_func=lambda x: f"{x}점")
+
+        st.markdown("##### **표준화기여도 (10점)**")
+        sc_standard = st.radio("표준화기여도", grading.SCORE_OPTIONS["표준화기여도"], horizontal=True, label_visibility="collapsed", key=f"sc_t_{row_id}", format_func=lambda x: f"{x}점")
+
+    total_score = sc_creative + sc_effective + sc_execute + sc_sustain + sc_standard
+
+    # 평가 등급 산정 (S: 90~100, A: 70~89, B: 60~69, C: 60미만)
+    grade, grade_points = grading.grade_for_score(total_score)
+
+    st.info(f"📊 **총점: {total_score}점**  👉  **등급: {grade}** (부여 포인트: {grade_points})")
+
+    # 승인/반려 버튼
+    col_approve, col_reject = st.columns([1, 1])
+    with col_approve:
+        if st.button("✅ 채택 (승인)"):
+            changes = {'상태': "채택", '등급': grade, '포인트': grade_points, '평가점수': total_score}
+            try:
+                storage.update_row(SUGGESTION_FILE, row_id, changes, expected_version=expected_version)
+            except storage.StaleWriteError:
+                st.error(STALE_WRITE_MSG)
+            else:
+                events.record('approve', st.session_state['user_id'], SUGGESTION_FILE, row_id, changes=changes)
+                flash(f"채택 처리되었습니다. (등급: {grade}, 포인트: {grade_points}, 평가총점: {total_score}점)")
+                st.rerun()
+
+    with col_reject:
+        if st.button("❌ 미채택"):
+            try:
+                storage.update_row(SUGGESTION_FILE, row_id, {'상태': "미채택"},
+                                   expected_version=expected_version)
+            except storage.StaleWriteError:
+                st.error(STALE_WRITE_MSG)
+            else:
+                events.record('reject', st.session_state['user_id'], SUGGESTION_FILE, row_id, changes={'상태': "미채택"})
+                flash("미채택 처리되었습니다.", "warning")
+                st.rerun()
+
+# --- 프래그먼트: 일괄 심사 (여러 건을 표에서 평가하고 한 번에 반영) ---
+BATCH_REVIEW_LIMIT = 300  # 한 화면에 올리는 심사 대기 건수 (오래된 순)
+BATCH_DECISIONS = ["보류", "채택", "미채택"]
+
+@st.fragment
+@tracing.fragment('fragment_batch_review', trace_context)
+def render_batch_review(filters):
+    if 'batch_round' not in st.session_state:
+        st.session_state['batch_round'] = 0
+    queue_df, total = query.review_queue(filters, limit=BATCH_REVIEW_LIMIT)
+    if queue_df.empty:
+        st.info("심사할 제안이 없습니다.")
+        return
+    st.caption(f"심사 대기 {total}건 중 오래된 순 {len(queue_df)}건 (결정이 '보류'인 행은 반영하지 않음)")
+
+    # 화면에 올린 시점의 버전 (반영 시 그 사이 다른 사용자가 수정한 행이 있으면 전체 거부)
+    expected_versions = {row['ID']: seen_version(row) for row in queue_df.to_dict('records')}
+
+    grid = pd.DataFrame({
+        'ID': queue_df['ID'].to_numpy(dtype=object),
+        '작성자': queue_df['작성자'].to_numpy(dtype=object),
+        '작성날짜': pd.to_datetime(queue_df['날짜'], errors='coerce').dt.strftime('%Y-%m-%d').to_numpy(dtype=object),
+        '제목': queue_df['제목'].to_numpy(dtype=object),
+        '상태': queue_df['상태'].astype(object).to_numpy(),
+    })
+    for item in grading.SCORE_OPTIONS:
+        grid[item] = 0
+    grid['결정'] = BATCH_DECISIONS[0]
+
+    column_config = {'ID': None}
+    for item, options in grading.SCORE_OPTIONS.items():
+        column_config[item] = st.column_config.SelectboxColumn(f"{item} ({max(options)})", options=options, required=True)
+    column_config['결정'] = st.column_config.SelectboxColumn("결정", options=BATCH_DECISIONS, required=True)
+
+    edited = st.data_editor(
+        grid,
+        column_config=column_config,
+        disabled=['작성자', '작성날짜', '제목', '상태'],
+        hide_index=True,
+        use_container_width=True,
+        key=f"batch_grid_{st.session_state['batch_round']}",
+    )
+
+    # 총점 -> 등급/포인트를 표 전체에 대해 한 번에 산정
+    totals = edited[list(grading.SCORE_OPTIONS)].fillna(0).astype(int).sum(axis=1).to_numpy()
+    grades, points = grading.grade_scores(totals)
+    decisions = edited['결정'].fillna(BATCH_DECISIONS[0]).to_numpy(dtype=object)
+    decided = decisions != BATCH_DECISIONS[0]
+    approved = decisions == "채택"
+
+    if decided.any():
+        preview = pd.DataFrame({
+            '제목': edited['제목'].to_numpy(dtype=object)[decided],
+            '결정': decisions[decided],
+            '총점': np.where(approved, totals, 0)[decided],
+            '등급': np.where(approved, grades, "")[decided],
+            '포인트': np.where(approved, points, 0)[decided],
+        })
+        st.dataframe(preview, hide_index=True, use_container_width=True)
+
+    n_approved, n_rejected = int(approved.sum()), int((decisions == "미채택").sum())
+    if st.button(f"💾 일괄 반영 (채택 {n_approved}건 / 미채택 {n_rejected}건)", disabled=not decided.any()):
+        updates = {}
+        for row_id, decision, total_score, grade, grade_points in zip(
+                edited['ID'].to_numpy(dtype=object)[decided], decisions[decided],
+                totals[decided], grades[decided], points[decided]):
+            if decision == "채택":
+                updates[row_id] = {'상태': "채택", '등급': str(grade),
+                                   '포인트': int(grade_points), '평가점수': int(total_score)}
+            else:
+                updates[row_id] = {'상태': "미채택"}
+        try:
+            # 모든 변경을 한 번의 쓰기로 반영 (포인트 원장/명예의 전당도 한 번만 갱신)
+            storage.update_rows(SUGGESTION_FILE, updates,
+                                expected_versions={row_id: expected_versions[row_id] for row_id in updates})
+        except storage.StaleWriteError:
+            st.error(STALE_WRITE_MSG)
+        else:
+            # 이벤트도 한 번에 기록 (fsync 1회)
+            reviewer = st.session_state['user_id']
+            events.append([
+                events.make_event('approve' if changes['상태'] == "채택" else 'reject', reviewer,
+                                  SUGGESTION_FILE, row_id, changes=changes)
+                for row_id, changes in updates.items()
+            ])
+            flash(f"채택 {n_approved}건, 미채택 {n_rejected}건을 반영했습니다.")
+            st.session_state['batch_round'] += 1
+            st.rerun()
+
 def main_app():
     user_role = st.session_state['user_role']
     user_name = st.session_state['user_name']
@@ -305,42 +619,7 @@ def main_app():
         
         # --- [추가] 게이미피케이션 정보 ---
         if st.session_state['logged_in']:
-            try:
-                # 데이터 로드
-                s_df = load_csv(SUGGESTION_FILE, [])
-                l_df = load_level_settings()
-                
-                # 레벨 계산
-                lv_name, total_pts, next_lv, pts_need, next_total = calculate_user_level(user_id, s_df, l_df)
-                
-                st.write(f"**🏅 현재 레벨:** {lv_name}")
-                st.write(f"**💰 총 포인트:** {total_pts} P")
-                
-                if next_lv != "MAX":
-                    st.caption(f"다음 레벨({next_lv})까지 {pts_need} P 남음")
-                    
-                    # 프로그레스 바 계산
-                    # (현재점수 - 이전레벨컷) / (다음레벨컷 - 이전레벨컷)
-                    l_df['필요점수'] = pd.to_numeric(l_df['필요점수'], errors='coerce')
-                    l_df = l_df.sort_values('필요점수', ascending=True)
-                    
-                    prev_threshold = 0
-                    passed = l_df[l_df['필요점수'] <= total_pts]
-                    if not passed.empty:
-                        prev_threshold = passed.iloc[-1]['필요점수']
-                    
-                    denom = next_total - prev_threshold
-                    if denom > 0:
-                        progress = (total_pts - prev_threshold) / denom
-                    else:
-                        progress = 0.0
-                    
-                    st.progress(min(max(progress, 0.0), 1.0))
-                else:
-                    st.success("🎉 최고 레벨 달성!")
-                
-            except Exception as e:
-                st.error(f"레벨 정보 로드 오류: {e}")
+            render_level_badge(user_id)
             
             st.markdown("---")
 
@@ -352,89 +631,24 @@ def main_app():
         if user_role == "Root":
             menu_options.append("⚙️ 시스템 관리")
 
-        menu = st.radio("메뉴 이동", menu_options)
+        menu = st.radio("메뉴 이동", menu_options, key="menu")
         
         st.markdown("---")
         if st.button("로그아웃"):
+            flush_draft(user_id)
             st.session_state['logged_in'] = False
             st.rerun()
 
     st.title("🏭 제조 현장 TPM 시스템")
 
+    if "활동 등록" not in menu:
+        flush_draft(user_id)
+
     # ------------------------------------------------
     # [공통] 명예의 전당 (상단 배치)
     # ------------------------------------------------
     st.markdown("### 🏆 명예의 전당")
-    col_hof, col_dept = st.columns([1, 1])
-    
-    # 데이터 로드 (공통 사용)
-    df_hof = load_csv(SUGGESTION_FILE, [])
-    if not df_hof.empty:
-        if '포인트' not in df_hof.columns: df_hof['포인트'] = 0
-        # 날짜 컬럼 통일
-        if '작성날짜' not in df_hof.columns and '날짜' in df_hof.columns:
-            df_hof['작성날짜'] = df_hof['날짜']
-        
-        # 날짜 타입 변환
-        df_hof['date_dt'] = pd.to_datetime(df_hof['작성날짜'], errors='coerce')
-        # 포인트 숫자 변환
-        df_hof['포인트'] = pd.to_numeric(df_hof['포인트'], errors='coerce').fillna(0)
-
-        # [수정] 부서 정보 추가 (users.csv 매핑)
-        if '부서' not in df_hof.columns:
-            users_df = load_csv(USER_FILE, ["사번", "부서"])
-            if not users_df.empty and '부서' in users_df.columns:
-                dept_map = dict(zip(users_df['사번'], users_df['부서']))
-                df_hof['부서'] = df_hof['작성자ID'].map(dept_map).fillna("-")
-            else:
-                df_hof['부서'] = "-"
-    
-    with col_hof:
-        st.markdown("##### 👑 이달의 제안왕 (Top 3)")
-        if not df_hof.empty:
-            today = datetime.now()
-            # 이달의 채택된 제안
-            mask_month = (
-                (df_hof['date_dt'].dt.year == today.year) & 
-                (df_hof['date_dt'].dt.month == today.month) &
-                (df_hof['상태'] == '채택')
-            )
-            df_month = df_hof[mask_month]
-            
-            if not df_month.empty:
-                # 작성자별 합계
-                user_ranks = df_month.groupby(['작성자', '부서'])['포인트'].sum().reset_index()
-                user_ranks = user_ranks.sort_values('포인트', ascending=False).head(3)
-                
-                for idx, row in user_ranks.iterrows():
-                    medal = ["🥇", "🥈", "🥉"][idx] if idx < 3 else ""
-                    st.write(f"**{medal} {idx+1}위**: {row['작성자']} ({row['부서']}) - {int(row['포인트'])} P")
-            else:
-                st.info(f"{today.month}월 채택된 제안이 아직 없습니다.")
-        else:
-            st.info("데이터가 없습니다.")
-            
-    with col_dept:
-        st.markdown("##### 🏢 부서별 포인트 랭킹 (누적)")
-        if not df_hof.empty:
-            # 전체 채택 건
-            df_approved = df_hof[df_hof['상태'] == '채택']
-            if not df_approved.empty:
-                dept_ranks = df_approved.groupby('부서')['포인트'].sum().reset_index()
-                dept_ranks = dept_ranks.sort_values('포인트', ascending=False).head(5)
-                
-                # 차트 표시
-                chart = alt.Chart(dept_ranks).mark_bar().encode(
-                    x=alt.X('부서', sort='-y', title=None),
-                    y=alt.Y('포인트', title=None),
-                    color=alt.value('#FFAA00'),
-                    tooltip=['부서', '포인트']
-                ).properties(height=150)
-                st.altair_chart(chart, use_container_width=True)
-            else:
-                st.info("채택된 제안이 없습니다.")
-        else:
-            st.info("데이터가 없습니다.")
+    render_hall_of_fame()
             
     st.divider()
 
@@ -447,26 +661,58 @@ def main_app():
 
         with tab1:
             st.write("#### 제안 제도 입력")
-            
-            s_title = st.text_input("제안 제목")
+
+            # 작성 중인 글은 drafts.csv 에 자동 저장하고, 제출할 때만 제안 테이블에 '접수'로 추가
+            editor = st.session_state.setdefault('draft_editor', drafts.new_editor())
+            my_drafts = drafts.list_drafts(user_id)
+            if not my_drafts.empty:
+                with st.expander(f"📂 임시 저장 글 ({len(my_drafts)}건)"):
+                    draft_labels = {
+                        row['ID']: f"{row['제목'] if isinstance(row['제목'], str) and row['제목'] else '(제목 없음)'} · {row['최종저장일']}"
+                        for row in my_drafts.to_dict('records')
+                    }
+                    picked = st.selectbox("이어서 작성할 글", list(draft_labels), format_func=draft_labels.get, key="draft_pick")
+                    col_load, col_discard = st.columns(2)
+                    if col_load.button("📝 불러오기"):
+                        flush_draft(user_id)
+                        st.session_state['draft_editor'] = drafts.new_editor(editor['round'] + 1, drafts.get_draft(picked, user_id))
+                        st.rerun()
+                    if col_discard.button("🗑️ 임시 저장 글 삭제"):
+                        drafts.delete_draft(picked)
+                        if editor['id'] == picked:
+                            st.session_state['draft_editor'] = drafts.new_editor(editor['round'] + 1)
+                        flash("임시 저장 글을 삭제했습니다.")
+                        st.rerun()
+
+            s_title = st.text_input("제안 제목", value=editor['title'], key=f"s_title_{editor['round']}")
             
             # --- 리치 텍스트 에디터 ---
-            s_content = st_quill(
-                placeholder="여기에 내용을 입력하세요.",
-                html=True,
-                toolbar=[
-                    ['bold', 'italic', 'underline', 'strike'],        
-                    [{'color': []}, {'background': []}],              
-                    [{'header': [1, 2, 3, False]}],                   
-                    ['image', 'link'],                                
-                    [{'list': 'ordered'}, {'list': 'bullet'}],        
-                    ['clean']                                         
-                ],
-                key="quill_suggestion_create"
-            )
+            with tracing.span('quill'):
+                s_content = st_quill(
+                    value=editor['content'],
+                    placeholder="여기에 내용을 입력하세요.",
+                    html=True,
+                    toolbar=[
+                        ['bold', 'italic', 'underline', 'strike'],        
+                        [{'color': []}, {'background': []}],              
+                        [{'header': [1, 2, 3, False]}],                   
+                        ['image', 'link'],                                
+                        [{'list': 'ordered'}, {'list': 'bullet'}],        
+                        ['clean']                                         
+                    ],
+                    key=f"quill_suggestion_create_{editor['round']}"
+                )
             
             st.caption("⚠️ 이미지를 붙여넣거나(Ctrl+V), 도구 모음의 이미지 아이콘을 사용하세요.")
 
+            # 자동 저장 (내용이 바뀌고 마지막 저장 후 일정 시간이 지났을 때만 기록, 나머지는 프래그먼트가 기록)
+            try:
+                drafts.autosave(editor, user_id, s_title, s_content)
+            except drafts.DraftError as e:
+                st.warning(f"⚠️ 자동 저장 실패: {e}")
+            else:
+                render_autosave_status(user_id)
+
             st.write("") 
             s_file = st.file_uploader("추가 첨부파일 (문서 등)", key="s_file")
             
@@ -480,18 +726,23 @@ def main_app():
                 if not s_title or not s_content:
                     st.warning("제목과 내용을 입력해주세요.")
                 else:
-                    status = "임시저장" if btn_draft else "접수"
-                    fname = save_uploaded_file(s_file)
-                    new_data = {
-                        "ID": datetime.now().strftime("%Y%m%d%H%M%S"),
-                        "작성자ID": user_id, "작성자": user_name, "날짜": datetime.now().strftime("%Y-%m-%d"),
-                        "제목": s_title, "내용": s_content, "첨부파일": fname, "상태": status
-                    }
-                    df = load_csv(SUGGESTION_FILE, new_data.keys())
-                    df = pd.concat([df, pd.DataFrame([new_data])], ignore_index=True)
-                    save_csv(SUGGESTION_FILE, df)
-                    msg = "임시 저장되었습니다." if btn_draft else "제출되었습니다. (상태: 접수)"
-                    st.success(f"✅ {msg}")
+                    try:
+                        if btn_submit:
+                            # 제출은 임시 저장을 거치지 않음 (임시 저장 글 수/크기 한도와 무관하게 제출 가능)
+                            fname = save_uploaded_file(s_file, user_id)
+                            drafts.submit(user_id, user_name, accounts.get_dept(user_id), s_title, s_content,
+                                          fname, draft_id=editor['id'])
+                        else:
+                            drafts.autosave(editor, user_id, s_title, s_content, force=True)
+                    except drafts.DraftError as e:
+                        st.error(f"❌ {e}")
+                    else:
+                        if btn_submit:
+                            st.session_state['draft_editor'] = drafts.new_editor(editor['round'] + 1)
+                            flash("제출되었습니다. (상태: 접수)")
+                        else:
+                            flash("임시 저장되었습니다.")
+                        st.rerun()
 
         with tab2:
             with st.form("c_form"):
@@ -501,15 +752,14 @@ def main_app():
                 c_file = st.file_uploader("활동보고서 파일 첨부")
                 
                 if st.form_submit_button("등록"):
-                    fname_c = save_uploaded_file(c_file)
+                    fname_c = save_uploaded_file(c_file, user_id)
                     new_data = {
-                        "ID": datetime.now().strftime("%Y%m%d%H%M%S"),
+                        "ID": ids.new_id(),
                         "작성자ID": user_id, "작성자": user_name, "날짜": datetime.now().strftime("%Y-%m-%d"),
                         "분임조명": c_team, "활동내용": c_content, "첨부파일": fname_c, "상태": "접수"
                     }
-                    df = load_csv(CIRCLE_FILE, new_data.keys())
-                    df = pd.concat([df, pd.DataFrame([new_data])], ignore_index=True)
-                    save_csv(CIRCLE_FILE, df)
+                    storage.insert_row(CIRCLE_FILE, new_data)
+                    events.record('submit', user_id, CIRCLE_FILE, new_data["ID"], row=new_data)
                     st.success("등록되었습니다.")
 
     # ------------------------------------------------
@@ -517,13 +767,10 @@ def main_app():
     # ------------------------------------------------
     elif "나의 작성 목록" in menu:
         st.header(f"📂 나의 작성 목록 ({user_name})")
+        draft_count = len(drafts.list_drafts(user_id))
+        if draft_count:
+            st.info(f"📝 임시 저장 글 {draft_count}건은 '활동 등록' 메뉴에서 이어서 작성할 수 있습니다.")
         df_s = load_csv(SUGGESTION_FILE, [])
-        
-        # [Fix] 데이터 일관성 복구 (작성날짜 -> 날짜)
-        # 이전 코드의 버그로 인해 파일의 컬럼명이 '작성날짜'로 변경되었을 경우 '날짜'로 복구
-        if '작성날짜' in df_s.columns and '날짜' not in df_s.columns:
-            df_s.rename(columns={'작성날짜': '날짜'}, inplace=True)
-            save_csv(SUGGESTION_FILE, df_s) # 파일에 영구 반영
 
         if not df_s.empty:
             my_s = df_s[df_s['작성자ID'] == user_id].copy()
@@ -532,17 +779,18 @@ def main_app():
             if '등급' not in my_s.columns:
                 my_s['등급'] = "-"
             if '포인트' not in my_s.columns:
-                my_s['포인트'] = "0"
+                my_s['포인트'] = 0
             
-            # NaN 처리 및 등급 포맷팅
-            my_s['등급'] = my_s['등급'].fillna("-").apply(add_grade_emoji)
-            my_s['포인트'] = my_s['포인트'].fillna("0")
+            # NaN 처리 (등급은 schema 마이그레이션에서 S~C로 통일됨)
+            my_s['등급'] = my_s['등급'].astype(object).fillna("-")
+            my_s['포인트'] = my_s['포인트'].fillna(0)
 
             # 데이터프레임 표시 (컬럼 추가: 등급, 포인트)
             st.dataframe(
                 my_s[['날짜', '제목', '상태', '등급', '포인트']], 
                 use_container_width=True,
                 column_config={
+                    "날짜": st.column_config.DateColumn("날짜", format="YYYY-MM-DD"),
                     "등급": "평가등급",
                     "포인트": "부여포인트"
                 }
@@ -558,6 +806,7 @@ def main_app():
                 row = my_s[my_s['제목'] == selected_title].iloc[0]
                 current_id = row['ID']
                 current_status = row['상태']
+                expected_version = seen_version(row)
                 
                 st.info(f"선택된 글: **{row['제목']}** (상태: {current_status})")
                 
@@ -579,13 +828,16 @@ def main_app():
                         st.warning(f"⚠️ 이미 제출된 '{current_status}' 상태입니다.\n회수하면 '임시저장' 상태로 변경됩니다. 진행하시겠습니까?")
                         col_y, col_n = st.columns(2)
                         if col_y.button("네, 회수합니다", key="recall_yes"):
-                            idx = df_s.index[df_s['ID'] == current_id].tolist()[0]
-                            df_s.at[idx, '상태'] = "임시저장"
-                            save_csv(SUGGESTION_FILE, df_s)
-                            st.session_state['recall_confirm_id'] = None
-                            st.success("✅ 회수되었습니다. 내용을 수정한 뒤 다시 제출하세요.")
-                            time.sleep(1)
-                            st.rerun()
+                            try:
+                                storage.update_row(SUGGESTION_FILE, current_id, {'상태': "임시저장"},
+                                                   expected_version=expected_version)
+                            except storage.StaleWriteError:
+                                st.error(STALE_WRITE_MSG)
+                            else:
+                                events.record('recall', user_id, SUGGESTION_FILE, current_id, changes={'상태': "임시저장"})
+                                st.session_state['recall_confirm_id'] = None
+                                flash("회수되었습니다. 내용을 수정한 뒤 다시 제출하세요.")
+                                st.rerun()
                         if col_n.button("취소", key="recall_no"):
                             st.session_state['recall_confirm_id'] = None
                             st.rerun()
@@ -596,11 +848,10 @@ def main_app():
                         st.error("⚠️ 정말로 이 게시글을 삭제하시겠습니까? (복구 불가)")
                         col_y, col_n = st.columns(2)
                         if col_y.button("네, 삭제합니다", key="del_yes"):
-                            df_new = df_s[df_s['ID'] != current_id]
-                            save_csv(SUGGESTION_FILE, df_new)
+                            storage.delete_row(SUGGESTION_FILE, current_id)
+                            events.record('delete', user_id, SUGGESTION_FILE, current_id)
                             st.session_state['delete_confirm_id'] = None
-                            st.success("삭제되었습니다!")
-                            time.sleep(1)
+                            flash("삭제되었습니다!")
                             st.rerun()
                         if col_n.button("아니오", key="del_no"):
                             st.session_state['delete_confirm_id'] = None
@@ -613,12 +864,13 @@ def main_app():
                     st.write("#### ✏️ 내용 수정")
                     new_title = st.text_input("제목 수정", value=row['제목'])
                     
-                    new_content = st_quill(
-                        value=row['내용'],
-                        html=True,
-                        toolbar=[['bold', 'italic'], [{'header': [1, 2, False]}], ['image', 'link'], ['clean']],
-                        key=f"edit_quill_{current_id}"
-                    )
+                    with tracing.span('quill'):
+                        new_content = st_quill(
+                            value=images.render_images(row['내용']),
+                            html=True,
+                            toolbar=[['bold', 'italic'], [{'header': [1, 2, False]}], ['image', 'link'], ['clean']],
+                            key=f"edit_quill_{current_id}"
+                        )
                     
                     # [수정] 수정 화면에도 버튼 분리 적용 (임시저장 / 제출)
                     col_edit_1, col_edit_2 = st.columns([1, 1])
@@ -628,64 +880,40 @@ def main_app():
                         btn_edit_submit = st.button("🚀 제출 (심사 요청)")
 
                     if btn_edit_draft or btn_edit_submit:
-                        idx = df_s.index[df_s['ID'] == current_id].tolist()[0]
-                        
                         # 내용 업데이트
-                        df_s.at[idx, '제목'] = new_title
-                        df_s.at[idx, '내용'] = new_content
+                        changes = {'제목': new_title, '내용': images.ingest_images(new_content)}
                         
                         # 버튼에 따른 상태 변경 로직
                         if btn_edit_draft:
-                            df_s.at[idx, '상태'] = "임시저장"
+                            changes['상태'] = "임시저장"
                             msg = "임시 저장되었습니다."
                         else:
-                            df_s.at[idx, '상태'] = "접수" # 제출 시 접수 상태로 변경
+                            changes['상태'] = "접수" # 제출 시 접수 상태로 변경
                             msg = "제출되었습니다. (상태: 접수)"
 
-                        save_csv(SUGGESTION_FILE, df_s)
-                        st.success(f"✅ {msg}")
-                        time.sleep(1)
-                        st.rerun()
+                        try:
+                            storage.update_row(SUGGESTION_FILE, current_id, changes, expected_version=expected_version)
+                        except storage.StaleWriteError:
+                            st.error(STALE_WRITE_MSG)
+                        else:
+                            events.record('edit', user_id, SUGGESTION_FILE, current_id, changes=changes)
+                            flash(msg)
+                            st.rerun()
                 else:
                     st.warning(f"현재 상태('{current_status}')에서는 수정할 수 없습니다.")
                     st.write("### 📄 작성 내용 (읽기 전용)")
-                    st.markdown(row['내용'], unsafe_allow_html=True)
+                    st.markdown(images.render_images(row['내용']), unsafe_allow_html=True)
 
     # ------------------------------------------------
     # [심사/Root] 전체 활동 조회 및 평가
     # ------------------------------------------------
     elif "전체 활동 조회 및 평가" in menu:
         st.header("📊 전체 활동 현황")
-        df_s = load_csv(SUGGESTION_FILE, [])
-        
-        # [수정] 컬럼명 변경 (점수 -> 포인트) 및 초기화
-        if '점수' in df_s.columns and '포인트' not in df_s.columns:
-            df_s.rename(columns={'점수': '포인트'}, inplace=True)
-
-        if '등급' not in df_s.columns:
-            df_s['등급'] = ""
-        if '포인트' not in df_s.columns:
-            df_s['포인트'] = 0
-        if '평가점수' not in df_s.columns:
-            df_s['평가점수'] = 0
+        # 목록용 인덱스 (본문 '내용' 제외, 테이블이 바뀔 때만 재생성)
+        s_index = query.load_index()
+        df_s = s_index.df
 
         if not df_s.empty:
-            # [수정] 날짜 열 이름 변경
-            if '날짜' in df_s.columns:
-                df_s.rename(columns={'날짜': '작성날짜'}, inplace=True)
-            
-            # [수정] '반려' 상태를 '미채택'으로 일괄 변경 (기존 데이터 호환성)
-            if '상태' in df_s.columns:
-                df_s['상태'] = df_s['상태'].replace('반려', '미채택')
-
-            # [수정] 부서 정보 추가
-            users_df = load_csv(USER_FILE, ["사번", "부서"])
-            if not users_df.empty and '부서' in users_df.columns:
-                dept_map = dict(zip(users_df['사번'], users_df['부서']))
-                df_s['부서'] = df_s['작성자ID'].map(dept_map).fillna("-")
-            else:
-                df_s['부서'] = "-"
-
             # --- [추가] 부서별 접수 현황 그래프 (당해년도 / 당월) ---
             st.markdown("#### 📈 부서별 활동 현황")
             
@@ -697,26 +925,13 @@ def main_app():
             current_year = today.year
             current_month = today.month
 
-            if '작성날짜' in df_s.columns:
-                df_s['temp_date_obj'] = pd.to_datetime(df_s['작성날짜'], errors='coerce')
-                
-                # 1. 당해년도 데이터 집계 (전체 -> 당해년도)
-                year_mask = (df_s['temp_date_obj'].dt.year == current_year)
-                df_year = df_s[year_mask]
-                dept_counts_year = df_year['부서'].value_counts().reindex(target_depts, fill_value=0)
-                
-                # 2. 당월 데이터 집계
-                month_mask = (
-                    (df_s['temp_date_obj'].dt.year == current_year) & 
-                    (df_s['temp_date_obj'].dt.month == current_month)
-                )
-                df_month = df_s[month_mask]
-                dept_counts_month = df_month['부서'].value_counts().reindex(target_depts, fill_value=0)
-            else:
-                dept_counts_year = pd.Series(0, index=target_depts)
-                dept_counts_month = pd.Series(0, index=target_depts)
+            # 부서 x 연 x 월 x 상태 집계 큐브에서 기간별 합계만 조회 (원본 행을 다시 읽지 않음)
+            with tracing.span('dept_counts'):
+                dept_counts_year = cube.dept_counts(*cube.year_range(current_year), target_depts)
+                dept_counts_month = cube.dept_counts(*cube.month_range(current_year, current_month), target_depts)
 
             # Altair 차트 생성 함수
+            @tracing.traced('make_bar_chart')
             def make_bar_chart(data_series, title_text, bar_color):
                 # DataFrame 변환
                 chart_data = pd.DataFrame({
@@ -793,259 +1008,62 @@ def main_app():
                 
                 with col_f2:
                     filter_name = st.text_input("작성자 이름", key="filter_name")
-                    filter_title = st.text_input("제목 (키워드)", key="filter_title")
+                    filter_title = st.text_input("제목/내용 (키워드, 접두어 검색: 단어*)", key="filter_title")
                 
                 with col_f3:
                     # 상태 목록 추출 (기존 데이터 기반 + 기본값)
-                    all_statuses = ["전체"] + sorted(list(set(df_s['상태'].unique()) | {"접수", "심사대기", "채택", "미채택"}))
+                    all_statuses = ["전체"] + sorted(list(set(s_index.status_bits) | {"접수", "심사대기", "채택", "미채택"}))
                     filter_status = st.selectbox("진행 상태", all_statuses, key="filter_status")
                     
                     # 등급 목록 (기존 데이터 기반)
                     # [수정] TypeError 방지를 위해 모든 값을 문자열로 변환하고 NaN/빈값 제외
-                    unique_grades = df_s['등급'].unique()
-                    valid_grades = [str(g) for g in unique_grades if pd.notna(g) and str(g).strip() != ""]
-                    all_grades = ["전체"] + sorted(valid_grades)
+                    all_grades = ["전체"] + sorted(s_index.grade_bits)
                     
                     filter_grade = st.selectbox("등급", all_grades, key="filter_grade")
 
-            # --- 필터링 로직 적용 ---
-            # 1. 날짜 필터
-            if isinstance(date_range, tuple) and len(date_range) == 2:
-                start_d, end_d = date_range
-                # 문자열 날짜를 비교하기 위해 형변환 혹은 문자열 비교 (YYYY-MM-DD 형식 가정)
-                # 데이터의 날짜 형식이 YYYY-MM-DD 라고 가정
-                df_s['temp_date'] = pd.to_datetime(df_s['작성날짜'], errors='coerce').dt.date
-                df_s = df_s[
-                    (df_s['temp_date'] >= start_d) & 
-                    (df_s['temp_date'] <= end_d)
-                ]
-            
-            # 2. 이름 필터
-            if filter_name:
-                df_s = df_s[df_s['작성자'].str.contains(filter_name, na=False)]
-            
-            # 3. 제목 필터
-            if filter_title:
-                df_s = df_s[df_s['제목'].str.contains(filter_title, na=False)]
-            
-            # 4. 상태 필터
-            if filter_status != "전체":
-                df_s = df_s[df_s['상태'] == filter_status]
-            
-            # 5. 등급 필터
-            if filter_grade != "전체":
-                df_s = df_s[df_s['등급'] == filter_grade]
-
-            # --- 페이지네이션 (Pagination) 설정 ---
-            if 'page_number' not in st.session_state:
-                st.session_state['page_number'] = 1
-                
-            ROWS_PER_PAGE = 15
-            total_rows = len(df_s)
-            total_pages = (total_rows - 1) // ROWS_PER_PAGE + 1
-            
-            # 페이지 번호가 범위를 벗어나지 않도록 조정
-            if st.session_state['page_number'] > total_pages:
-                st.session_state['page_number'] = max(1, total_pages)
-                
-            current_page = st.session_state['page_number']
-            start_idx = (current_page - 1) * ROWS_PER_PAGE
-            end_idx = start_idx + ROWS_PER_PAGE
-            
-            # 현재 페이지에 표시할 데이터 슬라이싱
-            df_display = df_s.iloc[start_idx:end_idx].copy()
-            
-            # [추가] 작성자 레벨(누적 포인트 기준) 계산
-            try:
-                # 전체 데이터를 기준으로 포인트 합산
-                df_all = load_csv(SUGGESTION_FILE, [])
-                if '포인트' in df_all.columns:
-                    df_all['포인트'] = pd.to_numeric(df_all['포인트'], errors='coerce').fillna(0)
-                    user_total_points = df_all[df_all['상태'] == '채택'].groupby('작성자ID')['포인트'].sum().to_dict()
-                else:
-                    user_total_points = {}
-                
-                level_settings = load_level_settings()
-                level_settings['필요점수'] = pd.to_numeric(level_settings['필요점수'], errors='coerce')
-                level_settings = level_settings.sort_values('필요점수', ascending=True)
-                
-                def get_author_level(uid):
-                    pts = user_total_points.get(uid, 0)
-                    lv_name = "새싹"
-                    emoji = "🌱"
-                    has_emoji = '이모지' in level_settings.columns
-                    
-                    for _, r in level_settings.iterrows():
-                        if pts >= r['필요점수']:
-                            lv_name = r['등급명']
-                            if has_emoji: emoji = r['이모지']
-                    return f"{emoji} {lv_name}"
-                
-                df_display['작성자등급'] = df_display['작성자ID'].apply(get_author_level)
-            except Exception:
-                df_display['작성자등급'] = "-"
-
-            # 평가 등급(S~C) 이모지 적용
-            df_display['평가등급'] = df_display['등급'].apply(add_grade_emoji)
-
-            # [수정] 상태별 글자 색상 적용 (Pandas Styler)
-            def color_status_text(val):
-                if val == '미채택': return 'color: red; font-weight: bold;'
-                if val == '심사대기': return 'color: orange; font-weight: bold;'
-                if val == '접수': return 'color: blue;'
-                if val == '채택': return 'color: green; font-weight: bold;'
-                return ''
-
-            # 데이터프레임 표시 (작성자등급 컬럼 추가, 등급 -> 평가등급 변경)
-            st.dataframe(
-                df_display[['작성자', '작성자등급', '부서', '작성날짜', '제목', '상태', '평가등급', '포인트', '평가점수']].style.applymap(color_status_text, subset=['상태']),
-                use_container_width=True
-            )
-            
-            # --- 페이지네이션 UI (하단 번호) ---
-            if total_pages > 1:
-                st.write("---")
-                # 중앙 정렬을 위해 컬럼 사용
-                _, col_center, _ = st.columns([1, 2, 1])
-                with col_center:
-                    # 페이지 번호 버튼 생성
-                    # 번호가 많을 경우 처리가 필요하지만, 여기서는 간단히 10개 단위 혹은 전체 표시
-                    # Streamlit 버튼은 클릭 시 rerun되므로 콜백으로 페이지 상태 변경
-                    
-                    def set_page(i):
-                        st.session_state['page_number'] = i
-                    
-                    # 이전, 다음 버튼과 페이지 번호들을 나열
-                    # 10페이지 이상일 경우 슬라이딩 윈도우 방식이 좋으나 여기선 단순 나열
-                    cols = st.columns(min(total_pages + 2, 12)) # 최대 12개 컬럼 제한
-                    
-                    # [이전] 버튼
-                    if current_page > 1:
-                        if cols[0].button("◀", key="prev_page"):
-                            set_page(current_page - 1)
-                            st.rerun()
-                    
-                    # 페이지 번호 버튼들 (현재 페이지 주변 보여주기 등 로직 간소화: 전체 표시 시도하되 많으면 끊기)
-                    # 여기서는 간단히 1~10페이지까지만 표시하거나 전체 표시 (사용자 요청: mail함 처럼)
-                    # 전체를 다 보여주기엔 칸이 모자랄 수 있으므로 현재 페이지 중심으로 표시
-                    
-                    start_p = max(1, current_page - 4)
-                    end_p = min(total_pages, start_p + 9)
-                    
-                    col_idx = 1
-                    for p in range(start_p, end_p + 1):
-                        if col_idx < len(cols) - 1:
-                            if cols[col_idx].button(f"{p}", key=f"page_{p}", type="primary" if p == current_page else "secondary"):
-                                set_page(p)
-                                st.rerun()
-                            col_idx += 1
-                            
-                    # [다음] 버튼
-                    if current_page < total_pages:
-                        if cols[col_idx].button("▶", key="next_page"):
-                            set_page(current_page + 1)
-                            st.rerun()
+            # --- 필터 조건 ---
+            filters = {
+                'date_range': date_range if isinstance(date_range, tuple) and len(date_range) == 2 else None,
+                'name': filter_name,
+                'title': filter_title,
+                'status': filter_status,
+                'grade': filter_grade,
+            }
 
-            st.caption(f"총 {total_rows}건 중 {start_idx + 1} - {min(end_idx, total_rows)}건 표시 (Page {current_page}/{total_pages})")
+            # 목록/페이지 이동은 프래그먼트 안에서만 다시 실행됨
+            render_suggestion_table(filters)
             
             st.write("---")
             st.subheader("🔎 상세 내용 검토")
-            # 검토 대상 선택 박스에는 필터링된 목록만 표시
-            review_title = st.selectbox("검토할 제안 선택", ["선택안함"] + df_s['제목'].unique().tolist())
+            review_mode = "건별 검토"
+            if user_role in ["심사", "Root"]:
+                review_mode = st.radio("검토 방식", ["건별 검토", "일괄 검토"], horizontal=True, key="review_mode")
+
+            if review_mode == "일괄 검토":
+                render_batch_review(filters)
+            else:
+                # 검토 대상 선택 박스에는 필터링된 목록만 표시
+                filtered_titles = query.filtered_titles(filters)
+                review_title = st.selectbox("검토할 제안 선택", ["선택안함"] + filtered_titles)
             
-            if review_title != "선택안함":
-                row = df_s[df_s['제목'] == review_title].iloc[0]
-                st.write(f"**작성자:** {row['작성자']} | **상태:** {row['상태']}")
-                st.markdown(row['내용'], unsafe_allow_html=True)
+                if review_title != "선택안함":
+                    # 선택한 한 건만 본문(내용)까지 로드
+                    row = query.get_suggestion(query.find_by_title(filters, review_title))
+                    expected_version = seen_version(row)
+                    st.write(f"**작성자:** {row['작성자']} | **상태:** {row['상태']}")
+                    render_detail_body(row['ID'], row['내용'])
                 
-                # 심사 기능
-                if user_role in ["심사", "Root"]:
-                    st.write("---")
-                    st.markdown("#### 📝 등급 평가")
-                    
-                    # 평가 항목 (라디오 버튼)
-                    e_col1, e_col2 = st.columns(2)
-                    with e_col1:
-                        st.markdown("##### **창의성 (30점)**")
-                        sc_creative = st.radio("창의성", [0, 10, 20, 30], horizontal=True, label_visibility="collapsed", key=f"sc_c_{row['ID']}", format_func=lambda x: f"{x}점")
-                        
-                        st.markdown("##### **효과성 (30점)**")
-                        sc_effective = st.radio("효과성", [0, 10, 20, 30], horizontal=True, label_visibility="collapsed", key=f"sc_e_{row['ID']}", format_func=lambda x: f"{x}점")
-                        
-                        st.markdown("##### **실행성 (20점)**")
-                        sc_execute = st.radio("실행성", [0, 10, 15, 20], horizontal=True, label_visibility="collapsed", key=f"sc_x_{row['ID']}", format_func=lambda x: f"{x}점")
-                    
-                    with e_col2:
-                        st.markdown("##### **지속성 (10점)**")
-                        sc_sustain = st.radio("지속성", [0, 5, 10], horizontal=True, label_visibility="collapsed", key=f"sc_s_{row['ID']}", format_func=lambda x: f"{x}점")
-                        
-                        st.markdown("##### **표준화기여도 (10점)**")
-                        sc_standard = st.radio("표준화기여도", [0, 5, 10], horizontal=True, label_visibility="collapsed", key=f"sc_t_{row['ID']}", format_func=lambda x: f"{x}점")
-                    
-                    total_score = sc_creative + sc_effective + sc_execute + sc_sustain + sc_standard
-                    
-                    # 평가 등급 산정 로직 (S: 90~100, A: 70~89, B: 60~69, C: 60미만)
-                    if total_score >= 90:
-                        grade = "S"
-                        grade_points = 20
-                    elif total_score >= 70:
-                        grade = "A"
-                        grade_points = 10
-                    elif total_score >= 60:
-                        grade = "B"
-                        grade_points = 5
-                    else:
-                        grade = "C"
-                        grade_points = 1
-                        
-                    st.info(f"📊 **총점: {total_score}점**  👉  **등급: {grade}** (부여 포인트: {grade_points})")
-                    
-                    # 승인/반려 버튼
-                    col_approve, col_reject = st.columns([1, 1])
-                    with col_approve:
-                        if st.button("✅ 채택 (승인)"):
-                            idx = df_s.index[df_s['ID'] == row['ID']].tolist()[0]
-                            df_s.at[idx, '상태'] = "채택"
-                            df_s.at[idx, '등급'] = grade
-                            df_s.at[idx, '포인트'] = grade_points
-                            df_s.at[idx, '평가점수'] = total_score
-                            
-                            # 저장 시 '작성날짜'를 '날짜'로 원복하여 저장
-                            df_save = df_s.copy()
-                            if '작성날짜' in df_save.columns:
-                                df_save.rename(columns={'작성날짜': '날짜'}, inplace=True)
-                            save_csv(SUGGESTION_FILE, df_save)
-                            
-                            st.success(f"채택 처리되었습니다. (등급: {grade}, 포인트: {grade_points}, 평가총점: {total_score}점)")
-                            time.sleep(1)
-                            st.rerun()
-                    
-                    with col_reject:
-                        if st.button("❌ 미채택"):
-                            idx = df_s.index[df_s['ID'] == row['ID']].tolist()[0]
-                            df_s.at[idx, '상태'] = "미채택"
-                            
-                            # 저장 시 '작성날짜'를 '날짜'로 원복하여 저장
-                            df_save = df_s.copy()
-                            if '작성날짜' in df_save.columns:
-                                df_save.rename(columns={'작성날짜': '날짜'}, inplace=True)
-                            save_csv(SUGGESTION_FILE, df_save)
-                            
-                            st.warning("미채택 처리되었습니다.")
-                            st.rerun()
+                    # 심사 기능
+                    if user_role in ["심사", "Root"]:
+                        render_scoring_panel(row['ID'], expected_version)
 
-                if user_role == "Root":
-                    if st.button("🗑️ 관리자 권한 삭제"):
-                        df_s = df_s[df_s['ID'] != row['ID']]
+                    if user_role == "Root":
+                        if st.button("🗑️ 관리자 권한 삭제"):
+                            storage.delete_row(SUGGESTION_FILE, row['ID'])
+                            events.record('delete', user_id, SUGGESTION_FILE, row['ID'])
                         
-                        # 저장 시 '작성날짜'를 '날짜'로 원복하여 저장
-                        df_save = df_s.copy()
-                        if '작성날짜' in df_save.columns:
-                            df_save.rename(columns={'작성날짜': '날짜'}, inplace=True)
-                        save_csv(SUGGESTION_FILE, df_save)
-                        
-                        st.error("관리자 권한으로 삭제되었습니다.")
-                        st.rerun()
+                            flash("관리자 권한으로 삭제되었습니다.", "error")
+                            st.rerun()
 
     # ------------------------------------------------
     # [Root] 시스템 관리
@@ -1053,14 +1071,15 @@ def main_app():
     elif "시스템 관리" in menu:
         st.header("⚙️ 시스템 관리자 페이지")
         
-        tab_users, tab_levels = st.tabs(["👥 회원 관리", "🏆 레벨 기준 설정"])
+        tab_users, tab_levels, tab_diag = st.tabs(["👥 회원 관리", "🏆 레벨 기준 설정", "🩺 성능 진단"])
         
         # [Tab 1] 회원 관리
         with tab_users:
-            users = load_csv(USER_FILE, ["사번", "비밀번호", "이름", "권한", "부서", "직책", "가입날짜"])
+            users = accounts.load_users()
             
             # 체크박스 컬럼 추가 (관리자 계정 제외)
-            users_display = users.copy()
+            # 비밀번호(해시)는 화면에 보내지 않음
+            users_display = users.drop(columns=['비밀번호'], errors='ignore')
             if '선택' not in users_display.columns:
                 users_display.insert(0, '선택', False)
             
@@ -1082,7 +1101,6 @@ def main_app():
                         default=False,
                     ),
                     "사번": st.column_config.TextColumn("사번", disabled=True),
-                    "비밀번호": st.column_config.TextColumn("비밀번호"),
                     "이름": st.column_config.TextColumn("이름"),
                     "권한": st.column_config.SelectboxColumn(
                         "권한",
@@ -1145,8 +1163,10 @@ def main_app():
                         st.warning(f"**삭제할 계정 ({total_to_delete}개):**")
                         
                         if selected_ids:
-                            selected_users_info = users[users['사번'].isin(selected_ids)][['사번', '이름']]
-                            for _, user_row in selected_users_info.iterrows():
+                            for sel_id in selected_ids:
+                                user_row = accounts.get_user(sel_id)
+                                if user_row is None:
+                                    continue
                                 user_name = user_row.get('이름', '') if pd.notna(user_row.get('이름', '')) else user_row['사번']
                                 st.write(f"- {user_name} ({user_row['사번']})")
                         
@@ -1165,26 +1185,29 @@ def main_app():
                         col_yes, col_no = st.columns(2)
                         with col_yes:
                             if st.button("✅ 삭제 확인", type="primary", key="delete_confirm_btn"):
-                                current_admin = users[users['사번'] == current_admin_id]
-                                if not current_admin.empty:
-                                    current_admin = current_admin.iloc[0]
-                                    if current_admin['비밀번호'] == admin_pw:
-                                        if selected_ids:
-                                            users = users[~users['사번'].isin(selected_ids)]
-                                        
+                                current_admin = accounts.get_user(current_admin_id)
+                                if current_admin is not None:
+                                    if auth.verify_password(current_admin['비밀번호'], admin_pw):
                                         if selected_indices:
+                                            # 사번이 없는 빈 행은 위치 기준으로만 지울 수 있으므로 전체 저장
                                             sorted_indices = sorted(selected_indices, reverse=True)
                                             for idx in sorted_indices:
                                                 if idx < len(users):
                                                     users = users.drop(users.index[idx]).reset_index(drop=True)
-                                        
-                                        save_csv(USER_FILE, users)
+                                            if selected_ids:
+                                                users = users[~users['사번'].isin(selected_ids)]
+                                            save_csv(USER_FILE, users)
+                                            events.record_rewrite(USER_FILE, users, 'account_delete', current_admin_id)
+                                        else:
+                                            for sel_id in selected_ids:
+                                                accounts.delete_user(sel_id)
+                                            events.append([events.make_event('account_delete', current_admin_id, USER_FILE, sel_id)
+                                                           for sel_id in selected_ids])
                                         
                                         st.session_state['admin_delete_confirm'] = False
                                         st.session_state['admin_delete_user_id'] = None
                                         st.session_state['admin_delete_indices'] = None
-                                        st.success(f"✅ {total_to_delete}개 계정이 삭제되었습니다.")
-                                        time.sleep(1)
+                                        flash(f"{total_to_delete}개 계정이 삭제되었습니다.")
                                         st.rerun()
                                     else:
                                         st.error("❌ 비밀번호가 일치하지 않습니다.")
@@ -1227,17 +1250,59 @@ def main_app():
                         edited_level_df = edited_level_df.sort_values('필요점수', ascending=True)
                         
                         # 저장
-                        edited_level_df.to_csv(LEVEL_SETTINGS_FILE, index=False)
-                        st.success("✅ 레벨 설정이 저장되었습니다. (즉시 반영됨)")
-                        time.sleep(1)
+                        save_csv(LEVEL_SETTINGS_FILE, edited_level_df)
+                        events.record('level_change', user_id, LEVEL_SETTINGS_FILE,
+                                      rows=edited_level_df.to_dict('records'))
+                        flash("레벨 설정이 저장되었습니다. (즉시 반영됨)")
                         st.rerun()
                     else:
                         st.error("❌ 데이터에 '등급명', '필요점수' 컬럼이 있어야 합니다.")
                 else:
                     st.warning("저장할 데이터가 없습니다.")
 
+        # [Tab 3] 성능 진단 (리런별 구간 시간 / 입출력)
+        with tab_diag:
+            if not tracing.ENABLED:
+                st.info("성능 추적이 꺼져 있습니다. 환경 변수 TPM_TRACE=1 로 서버를 시작하면 리런마다 구간 시간과 읽기/쓰기 바이트를 기록합니다.")
+            else:
+                st.caption(f"기록 파일: {TRACE_LOG_FILE} (리런마다 한 줄, JSONL)")
+                diag_scope = st.radio("범위", ["현재 세션", "전체 세션"], horizontal=True, key="diag_scope")
+                session_id = st.session_state['trace_session'] if diag_scope == "현재 세션" else None
+                records = tracing.recent_reruns(session_id)
+
+                if not records:
+                    st.info("아직 기록된 리런이 없습니다.")
+                else:
+                    st.markdown(f"##### ⏱️ 구간별 시간 (최근 리런 {len(records)}회)")
+                    st.dataframe(tracing.span_summary(records).style.format({'누적 ms': '{:.1f}', '리런당 ms': '{:.1f}'}),
+                                 use_container_width=True, hide_index=True)
+
+                    st.markdown("##### 🔁 최근 리런")
+                    st.dataframe(tracing.rerun_table(records[::-1]).style.format({'리런 ms': '{:.1f}', '읽기 KB': '{:.1f}', '쓰기 KB': '{:.1f}'}),
+                                 use_container_width=True, hide_index=True)
+
+                st.markdown("##### 👥 세션별 누적")
+                totals = tracing.session_totals()
+                st.dataframe(pd.DataFrame([{
+                    '세션': sid, '리런 수': t['reruns'], '누적 ms': round(t['ms'], 1),
+                    '읽기 KB': round(t['counters'].get('read_bytes', 0) / 1024, 1),
+                    '쓰기 KB': round(t['counters'].get('write_bytes', 0) / 1024, 1),
+                } for sid, t in totals.items()]), use_container_width=True, hide_index=True)
+
+            st.markdown("##### 🗄️ 데이터 서비스 (미리 읽은 테이블/인덱스)")
+            service_status = dataservice.status()
+            if service_status:
+                st.dataframe(pd.DataFrame(service_status), use_container_width=True, hide_index=True)
+            else:
+                st.info("아직 미리 읽기가 끝나지 않았습니다.")
+
 # --- 프로그램 실행 ---
-if st.session_state['logged_in']:
-    main_app()
-else:
-    login_page()
+try:
+    show_flash()
+    if st.session_state['logged_in']:
+        main_app()
+    else:
+        login_page()
+finally:
+    # st.rerun()/st.stop()으로 중단된 실행도 기록
+    tracing.end_rerun()
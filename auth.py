@@ -0,0 +1,246 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import accounts
+import storage
+from config import (
+    USER_FILE, PASSWORD_KDF, PASSWORD_KDF_COST,
+    LOGIN_MAX_FAILURES_PER_ID, LOGIN_MAX_FAILURES_PER_IP, LOGIN_FAILURE_WINDOW,
+)
+
+# --- 설정: 비밀번호 해시 ---
+# users.csv의 '비밀번호'에는 '<KDF>$<비용>$<솔트>$<해시>' 형식으로 저장한다.
+#  - pbkdf2_sha256: 비용 = 반복 횟수
+#  - scrypt: 비용 = N (r=8, p=1)
+# 저장된 값의 KDF/비용으로 검증하므로 설정을 바꿔도 기존 해시는 그대로 동작하고,
+# 로그인에 성공하면 현재 설정으로 다시 해시해 저장한다. 해시 형식이 아닌 값은 구버전 평문으로 보고 비교한다.
+KDF_DEFAULT_COST = {'pbkdf2_sha256': 200_000, 'scrypt': 2 ** 14}
+SALT_BYTES = 16
+
+# --- 설정: 검증 캐시 ---
+# KDF 비용을 높여도 교대 시간 로그인 폭주가 밀리지 않도록 최근 성공한 검증을 기억한다.
+# (사번 -> 저장된 해시, 비밀번호 HMAC) 으로, 비밀번호 원문은 보관하지 않고 프로세스마다 새 키를 쓴다.
+# 비밀번호가 바뀌면 저장된 해시가 달라져 캐시 항목이 자동으로 무효가 된다.
+VERIFY_CACHE_MAX = 2048
+VERIFY_CACHE_TTL = 600     # 초
+
+_cache_key = secrets.token_bytes(32)
+_verified = OrderedDict()
+_verified_lock = threading.Lock()
+
+# --- 설정: 로그인 시도 제한 ---
+# 최근 LOGIN_FAILURE_WINDOW초 동안 사번별/IP별 실패 횟수가 한도를 넘으면, 가장 오래된 실패가
+# 기간을 벗어날 때까지 비밀번호를 검사하지 않고 거부한다.
+# 없는 사번도 더미 해시로 같은 KDF 계산을 하여 '없는 사번'과 '틀린 비밀번호'의 응답 시간이 같다.
+_failures = {}             # ('id' | 'ip', 값) -> 실패 시각 deque
+_failures_lock = threading.Lock()
+
+
+class LoginThrottled(Exception):
+    def __init__(self, wait):
+        super().__init__(f"로그인 시도가 너무 많습니다. {wait}초 후 다시 시도해주세요.")
+        self.wait = wait
+
+
+# --- 함수: 해시 생성/검증 ---
+def _b64(raw):
+    return base64.b64encode(raw).decode('ascii')
+
+
+def _derive(kdf, cost, salt, password):
+    secret = password.encode('utf-8')
+    if kdf == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', secret, salt, cost)
+    if kdf == 'scrypt':
+        return hashlib.scrypt(secret, salt=salt, n=cost, r=8, p=1, maxmem=256 * cost * 8 + 1024 * 1024)
+    raise ValueError(f"지원하지 않는 KDF: {kdf}")
+
+
+def hash_password(password, kdf=None, cost=None):
+    kdf = kdf or PASSWORD_KDF
+    cost = cost or PASSWORD_KDF_COST or KDF_DEFAULT_COST[kdf]
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{kdf}${cost}${_b64(salt)}${_b64(_derive(kdf, cost, salt, password))}"
+
+
+def _parse(stored):
+    # 반환: (kdf, 비용, 솔트, 해시) 또는 해시 형식이 아니면 None
+    parts = str(stored).split('$')
+    if len(parts) != 4 or parts[0] not in KDF_DEFAULT_COST:
+        return None
+    try:
+        return parts[0], int(parts[1]), base64.b64decode(parts[2]), base64.b64decode(parts[3])
+    except ValueError:
+        return None
+
+
+def is_blank(stored):
+    # 비밀번호가 없는 계정 (CSV의 빈 칸은 NaN으로 읽힘)
+    return stored is None or (not isinstance(stored, str) and pd.isna(stored)) or str(stored).strip() == ""
+
+
+def is_hashed(stored):
+    return stored is not None and _parse(stored) is not None
+
+
+def needs_rehash(stored):
+    parsed = _parse(stored)
+    return parsed is None or parsed[:2] != (PASSWORD_KDF, PASSWORD_KDF_COST or KDF_DEFAULT_COST[PASSWORD_KDF])
+
+
+def verify_password(stored, password):
+    if is_blank(stored):
+        # 비밀번호가 없는 계정은 항상 거부 (NaN이 'nan' 문자열로 비교되지 않도록). 응답 시간은 같게 유지
+        verify_password(_DUMMY_HASH, password)
+        return False
+    parsed = _parse(stored)
+    if parsed is None:
+        # 구버전 평문 (마이그레이션 전)
+        return hmac.compare_digest(str(stored).encode('utf-8'), password.encode('utf-8'))
+    kdf, cost, salt, digest = parsed
+    return hmac.compare_digest(_derive(kdf, cost, salt, password), digest)
+
+
+_DUMMY_HASH = hash_password(secrets.token_hex(8))
+
+
+# --- 함수: 검증 캐시 ---
+def _cache_digest(user_id, stored, password):
+    message = '\0'.join([str(user_id), str(stored), password]).encode('utf-8')
+    return hmac.new(_cache_key, message, hashlib.sha256).digest()
+
+
+def _cache_hit(user_id, stored, password):
+    with _verified_lock:
+        entry = _verified.get(user_id)
+        if entry is None or time.monotonic() - entry[1] > VERIFY_CACHE_TTL:
+            return False
+        _verified.move_to_end(user_id)
+    return hmac.compare_digest(entry[0], _cache_digest(user_id, stored, password))
+
+
+def _cache_put(user_id, stored, password):
+    digest = _cache_digest(user_id, stored, password)
+    with _verified_lock:
+        _verified[user_id] = (digest, time.monotonic())
+        _verified.move_to_end(user_id)
+        while len(_verified) > VERIFY_CACHE_MAX:
+            _verified.popitem(last=False)
+
+
+def forget(user_id):
+    with _verified_lock:
+        _verified.pop(user_id, None)
+
+
+# --- 함수: 시도 제한 ---
+def _reserve_attempt(keys, now):
+    # 한도 확인과 동시에 이번 시도를 실패로 미리 기록 (동시에 들어온 시도들이 한도를 함께 넘지 못하도록)
+    # 반환: 기다려야 할 초 (0이면 시도 가능)
+    with _failures_lock:
+        wait = 0
+        for key, limit in keys:
+            times = _failures.setdefault(key, deque())
+            while times and now - times[0] > LOGIN_FAILURE_WINDOW:
+                times.popleft()
+            if len(times) >= limit:
+                wait = max(wait, int(LOGIN_FAILURE_WINDOW - (now - times[0])) + 1)
+        if not wait:
+            for key, _ in keys:
+                _failures[key].append(now)
+        return wait
+
+
+def _release_attempt(keys, now):
+    # 성공: 사번의 실패 기록은 지우고, IP에는 미리 기록한 이번 시도만 취소
+    with _failures_lock:
+        for key, _ in keys:
+            times = _failures.get(key)
+            if key[0] == 'id':
+                _failures.pop(key, None)
+            elif times and now in times:
+                times.remove(now)
+                if not times:
+                    _failures.pop(key, None)
+
+
+# --- 함수: 로그인 ---
+def authenticate(user_id, password, ip=""):
+    # 반환: 회원 정보(dict) 또는 None. 시도 제한 중이면 LoginThrottled
+    user_id, password = str(user_id or ""), str(password or "")
+    keys = [(('id', user_id), LOGIN_MAX_FAILURES_PER_ID)]
+    if ip:
+        keys.append((('ip', ip), LOGIN_MAX_FAILURES_PER_IP))
+    now = time.monotonic()
+    wait = _reserve_attempt(keys, now)
+    if wait:
+        raise LoginThrottled(wait)
+
+    user = accounts.get_user(user_id) if user_id else None
+    stored = user.get('비밀번호') if user is not None else None
+    if user is not None and _cache_hit(user_id, stored, password):
+        _release_attempt(keys, now)
+        return user
+
+    # 없는 사번도 같은 비용의 검증을 수행 (응답 시간으로 사번 존재 여부를 알 수 없도록)
+    ok = verify_password(stored if user is not None else _DUMMY_HASH, password) and user is not None
+    if not ok:
+        return None
+
+    _release_attempt(keys, now)
+    if needs_rehash(stored):
+        stored = hash_password(password)
+        accounts.update_user(user_id, {'비밀번호': stored})
+        user = dict(user, 비밀번호=stored)
+    _cache_put(user_id, stored, password)
+    return user
+
+
+def set_password(user_id, password):
+    forget(user_id)
+    accounts.update_user(user_id, {'비밀번호': hash_password(password)})
+
+
+# --- 일회성 작업: users.csv 평문 비밀번호 해시 변환 ---
+def migrate_users(workers=None):
+    # KDF 계산은 GIL을 놓으므로 스레드로 병렬 처리. 반환: 변환한 계정 수
+    with storage.locked(USER_FILE):
+        users = storage.load_table(USER_FILE, accounts.USER_COLUMNS, key=accounts.USER_KEY)
+        if users.empty or '비밀번호' not in users.columns:
+            return 0
+        plain = ~users['비밀번호'].map(is_blank) & ~users['비밀번호'].map(is_hashed)
+        if not plain.any():
+            return 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashed = list(pool.map(hash_password, users.loc[plain, '비밀번호'].astype(str)))
+        users.loc[plain, '비밀번호'] = hashed
+        storage.save_table(USER_FILE, users)
+        return int(plain.sum())
+
+
+def blank_password_users():
+    # 비밀번호가 비어 있어 로그인할 수 없는 계정 (관리자가 비밀번호를 새로 지정해야 함)
+    users = storage.snapshot(USER_FILE, accounts.USER_COLUMNS, key=accounts.USER_KEY)
+    if users.empty or '비밀번호' not in users.columns:
+        return []
+    return users.loc[users['비밀번호'].map(is_blank), accounts.USER_KEY].astype(str).tolist()
+
+
+if __name__ == '__main__':
+    # 사용법: python auth.py migrate
+    if len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        print(f"{USER_FILE}: {migrate_users()}개 계정의 비밀번호를 해시로 변환했습니다.")
+        blank = blank_password_users()
+        if blank:
+            print(f"비밀번호가 비어 있어 로그인할 수 없는 계정 {len(blank)}개: {', '.join(blank)}")
+    else:
+        print("사용법: python auth.py migrate")
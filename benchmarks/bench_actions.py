@@ -0,0 +1,108 @@
+# 처리 버튼 부하 테스트: 여러 심사자 세션이 동시에 제안을 채택할 때의 응답 시간과 처리량
+#  - 임시 폴더에 합성 데이터를 만들고, 세션마다 AppTest로 '전체 활동 조회 및 평가' 화면을 연다
+#    (AppTest는 한 프로세스에서 동시에 여러 개를 실행할 수 없으므로 세션마다 별도 프로세스)
+#  - 각 세션은 서로 다른 심사 대기 제안을 골라 '✅ 채택 (승인)'을 누르는 것을 반복
+#  - 클릭 응답: 버튼 클릭부터 결과 메시지가 있는 다음 화면까지 (확인 메시지 대기 시간 포함)
+#  - 처리량: 전체 채택 건수 / 모든 세션이 끝날 때까지의 시간 (제안 선택 리런 포함)
+#  - --app-dir로 다른 버전의 앱을 지정하면 같은 조건으로 비교할 수 있다
+#    예) git worktree add /tmp/tpm_old <커밋> 후 --app-dir /tmp/tpm_old
+# 사용법: python benchmarks/bench_actions.py [제안 수] [세션 수] [세션당 채택 수] [--app-dir 경로]
+import argparse
+import datetime
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import datagen
+from config import SUGGESTION_FILE
+
+REVIEW_MENU = "📊 전체 활동 조회 및 평가"
+ROOT_SESSION = {'logged_in': True, 'user_role': 'Root', 'user_id': 'administrator', 'user_name': '관리자'}
+
+
+def open_review(work_dir):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(work_dir, 'app.py'), default_timeout=120)
+    for key, value in ROOT_SESSION.items():
+        at.session_state[key] = value
+    at.run()
+    at.sidebar.radio[0].set_value(REVIEW_MENU).run()
+    at.date_input(key='filter_date_range').set_value((datetime.date(2020, 1, 1), datetime.date(2030, 1, 1))).run()
+    assert not at.exception, at.exception
+    return at
+
+
+def approve(at, title):
+    # 반환: 클릭 응답 ms
+    box = [s for s in at.selectbox if s.label == '검토할 제안 선택'][0]
+    box.set_value(title).run()
+    button = [b for b in at.button if b.label == '✅ 채택 (승인)'][0]
+    start = time.perf_counter()
+    button.click().run()
+    elapsed = (time.perf_counter() - start) * 1000
+    assert not at.exception, at.exception
+    return elapsed
+
+
+def session(work_dir, titles, barrier, result_queue):
+    os.chdir(work_dir)
+    sys.path.insert(0, work_dir)
+    at = open_review(work_dir)
+    barrier.wait()
+    result_queue.put([approve(at, title) for title in titles])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('rows', type=int, nargs='?', default=2_000)
+    parser.add_argument('sessions', type=int, nargs='?', default=8)
+    parser.add_argument('actions', type=int, nargs='?', default=5)
+    parser.add_argument('--app-dir', default=ROOT)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='tpm_actions_')
+    try:
+        datagen.write_dataset(work_dir, args.rows)
+        datagen.copy_app(work_dir, os.path.abspath(args.app_dir))
+        suggestions = pd.read_csv(os.path.join(work_dir, SUGGESTION_FILE), dtype=str)
+        pending = suggestions[suggestions['상태'].isin(["접수", "심사대기"])]['제목'].tolist()
+        need = args.sessions * args.actions
+        if len(pending) < need:
+            raise SystemExit(f"심사 대기 제안이 부족합니다 ({len(pending)} < {need}). 제안 수를 늘려주세요.")
+
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(args.sessions + 1)
+        result_queue = ctx.Queue()
+        procs = [ctx.Process(target=session, args=(work_dir, pending[i * args.actions:(i + 1) * args.actions],
+                                                   barrier, result_queue))
+                 for i in range(args.sessions)]
+        for proc in procs:
+            proc.start()
+        barrier.wait()
+        start = time.perf_counter()
+        clicks = sorted(ms for _ in procs for ms in result_queue.get())
+        wall = time.perf_counter() - start
+        for proc in procs:
+            proc.join()
+
+        print(f"앱: {os.path.abspath(args.app_dir)}")
+        print(f"제안 수: {args.rows:,}, 동시 세션: {args.sessions}, 세션당 채택: {args.actions}")
+        print(f"클릭 응답: 중앙값 {statistics.median(clicks):8.1f} ms | 최대 {clicks[-1]:8.1f} ms")
+        print(f"처리량   : {len(clicks) / wall:6.2f} 건/s (전체 {len(clicks)}건, {wall:.1f} s)")
+        return 0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# 로그인 폭주 벤치마크: 여러 세션이 동시에 첫 화면을 열 때의 파싱 횟수와 응답 시간
+#  - 임시 폴더에 합성 데이터를 만들고, 스레드 N개가 동시에 첫 화면에 필요한 테이블/인덱스를 요청
+#  - 시나리오마다 새 프로세스 (캐시가 빈 상태에서 시작)
+#    cold: 미리 읽기 없이 세션들이 동시에 요청 (single-flight로 파일당 한 번만 파싱되어야 함)
+#    warm: dataservice가 미리 읽은 뒤 세션들이 요청 (세션은 파싱하지 않음)
+# 사용법: python benchmarks/bench_burst.py [제안 수] [세션 수]
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import datagen
+
+
+def first_render(user_id):
+    # 로그인 직후 첫 화면이 읽는 것: 회원 조회, 레벨/포인트, 제안 목록/명예의 전당
+    import accounts
+    import leaderboard
+    import ledger
+    import levels
+    import query
+
+    accounts.get_user(user_id)
+    levels.load_level_table()
+    ledger.get_user_points(user_id)
+    leaderboard.dept_ranking()
+    query.query_suggestions({}, 1, 15)
+
+
+def run_scenario(work_dir, scenario, n_sessions, result_queue):
+    os.chdir(work_dir)
+    sys.path.insert(0, work_dir)
+    import schema
+    import storage
+
+    schema.ensure_current()
+    parses = []
+    original = storage._read_base
+
+    def counting_read_base(file_path, usecols=None):
+        parses.append(os.path.basename(file_path))
+        return original(file_path, usecols)
+
+    storage._read_base = counting_read_base
+
+    if scenario == 'warm':
+        import dataservice
+        dataservice.warm_all()
+    parses_before = len(parses)
+
+    times = [0.0] * n_sessions
+    barrier = threading.Barrier(n_sessions)
+
+    def session(i):
+        barrier.wait()
+        start = time.perf_counter()
+        first_render(str(240000 + i))
+        times[i] = (time.perf_counter() - start) * 1000
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result_queue.put({'parses': len(parses) - parses_before, 'median_ms': statistics.median(times),
+                      'max_ms': max(times)})
+
+
+def measure(work_dir, scenario, n_sessions):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_scenario, args=(work_dir, scenario, n_sessions, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(n_rows, n_sessions):
+    work_dir = tempfile.mkdtemp(prefix='tpm_burst_')
+    try:
+        datagen.write_dataset(work_dir, n_rows)
+        datagen.copy_app(work_dir)
+        print(f"제안 수: {n_rows:,}, 동시 세션: {n_sessions}")
+        for scenario in ['cold', 'warm']:
+            r = measure(work_dir, scenario, n_sessions)
+            print(f"{scenario:<5}: 세션 중 CSV 파싱 {r['parses']:3d}회 | "
+                  f"첫 화면 중앙값 {r['median_ms']:8.1f} ms | 최대 {r['max_ms']:8.1f} ms")
+        return 0
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 30))
@@ -0,0 +1,62 @@
+# 작성자 레벨 판별 벤치마크: 기존 방식(iterrows 반복) vs 레벨 테이블(searchsorted)
+# 사용법: python benchmarks/bench_levels.py [사용자 수]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import levels
+
+LEVEL_DF = pd.DataFrame({
+    "이모지": ["🌱", "🥉", "🥈", "🥇", "👑"],
+    "등급명": ["새싹", "브론즈", "실버", "골드", "마스터"],
+    "필요점수": [0, 50, 200, 500, 1000],
+})
+LEGACY_SAMPLE = 5000  # 기존 방식은 느리므로 일부만 측정 후 환산
+
+
+def legacy_author_level(points, level_settings):
+    # 변경 전 get_author_level()과 동일한 로직
+    lv_name = "새싹"
+    emoji = "🌱"
+    for _, r in level_settings.iterrows():
+        if points >= r['필요점수']:
+            lv_name = r['등급명']
+            emoji = r['이모지']
+    return f"{emoji} {lv_name}"
+
+
+def main(n_users):
+    rng = np.random.default_rng(0)
+    points = pd.Series(rng.integers(0, 1500, size=n_users))
+
+    start = time.perf_counter()
+    table = levels.compile_levels(LEVEL_DF)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    labels = levels.level_labels(points, table)
+    vector_ms = (time.perf_counter() - start) * 1000
+
+    sample = points.iloc[:min(LEGACY_SAMPLE, n_users)]
+    level_settings = LEVEL_DF.sort_values('필요점수')
+    start = time.perf_counter()
+    legacy = sample.apply(lambda p: legacy_author_level(p, level_settings))
+    legacy_ms = (time.perf_counter() - start) * 1000 * n_users / len(sample)
+
+    mismatches = int((legacy.to_numpy() != labels[:len(sample)]).sum())
+    print(f"사용자 수            : {n_users:,}")
+    print(f"레벨 테이블 생성      : {compile_ms:8.2f} ms")
+    print(f"searchsorted 판별     : {vector_ms:8.2f} ms")
+    print(f"기존 iterrows (환산)  : {legacy_ms:8.2f} ms")
+    print(f"속도 향상             : {legacy_ms / max(vector_ms, 1e-6):8.0f} 배")
+    print(f"결과 불일치           : {mismatches} 건 (표본 {len(sample):,}명)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,103 @@
+# 로그인 벤치마크: 동시 로그인 시도 N건의 응답 시간 (교대 시간 로그인 폭주 재현)
+#  - 임시 폴더에 계정을 만들고 (앱 설정 KDF/비용으로 해시) 스레드 N개가 동시에 auth.authenticate() 호출
+#  - 첫 로그인: 검증 캐시가 비어 있어 모든 시도가 KDF를 계산
+#  - 다시 로그인: 같은 계정/비밀번호는 검증 캐시로 처리
+#  - 실패 폭주: 한 IP에서 틀린 비밀번호로 시도 (IP별 한도를 넘으면 KDF 없이 즉시 거부)
+# 사용법: python benchmarks/bench_login.py [시도 수] [--users 계정 수]
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def make_users(n_users):
+    import auth
+    from config import USER_FILE
+
+    ids = [str(240000 + i) for i in range(n_users)]
+    users = pd.DataFrame({
+        '사번': ids,
+        '비밀번호': [auth.hash_password(uid) for uid in ids],
+        '이름': [f"사용자{i}" for i in range(n_users)],
+        '권한': "일반", '부서': "생산1팀", '직책': "사원", '가입날짜': "",
+    })
+    users.to_csv(USER_FILE, index=False, encoding='utf-8-sig')
+    return ids
+
+
+def burst(attempts):
+    # attempts: [(사번, 비밀번호, IP)] 를 동시에 시도. 반환: (시도별 ms, 성공 수, 제한 수)
+    import auth
+
+    times = [0.0] * len(attempts)
+    results = [None] * len(attempts)
+    barrier = threading.Barrier(len(attempts))
+
+    def attempt(i, user_id, password, ip):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            results[i] = 'ok' if auth.authenticate(user_id, password, ip=ip) is not None else 'fail'
+        except auth.LoginThrottled:
+            results[i] = 'throttled'
+        times[i] = (time.perf_counter() - start) * 1000
+
+    threads = [threading.Thread(target=attempt, args=(i, *a)) for i, a in enumerate(attempts)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return times, results.count('ok'), results.count('throttled')
+
+
+def report(label, times, ok, throttled, wall):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<10}: 중앙값 {statistics.median(times):8.1f} ms | p95 {p95:8.1f} ms | 최대 {times[-1]:8.1f} ms"
+          f" | 전체 {wall:6.1f} s | 성공 {ok} / 제한 {throttled}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('attempts', type=int, nargs='?', default=1000)
+    parser.add_argument('--users', type=int, default=None, help="계정 수 (기본: 시도 수와 같음)")
+    args = parser.parse_args()
+    n_users = args.users or args.attempts
+
+    work_dir = tempfile.mkdtemp(prefix='tpm_login_')
+    try:
+        os.chdir(work_dir)
+        import auth
+        from config import PASSWORD_KDF
+
+        start = time.perf_counter()
+        ids = make_users(n_users)
+        print(f"계정 {n_users:,}개 생성 ({PASSWORD_KDF}, {time.perf_counter() - start:.1f} s), 동시 시도 {args.attempts:,}건")
+
+        logins = [(ids[i % n_users], ids[i % n_users], f"10.0.{i // 250}.{i % 250}") for i in range(args.attempts)]
+        for label in ["첫 로그인", "다시 로그인"]:
+            start = time.perf_counter()
+            times, ok, throttled = burst(logins)
+            report(label, times, ok, throttled, time.perf_counter() - start)
+
+        failures = [(ids[i % n_users], "wrong", "10.9.9.9") for i in range(args.attempts)]
+        start = time.perf_counter()
+        times, ok, throttled = burst(failures)
+        report("실패 폭주", times, ok, throttled, time.perf_counter() - start)
+        return 0
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# 화면별 벤치마크: 합성 데이터(1k/10k/100k 행)로 각 화면을 AppTest로 실행하고 시간/메모리/디스크 읽기를 측정
+#  - 화면마다 새 프로세스에서 실행하므로 캐시가 비어 있는 첫 화면(cold)과 같은 세션의 다시 실행(warm)을 함께 측정
+#  - 최대 RSS: 해당 프로세스의 peak RSS (streamlit 자체 사용량 포함)
+#  - 읽은 바이트: /proc/self/io 의 rchar 증가량 (페이지 캐시 적중 포함, 리눅스 전용)
+#  - 기준값 파일(baseline.json)이 있으면 비교하여 허용치를 넘는 항목이 있으면 실패(종료 코드 1)
+# 사용법: python benchmarks/bench_pages.py [--rows 1000 10000 100000] [--pages login register ...]
+#                                         [--image-kb KB] [--backend csv|sqlite] [--save-baseline] [--tolerance 0.3]
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import datagen
+
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+ROOT_SESSION = {'logged_in': True, 'user_role': 'Root', 'user_id': 'administrator', 'user_name': '시스템관리자'}
+USER_SESSION = {'logged_in': True, 'user_role': '일반', 'user_id': '240000', 'user_name': '사용자0'}
+
+# 화면 이름 -> (세션 상태, 메뉴). 세션 상태가 None이면 로그인 화면
+PAGES = {
+    'login': (None, None),
+    'register': (USER_SESSION, "📝 활동 등록 (공통)"),
+    'my_list': (USER_SESSION, "📂 나의 작성 목록"),
+    'review': (ROOT_SESSION, "📊 전체 활동 조회 및 평가"),
+    'admin': (ROOT_SESSION, "⚙️ 시스템 관리"),
+}
+METRICS = ['cold_ms', 'warm_ms', 'peak_rss_mb', 'read_mb']
+# 작은 값의 측정 잡음으로 실패하지 않도록 허용치에 더하는 절대 여유
+SLACK = {'cold_ms': 100, 'warm_ms': 50, 'peak_rss_mb': 20, 'read_mb': 1}
+
+
+def read_bytes():
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_page(work_dir, backend, page, result_queue):
+    os.chdir(work_dir)
+    os.environ['TPM_STORAGE'] = backend
+    sys.path.insert(0, work_dir)
+    from streamlit.testing.v1 import AppTest
+
+    # 사용 중단 예정 경고 등은 측정 출력에서 제외
+    logging.disable(logging.WARNING)
+    warnings.simplefilter('ignore')
+
+    session, menu = PAGES[page]
+    at = AppTest.from_file(os.path.join(work_dir, 'app.py'), default_timeout=600)
+    if session is not None:
+        for key, value in dict(session, menu=menu).items():
+            at.session_state[key] = value
+
+    read_start = read_bytes()
+    start = time.perf_counter()
+    at.run()
+    if session is None:
+        # 로그인 화면: 화면 표시 + 로그인 처리까지
+        at.text_input(key='login_id').input('240000')
+        at.text_input(key='login_pw').input('240000')
+        at.button[0].click().run()
+    cold = time.perf_counter() - start
+    read_end = read_bytes()
+    error = str(at.exception[0].value) if at.exception else None
+
+    start = time.perf_counter()
+    at.run()
+    warm = time.perf_counter() - start
+
+    result_queue.put({
+        'cold_ms': round(cold * 1000, 1),
+        'warm_ms': round(warm * 1000, 1),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'read_mb': None if read_start is None else round((read_end - read_start) / (1024 * 1024), 2),
+        'error': error,
+    })
+
+
+def measure(work_dir, backend, page):
+    # 화면마다 새 프로세스 (peak RSS와 캐시를 화면별로 분리)
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_page, args=(work_dir, backend, page, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def prepare(work_dir, rows, image_kb, backend):
+    datagen.write_dataset(work_dir, rows, image_kb=image_kb, image_ratio=0.1 if image_kb else 0.0)
+    datagen.copy_app(work_dir)
+    if backend == 'sqlite':
+        subprocess.run([sys.executable, 'sqlite_store.py', 'import'], cwd=work_dir, check=True,
+                       stdout=subprocess.DEVNULL, env=dict(os.environ, TPM_STORAGE='sqlite'))
+
+
+def compare(results, baseline, tolerance):
+    # 반환: 기준값 대비 허용치를 넘은 항목 목록
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in METRICS:
+            value, ref = metrics.get(metric), base.get(metric)
+            if value is None or ref is None:
+                continue
+            limit = ref * (1 + tolerance) + SLACK[metric]
+            if value > limit:
+                regressions.append(f"{name} {metric}: {value} > {limit:.1f} (기준 {ref})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+    parser.add_argument('--image-kb', type=int, default=0)
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default='csv')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.3)
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    print(f"{'화면':<18}{'cold(ms)':>10}{'warm(ms)':>10}{'peak RSS(MB)':>14}{'읽기(MB)':>10}")
+    for rows in args.rows:
+        work_dir = tempfile.mkdtemp(prefix='tpm_pages_')
+        try:
+            prepare(work_dir, rows, args.image_kb, args.backend)
+            for page in args.pages:
+                name = f"{args.backend}/{rows}/{page}"
+                result = measure(work_dir, args.backend, page)
+                if result.pop('error'):
+                    failed = True
+                    print(f"{name:<18} 오류 발생")
+                    continue
+                results[name] = result
+                read_mb = '-' if result['read_mb'] is None else f"{result['read_mb']:.2f}"
+                print(f"{name:<18}{result['cold_ms']:>10.1f}{result['warm_ms']:>10.1f}"
+                      f"{result['peak_rss_mb']:>14.1f}{read_mb:>10}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"기준값 저장: {args.baseline} ({len(results)}개 항목)")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"성능 저하: {line}")
+        print("기준값 비교: " + ("실패" if regressions else "통과") + f" (허용치 +{args.tolerance:.0%})")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# 리런 범위 벤치마크: 평가 항목 클릭/페이지 이동 시 전체 스크립트 리런 vs 프래그먼트 리런
+#  - 임시 폴더에 합성 제안 데이터를 만들고 Root 계정으로 '전체 활동 조회 및 평가' 화면을 연다
+#  - 전체 리런: 위젯 값을 바꾸고 앱 전체를 다시 실행 (프래그먼트 도입 전 동작)
+#  - 프래그먼트 리런: 같은 조작을 해당 프래그먼트만 다시 실행 (브라우저에서의 동작)
+#    AppTest는 위젯 조작 시 항상 전체 리런을 하므로, 리런 요청에 프래그먼트 ID를 넣어 재현한다
+# 사용법: python benchmarks/bench_reruns.py [제안 수] [반복 수]
+import datetime
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import datagen
+
+REVIEW_MENU = "📊 전체 활동 조회 및 평가"
+ROOT_SESSION = {'logged_in': True, 'user_role': 'Root', 'user_id': 'administrator', 'user_name': '관리자'}
+
+
+def prepare(work_dir, n_rows):
+    datagen.write_dataset(work_dir, n_rows)
+    datagen.copy_app(work_dir)
+
+
+def fragment_id(at, func_name):
+    # 프래그먼트 저장소에서 함수 이름으로 프래그먼트 ID 찾기
+    for frag_id, wrapped in at._fragment_storage._fragments.items():
+        for cell in wrapped.__closure__ or ():
+            func = cell.cell_contents
+            if callable(func) and getattr(func, '__name__', None) == func_name:
+                return frag_id
+    raise LookupError(func_name)
+
+
+class fragment_rerun:
+    # 이 블록 안의 위젯 조작은 지정한 프래그먼트만 다시 실행
+    def __init__(self, frag_id):
+        self.frag_id = frag_id
+
+    def __enter__(self):
+        import streamlit.testing.v1.local_script_runner as runner
+        self.runner = runner
+        self.original = runner.RerunData
+        original, frag_id = self.original, self.frag_id
+        runner.RerunData = lambda **kw: original(fragment_id_queue=[frag_id], is_fragment_scoped_rerun=True, **kw)
+
+    def __exit__(self, *exc):
+        self.runner.RerunData = self.original
+
+
+def open_review(work_dir):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(work_dir, 'app.py'), default_timeout=120)
+    for key, value in ROOT_SESSION.items():
+        at.session_state[key] = value
+    at.run()
+    at.sidebar.radio[0].set_value(REVIEW_MENU).run()
+    at.date_input(key='filter_date_range').set_value((datetime.date(2020, 1, 1), datetime.date(2030, 1, 1))).run()
+    box = [s for s in at.selectbox if s.label == '검토할 제안 선택'][0]
+    box.set_value(box.options[1]).run()
+    assert not at.exception, at.exception
+    return at
+
+
+def click_radio(at, repeat):
+    # 창의성 점수를 번갈아 바꾸며 측정
+    times = []
+    for i in range(repeat):
+        radio = [r for r in at.radio if r.key and r.key.startswith('sc_c_')][0]
+        start = time.perf_counter()
+        radio.set_value([10, 20][i % 2]).run()
+        times.append((time.perf_counter() - start) * 1000)
+        assert not at.exception, at.exception
+    return times
+
+
+def click_page(at, repeat):
+    # 2페이지 <-> 1페이지를 번갈아 이동하며 측정
+    times = []
+    for i in range(repeat):
+        target = "2" if i % 2 == 0 else "1"
+        button = [b for b in at.button if b.key == f"page_{target}"][0]
+        start = time.perf_counter()
+        button.click().run()
+        times.append((time.perf_counter() - start) * 1000)
+        assert not at.exception, at.exception
+    return times
+
+
+def report(label, full, fragment):
+    full_ms, frag_ms = statistics.median(full), statistics.median(fragment)
+    print(f"{label:<14}: 전체 리런 {full_ms:8.1f} ms | 프래그먼트 리런 {frag_ms:8.1f} ms | {full_ms / max(frag_ms, 1e-6):5.1f} 배")
+
+
+def main(n_rows, repeat):
+    work_dir = tempfile.mkdtemp(prefix='tpm_reruns_')
+    try:
+        prepare(work_dir, n_rows)
+        os.chdir(work_dir)
+        sys.path.insert(0, work_dir)
+
+        at = open_review(work_dir)
+        radio_full = click_radio(at, repeat)
+        with fragment_rerun(fragment_id(at, 'render_scoring_panel')):
+            radio_frag = click_radio(at, repeat)
+
+        at = open_review(work_dir)
+        page_full = click_page(at, repeat)
+        with fragment_rerun(fragment_id(at, 'render_suggestion_table')):
+            page_frag = click_page(at, repeat)
+
+        print(f"제안 수: {n_rows:,}, 반복: {repeat}회 (중앙값)")
+        report("평가 항목 클릭", radio_full, radio_frag)
+        report("페이지 이동", page_full, page_frag)
+        return 0
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 10))
@@ -0,0 +1,93 @@
+# 일괄 심사 벤치마크: 심사 대기 N건을 건별로 반영할 때와 한 번에 반영할 때의 소요 시간
+#  - 임시 폴더에 합성 데이터를 만들고 심사 대기 행 N건을 오래된 순으로 가져와 채택/미채택을 번갈아 결정
+#  - 건별: storage.update_row() N번 (행마다 저널 추가 + 포인트 원장/명예의 전당/집계 갱신)
+#  - 일괄: storage.update_rows() 한 번 (저널 추가 1회 + 구독자 알림 1회)
+#  - 각 방식 후 ledger.verify()/cube.verify()로 집계가 원본과 일치하는지 확인
+# 사용법: python benchmarks/bench_review.py [제안 수] [심사 건수] [--backend csv|sqlite]
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import datagen
+
+
+def decisions(queue_df):
+    import grading
+
+    totals = [(i * 7) % 101 for i in range(len(queue_df))]
+    grades, points = grading.grade_scores(totals)
+    updates = {}
+    for i, row_id in enumerate(queue_df['ID']):
+        if i % 2 == 0:
+            updates[row_id] = {'상태': "채택", '등급': str(grades[i]), '포인트': int(points[i]), '평가점수': totals[i]}
+        else:
+            updates[row_id] = {'상태': "미채택"}
+    return updates
+
+
+def run(work_dir, mode, n_reviews):
+    import cube
+    import leaderboard
+    import ledger
+    import query
+    import storage
+    from config import SUGGESTION_FILE
+
+    # 원장/집계를 미리 만들어 두고 (화면이 떠 있는 상태) 반영 시간만 측정
+    ledger.points_by_user()
+    leaderboard.dept_ranking()
+    cube.dept_counts(*cube.trailing_months(1), [])
+    queue_df, _ = query.review_queue({}, limit=n_reviews)
+    versions = {row['ID']: storage.row_version(row) for row in queue_df.to_dict('records')}
+    updates = decisions(queue_df)
+
+    start = time.perf_counter()
+    if mode == 'single':
+        for row_id, changes in updates.items():
+            storage.update_row(SUGGESTION_FILE, row_id, changes, expected_version=versions[row_id])
+    else:
+        storage.update_rows(SUGGESTION_FILE, updates, expected_versions=versions)
+    elapsed = time.perf_counter() - start
+    return len(updates), elapsed, not ledger.verify() and not cube.verify()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('rows', type=int, nargs='?', default=10_000)
+    parser.add_argument('reviews', type=int, nargs='?', default=300)
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default='csv')
+    args = parser.parse_args()
+
+    print(f"제안 수: {args.rows:,}, 심사 건수: {args.reviews}, 저장소: {args.backend}")
+    for mode, label in [('single', "건별 반영"), ('batch', "일괄 반영")]:
+        work_dir = tempfile.mkdtemp(prefix='tpm_review_')
+        try:
+            datagen.write_dataset(work_dir, args.rows)
+            datagen.copy_app(work_dir)
+            env = dict(os.environ, TPM_STORAGE=args.backend)
+            if args.backend == 'sqlite':
+                subprocess.run([sys.executable, 'sqlite_store.py', 'import'], cwd=work_dir, env=env,
+                               check=True, capture_output=True)
+            # 방식마다 새 프로세스 (캐시/구독자 상태가 섞이지 않도록)
+            out = subprocess.run(
+                [sys.executable, '-c',
+                 "import sys, bench_review; n, s, ok = bench_review.run('.', sys.argv[1], int(sys.argv[2]));"
+                 " print(n, s, ok)", mode, str(args.reviews)],
+                cwd=work_dir, env=dict(env, PYTHONPATH=os.pathsep.join([work_dir, os.path.join(ROOT, 'benchmarks')])),
+                check=True, capture_output=True, text=True)
+            n, seconds, ok = out.stdout.split()[-3:]
+            print(f"{label}: {int(n):4d}건 {float(seconds) * 1000:9.1f} ms | 집계 검증 {'통과' if ok == 'True' else '실패'}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# 벤치마크용 합성 데이터 생성: 회원, 제안(본문 인라인 이미지 크기 지정), 분임조 활동, 레벨 설정
+#  - 같은 시드면 항상 같은 데이터가 생성된다
+#  - 'administrator'(Root), 'reviewer'(심사), '240000'(일반) 계정은 항상 포함 (비밀번호는 사번과 동일)
+#  - 비밀번호는 생성 시간을 줄이려고 낮은 KDF 비용으로 해시 (로그인에 성공하면 앱 설정 비용으로 다시 해시됨)
+# 사용법: python benchmarks/datagen.py <출력 폴더> [행 수] [--image-kb KB] [--image-ratio 비율] [--with-app]
+#   --with-app: 앱 소스도 함께 복사 (출력 폴더에서 바로 streamlit run app.py 가능)
+import argparse
+import base64
+import io
+import math
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import auth
+from config import USER_FILE, SUGGESTION_FILE, CIRCLE_FILE, LEVEL_SETTINGS_FILE
+
+DEPTS = ["생산1팀", "생산2팀", "생산3팀", "품질관리팀", "설비팀", "공무팀", "물류팀", "혁신TF담당"]
+POSITIONS = ["사원", "주임", "대리", "과장", "차장"]
+STATUSES = ["접수", "심사대기", "채택", "미채택", "임시저장"]
+STATUS_WEIGHTS = [0.3, 0.15, 0.35, 0.15, 0.05]
+GRADES = ["S", "A", "B", "C"]
+GRADE_POINTS = {"S": 20, "A": 10, "B": 5, "C": 1}
+GRADE_SCORES = {"S": 95, "A": 80, "B": 65, "C": 40}
+WORDS = ["설비", "점검", "주기", "개선", "불량", "감소", "작업", "표준화", "안전", "공정", "자동화", "교체", "금형", "세척", "라인"]
+
+FIXED_USERS = [
+    ("administrator", "administrator", "시스템관리자", "Root", "관리팀", "관리자"),
+    ("reviewer", "reviewer", "심사위원", "심사", "혁신TF담당", "과장"),
+]
+APP_SUFFIXES = ('.py', '.jpg')  # 앱 실행에 필요한 소스/이미지
+PASSWORD_COST = 1000            # 합성 계정 비밀번호 해시 비용 (pbkdf2 반복 횟수)
+
+
+def inline_image(kb, seed=0):
+    # 약 kb 크기의 PNG (무작위 픽셀이라 압축되지 않음)를 data URI <img> 태그로 반환
+    if kb <= 0:
+        return ""
+    from PIL import Image
+
+    side = max(1, int(math.sqrt(kb * 1024 / 3)))
+    pixels = np.random.default_rng(seed).integers(0, 256, size=(side, side, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format='PNG')
+    return f'<p><img src="data:image/png;base64,{base64.b64encode(buf.getvalue()).decode()}"></p>'
+
+
+def make_users(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_general = max(1, n_rows - len(FIXED_USERS))
+    ids = [str(240000 + i) for i in range(n_general)]
+    joined = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, size=n_general), unit='D')
+    general = pd.DataFrame({
+        '사번': ids,
+        '비밀번호': ids,
+        '이름': [f"사용자{i}" for i in range(n_general)],
+        '권한': "일반",
+        '부서': rng.choice(DEPTS, size=n_general),
+        '직책': rng.choice(POSITIONS, size=n_general),
+        '가입날짜': joined.strftime('%y/%m/%d'),
+    })
+    fixed = pd.DataFrame(FIXED_USERS, columns=['사번', '비밀번호', '이름', '권한', '부서', '직책'])
+    fixed['가입날짜'] = ""
+    users = pd.concat([fixed, general], ignore_index=True)
+    users['비밀번호'] = [auth.hash_password(pw, kdf='pbkdf2_sha256', cost=PASSWORD_COST) for pw in users['비밀번호']]
+    return users
+
+
+def make_suggestions(n_rows, users, image_kb=0, image_ratio=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    authors = users[users['권한'] == "일반"].sample(n=n_rows, replace=True, random_state=seed).reset_index(drop=True)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, size=n_rows), unit='D')
+    status = rng.choice(STATUSES, size=n_rows, p=STATUS_WEIGHTS)
+    adopted = status == "채택"
+    grade = np.where(adopted, rng.choice(GRADES, size=n_rows), "")
+    words = rng.choice(WORDS, size=(n_rows, 3))
+    titles = [f"{a} {b} {c} 제안 {i}" for i, (a, b, c) in enumerate(words)]
+
+    body = "<p>" + "현장 설비 점검 방식과 작업 표준을 개선합니다. " * 10 + "</p>"
+    body_with_image = body + inline_image(image_kb, seed)
+    with_image = rng.random(n_rows) < image_ratio
+
+    return pd.DataFrame({
+        '작성자ID': authors['사번'],
+        '날짜': dates.strftime('%Y-%m-%d'),
+        # 날짜 + 순번: 실제 ID 형식(시각 14자리 + 순번 3자리)과 같은 길이, 중복 없음
+        'ID': [f"{d:%Y%m%d}{i:09d}" for i, d in enumerate(dates)],
+        '작성자': authors['이름'],
+        '제목': titles,
+        '내용': [body_with_image if w else body for w in with_image],
+        '첨부파일': "",
+        '상태': status,
+        '등급': grade,
+        '포인트': [GRADE_POINTS.get(g, "") for g in grade],
+        '평가점수': [GRADE_SCORES.get(g, "") for g in grade],
+        '부서': authors['부서'],
+    })
+
+
+def make_circles(n_rows, users, seed=0):
+    rng = np.random.default_rng(seed)
+    authors = users[users['권한'] == "일반"].sample(n=n_rows, replace=True, random_state=seed).reset_index(drop=True)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, size=n_rows), unit='D')
+    return pd.DataFrame({
+        'ID': [f"{d:%Y%m%d}{i:09d}" for i, d in enumerate(dates)],
+        '작성자ID': authors['사번'],
+        '작성자': authors['이름'],
+        '날짜': dates.strftime('%Y-%m-%d'),
+        '분임조명': [f"{dept} 분임조" for dept in authors['부서']],
+        '활동내용': "설비 초기청소 및 불합리 적출 활동",
+        '첨부파일': "",
+        '상태': "접수",
+    })
+
+
+def make_level_settings():
+    return pd.DataFrame({"등급명": ["새싹", "브론즈", "실버", "골드", "마스터"], "필요점수": [0, 50, 200, 500, 1000]})
+
+
+def write_dataset(out_dir, n_rows, image_kb=0, image_ratio=0.0, seed=0):
+    # 회원 수는 행 수의 1/10 (최소 10명), 제안/분임조 활동은 행 수만큼 생성
+    os.makedirs(out_dir, exist_ok=True)
+    users = make_users(max(10, n_rows // 10), seed)
+    tables = {
+        USER_FILE: users,
+        SUGGESTION_FILE: make_suggestions(n_rows, users, image_kb, image_ratio, seed),
+        CIRCLE_FILE: make_circles(n_rows, users, seed),
+        LEVEL_SETTINGS_FILE: make_level_settings(),
+    }
+    for file_path, df in tables.items():
+        df.to_csv(os.path.join(out_dir, file_path), index=False, encoding='utf-8-sig')
+    return {file_path: len(df) for file_path, df in tables.items()}
+
+
+def copy_app(out_dir, app_dir=ROOT):
+    # app_dir: 다른 버전의 앱과 비교할 때 (예: git worktree로 꺼낸 이전 커밋)
+    for name in os.listdir(app_dir):
+        if name.endswith(APP_SUFFIXES):
+            shutil.copy(os.path.join(app_dir, name), out_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('out_dir')
+    parser.add_argument('rows', type=int, nargs='?', default=10_000)
+    parser.add_argument('--image-kb', type=int, default=0)
+    parser.add_argument('--image-ratio', type=float, default=0.1)
+    parser.add_argument('--with-app', action='store_true')
+    args = parser.parse_args()
+
+    counts = write_dataset(args.out_dir, args.rows, args.image_kb, args.image_ratio)
+    if args.with_app:
+        copy_app(args.out_dir)
+    for file_path, count in counts.items():
+        print(f"{os.path.join(args.out_dir, file_path)}: {count:,}행")
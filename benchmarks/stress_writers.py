@@ -0,0 +1,96 @@
+# 동시 쓰기 스트레스 테스트: 여러 프로세스가 같은 제안 테이블을 동시에 수정해도 변경이 유실되지 않는지 확인
+#  - 각 프로세스는 공유 행들의 '카운트'를 읽기 -> +1 -> 버전 검사 후 저장 (StaleWriteError면 다시 읽고 재시도)
+#  - 동시에 자기 행을 insert 하여 저널 추가/병합(compaction)이 겹치는 상황도 만든다
+#  - 최종 카운트 합계 = 프로세스 수 x 반복 수, 삽입 행 수 = 프로세스 수 x 반복 수 이면 통과
+# 사용법: python benchmarks/stress_writers.py [프로세스 수] [반복 수] [--backend csv|sqlite] [--unsafe]
+#   --unsafe: 버전 검사 없이 저장 (기존 방식의 변경 유실을 재현)
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_ROWS = 5
+TABLE = 'suggestions.csv'
+
+
+def worker(work_dir, backend, worker_id, iterations, unsafe, result_queue):
+    os.chdir(work_dir)
+    os.environ['TPM_STORAGE'] = backend
+    sys.path.insert(0, ROOT)
+    import storage
+
+    rng = random.Random(worker_id)
+    retries = 0
+    for i in range(iterations):
+        row_id = f"S{rng.randrange(SHARED_ROWS)}"
+        while True:
+            df = storage.load_table(TABLE, [])
+            row = df[df['ID'] == row_id].iloc[0]
+            count = int(row['카운트'])
+            try:
+                storage.update_row(TABLE, row_id, {'카운트': count + 1},
+                                   expected_version=None if unsafe else storage.row_version(row))
+                break
+            except storage.StaleWriteError:
+                retries += 1
+        storage.insert_row(TABLE, {'ID': f"W{worker_id}-{i}", '작성자ID': str(worker_id), '상태': "접수", '카운트': 0})
+    result_queue.put(retries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('processes', type=int, nargs='?', default=8)
+    parser.add_argument('iterations', type=int, nargs='?', default=100)
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default='csv')
+    parser.add_argument('--unsafe', action='store_true')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='tpm_stress_')
+    try:
+        os.chdir(work_dir)
+        os.environ['TPM_STORAGE'] = args.backend
+        sys.path.insert(0, ROOT)
+        import pandas as pd
+        import storage
+
+        rows = [{'ID': f"S{i}", '작성자ID': "0", '상태': "접수", '카운트': 0, storage.VERSION_COLUMN: 0}
+                for i in range(SHARED_ROWS)]
+        storage.save_table(TABLE, pd.DataFrame(rows))
+
+        ctx = multiprocessing.get_context('spawn')
+        queue = ctx.Queue()
+        start = time.perf_counter()
+        procs = [ctx.Process(target=worker, args=(work_dir, args.backend, w, args.iterations, args.unsafe, queue))
+                 for w in range(args.processes)]
+        for p in procs:
+            p.start()
+        retries = sum(queue.get() for _ in procs)
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        storage.invalidate(TABLE)
+        df = storage.load_table(TABLE, [])
+        expected = args.processes * args.iterations
+        counted = int(pd.to_numeric(df[df['ID'].str.startswith('S')]['카운트']).sum())
+        inserted = int(df['ID'].str.startswith('W').sum())
+        writes = expected * 2
+        print(f"백엔드: {args.backend}, 프로세스 {args.processes}개 x {args.iterations}회, "
+              f"{elapsed:.2f}초 ({writes / elapsed:.0f} 쓰기/초), 버전 충돌 재시도 {retries}회")
+        print(f"공유 행 카운트 합계: {counted} / 기대값 {expected}")
+        print(f"삽입 행: {inserted} / 기대값 {expected}")
+        ok = counted == expected and inserted == expected
+        print("결과: 통과 (유실 없음)" if ok else "결과: 실패 (변경 유실)")
+        return 0 if ok else 1
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
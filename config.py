@@ -0,0 +1,44 @@
+import os
+
+# --- 파일 및 폴더 경로 설정 ---
+USER_FILE = 'users.csv'           # 회원 정보
+SUGGESTION_FILE = 'suggestions.csv' # 제안제도 데이터
+CIRCLE_FILE = 'circle_activity.csv' # 분임조 데이터
+LEVEL_SETTINGS_FILE = 'level_settings.csv' # 레벨 기준 설정
+DRAFT_FILE = 'drafts.csv'         # 임시 저장 글
+UPLOAD_DIR = 'uploads'            # 파일 저장 폴더
+IMAGE_DIR = 'uploads/images'      # 본문 이미지 저장 폴더 (해시 파일명)
+ATTACHMENT_DIR = 'uploads/files'   # 첨부파일 저장 폴더 (내용 해시 파일명)
+ATTACHMENT_FILE = 'attachments.csv' # 첨부파일 메타데이터 (파일명, 크기, MIME, 해시, 업로더)
+HEADER_IMAGE = 'header_image.png'  # 로그인 화면 상단 이미지
+LEDGER_FILE = 'points_ledger.csv'  # 사용자별 포인트 원장 (suggestions.csv에서 파생)
+LEADERBOARD_FILE = 'leaderboard.csv'  # 명예의 전당 집계 스냅샷 (suggestions.csv에서 파생)
+ID_STATE_FILE = 'id_sequence.json'  # ID 발급 상태 (마지막 발급 시각/순번)
+CUBE_FILE = 'dept_cube.csv'        # 부서 x 연 x 월 x 상태 건수 (suggestions.csv에서 파생)
+SCHEMA_STATE_FILE = 'schema_version.json'  # 데이터 파일 스키마 버전 (schema.py 마이그레이션 기록)
+EVENT_LOG_FILE = 'events.jsonl'     # 상태 변경 이벤트 로그 (추가 전용, events.py)
+
+# --- 저장소 백엔드 설정 ---
+# 'csv': 기존 CSV 파일 + 변경 저널 (기본값)
+# 'sqlite': SQLite(WAL) 데이터베이스. 전환 전 `python sqlite_store.py import` 로 CSV를 가져온다.
+STORAGE_BACKEND = os.environ.get('TPM_STORAGE', 'csv')
+DATABASE_FILE = os.environ.get('TPM_DATABASE', 'tpm.db')
+
+# --- 성능 추적 설정 ---
+# TPM_TRACE=1 이면 리런마다 구간 시간/입출력 바이트를 기록하고 TPM_TRACE_LOG(JSONL)에 추가한다 (tracing.py)
+TRACE_ENABLED = os.environ.get('TPM_TRACE', '') not in ('', '0')
+TRACE_LOG_FILE = os.environ.get('TPM_TRACE_LOG', 'trace.jsonl')
+
+# --- 데이터 서비스 설정 ---
+# 서버 시작 시 테이블/인덱스를 백그라운드에서 미리 읽고, TPM_WATCH_INTERVAL초마다 파일 변경을 확인해 다시 읽는다 (dataservice.py)
+# 0 이면 시작 시 미리 읽기만 하고 변경 감시는 하지 않음
+WATCH_INTERVAL = float(os.environ.get('TPM_WATCH_INTERVAL', '2'))
+
+# --- 로그인 보안 설정 ---
+# 비밀번호 해시 KDF: 'pbkdf2_sha256'(비용 = 반복 횟수) 또는 'scrypt'(비용 = N). 비용 0 이면 KDF별 기본값 (auth.py)
+PASSWORD_KDF = os.environ.get('TPM_KDF', 'pbkdf2_sha256')
+PASSWORD_KDF_COST = int(os.environ.get('TPM_KDF_COST', '0'))
+# LOGIN_FAILURE_WINDOW초 동안 사번별/IP별 로그인 실패 허용 횟수 (넘으면 기간이 지날 때까지 거부)
+LOGIN_MAX_FAILURES_PER_ID = 5
+LOGIN_MAX_FAILURES_PER_IP = 50
+LOGIN_FAILURE_WINDOW = 300
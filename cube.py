@@ -0,0 +1,140 @@
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+import derived
+import storage
+from config import CUBE_FILE, SUGGESTION_FILE
+
+# --- 설정: 부서별 활동 집계 큐브 ---
+# (부서, 연, 월, 상태) -> 제안 건수. 제안이 등록/수정/삭제될 때 바뀐 행의 차이만 반영하므로
+# '부서별 활동 현황' 그래프는 원본 행을 다시 읽지 않고 큐브 셀만 합산한다.
+# 기간은 (연, 월) 단위 포함 범위로 지정 (당해년도, 당월, 분기, 최근 12개월 등).
+# 로드/저장/재구축/차이 반영은 derived.py가 처리한다.
+CUBE_COLUMNS = ['부서', '연', '월', '상태', '건수']
+SOURCE_COLUMNS = ['날짜', '상태', '부서']
+
+def _month_number(year, month):
+    return int(year) * 12 + int(month) - 1
+
+
+def _cell_key(row):
+    # 부서가 비어 있으면 '-' (구버전 데이터의 빈 부서/'반려' 상태는 schema 마이그레이션에서 정리됨). 행이 없으면 None
+    if row is None:
+        return None
+    date_dt = pd.to_datetime(row.get('날짜'), errors='coerce')
+    if pd.isna(date_dt):
+        return None
+    dept = row.get('부서')
+    if dept is None or pd.isna(dept) or str(dept) == "":
+        dept = "-"
+    status = row.get('상태')
+    status = "" if status is None or pd.isna(status) else str(status)
+    return dept, date_dt.year, date_dt.month, status
+
+
+# --- 함수: 큐브 파일 변환 ---
+def from_table(df):
+    cells = {}
+    for row in df.to_dict('records'):
+        status = row.get('상태')
+        key = (row['부서'], int(row['연']), int(row['월']), "" if pd.isna(status) else status)
+        cells[key] = int(row['건수'])
+    return cells
+
+
+def to_table(cells):
+    rows = [(dept, year, month, status, n) for (dept, year, month, status), n in sorted(cells.items()) if n > 0]
+    return pd.DataFrame(rows, columns=CUBE_COLUMNS)
+
+
+def compute_from_table(df):
+    if df.empty:
+        return {}
+    dates = pd.to_datetime(df['날짜'], errors='coerce')
+    dept = df['부서'].astype(object).replace("", None).fillna("-") if '부서' in df.columns else "-"
+    status = df['상태'].astype(object).fillna("") if '상태' in df.columns else ""
+    cells = pd.DataFrame({'부서': dept, '연': dates.dt.year, '월': dates.dt.month, '상태': status})
+    counts = cells.dropna(subset=['연']).groupby(['부서', '연', '월', '상태']).size()
+    return {(d, int(y), int(m), s): int(n) for (d, y, m, s), n in counts.items()}
+
+
+# --- 함수: 행 변경 반영 (derived.apply_changes에서 호출) ---
+def _relevant(changes):
+    # 내용/제목 수정처럼 부서/날짜/상태가 그대로인 변경은 큐브를 다시 쓰지 않음
+    return [(old, new) for old, new in changes if _cell_key(old) != _cell_key(new)]
+
+
+def _apply_delta(cells, changes):
+    for old_row, new_row in changes:
+        for row, sign in ((old_row, -1), (new_row, 1)):
+            key = _cell_key(row)
+            if key is not None:
+                cells[key] = cells.get(key, 0) + sign
+
+
+_cube = derived.define(CUBE_FILE, CUBE_COLUMNS, SOURCE_COLUMNS, compute_from_table, to_table, from_table,
+                       _apply_delta, relevant=_relevant)
+
+
+def _load():
+    return derived.load(_cube)
+
+
+def rebuild():
+    return derived.rebuild(_cube)
+
+
+# --- 함수: 기간 지정 ---
+def month_range(year, month):
+    return (year, month), (year, month)
+
+
+def year_range(year):
+    return (year, 1), (year, 12)
+
+
+def quarter_range(year, quarter):
+    return (year, quarter * 3 - 2), (year, quarter * 3)
+
+
+def trailing_months(n, today=None):
+    # 이번 달을 포함한 최근 n개월
+    today = today or datetime.now()
+    start = _month_number(today.year, today.month) - (n - 1)
+    return (start // 12, start % 12 + 1), (today.year, today.month)
+
+
+# --- 함수: 조회 ---
+def dept_counts(start, end, depts, statuses=None):
+    # start~end((연, 월) 포함 범위)의 부서별 건수. depts 순서의 Series (없는 부서는 0)
+    lo, hi = _month_number(*start), _month_number(*end)
+    counts = dict.fromkeys(depts, 0)
+    for (dept, year, month, status), n in _load().items():
+        if dept in counts and lo <= _month_number(year, month) <= hi and (statuses is None or status in statuses):
+            counts[dept] += n
+    return pd.Series(counts, index=list(depts), dtype='int64').rename_axis('부서')
+
+
+def verify():
+    # 저장된 큐브 파일에서 원본 테이블로 다시 계산한 값과 다른 셀 목록 (정상이면 빈 목록)
+    cells = derived.stored(_cube)
+    expected = compute_from_table(storage.snapshot(SUGGESTION_FILE, [], usecols=SOURCE_COLUMNS))
+    return [(key, cells.get(key, 0), expected.get(key, 0))
+            for key in set(cells) | set(expected) if cells.get(key, 0) != expected.get(key, 0)]
+
+
+if __name__ == '__main__':
+    # 사용법: python cube.py rebuild|verify
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == 'rebuild':
+        rebuild()
+        print(f"{CUBE_FILE}: 부서별 활동 집계를 재구축했습니다.")
+    elif command == 'verify':
+        diffs = verify()
+        print(f"{CUBE_FILE}: 불일치 {len(diffs)}건")
+        for key, got, want in diffs:
+            print(f"  {key}: {got} (원본 기준 {want})")
+    else:
+        print("사용법: python cube.py rebuild|verify")
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import accounts
+import cube
+import leaderboard
+import ledger
+import levels
+import query
+import search
+import storage
+from config import LEVEL_SETTINGS_FILE, SUGGESTION_FILE, USER_FILE, WATCH_INTERVAL
+
+# --- 설정: 데이터 서비스 (서버 프로세스당 하나) ---
+# 서버 시작 시 백그라운드 스레드가 테이블과 인덱스를 미리 읽어 두므로, 아침 로그인이 몰려도
+# 첫 화면이 CSV를 파싱하지 않는다. 이후 WATCH_INTERVAL초마다 파일 시그니처를 확인하여
+# 다른 프로세스(CLI, 다른 워커)가 파일을 바꾼 경우 해당 테이블의 인덱스를 다시 읽는다.
+#  - 캐시는 각 모듈(storage 로드 캐시, query/search/accounts 인덱스 등)이 가진 것을 그대로 사용하고,
+#    여기서는 미리 채우기만 한다. 세션이 같은 파일을 동시에 요청해도 storage.snapshot()이 한 번만 파싱한다.
+#  - 세션은 storage.snapshot()/인덱스를 읽기 전용으로 공유한다.
+WARMERS = {
+    USER_FILE: [
+        ('회원 인덱스', accounts.dept_map),
+    ],
+    LEVEL_SETTINGS_FILE: [
+        ('레벨 기준', levels.load_level_table),
+    ],
+    SUGGESTION_FILE: [
+        ('제안 목록 인덱스', query.load_index),
+        ('제안 전체', lambda: storage.snapshot(SUGGESTION_FILE, [])),
+        ('검색 색인', search.ensure_index),
+        ('포인트 원장', ledger.points_by_user),
+        ('명예의 전당', leaderboard.dept_ranking),
+        ('부서별 집계', lambda: cube.dept_counts(*cube.trailing_months(1), [])),
+    ],
+}
+
+_lock = threading.Lock()
+_service = {'thread': None, 'sigs': {}, 'status': {}}
+
+
+# --- 함수: 미리 읽기 ---
+def warm(file_path):
+    for name, loader in WARMERS[file_path]:
+        start = time.perf_counter()
+        try:
+            loader()
+            error = None
+        except Exception as e:  # 미리 읽기 실패는 세션이 직접 읽을 때 다시 드러나므로 기록만 함
+            error = str(e)
+        _service['status'][name] = {
+            '파일': file_path,
+            '읽은 시각': time.strftime('%H:%M:%S'),
+            '소요 ms': round((time.perf_counter() - start) * 1000, 1),
+            '오류': error or "",
+        }
+
+
+def warm_all():
+    for file_path in WARMERS:
+        _service['sigs'][file_path] = storage.file_signature(file_path)
+        warm(file_path)
+
+
+def _watch(interval):
+    warm_all()
+    while interval > 0:
+        time.sleep(interval)
+        for file_path in WARMERS:
+            sig = storage.file_signature(file_path)
+            if sig != _service['sigs'].get(file_path):
+                _service['sigs'][file_path] = sig
+                warm(file_path)
+
+
+# --- 함수: 시작/상태 조회 ---
+def start(interval=WATCH_INTERVAL):
+    # 여러 번 호출해도 스레드는 하나만 시작 (app.py에서는 st.cache_resource로 한 번 호출)
+    with _lock:
+        if _service['thread'] is None:
+            _service['thread'] = threading.Thread(target=_watch, args=(interval,), name='dataservice', daemon=True)
+            _service['thread'].start()
+        return _service['thread']
+
+
+def status():
+    # 진단 화면용: 인덱스별 마지막으로 읽은 시각 / 소요 시간
+    return [{'항목': name, **entry} for name, entry in list(_service['status'].items())]
@@ -0,0 +1,160 @@
+import copy
+import json
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+import storage
+from config import SUGGESTION_FILE
+
+# --- 설정: 원본 테이블에서 파생된 집계 파일 (포인트 원장, 명예의 전당, 부서별 집계 큐브) ---
+# 집계마다 define()으로 계산 함수들을 등록하면 로드/저장/재구축/행 변경 반영을 여기서 같은 방식으로 처리한다.
+#  - 집계 파일과 함께 '<집계 파일>.source.json'에 집계가 반영한 원본 시그니처를 기록하고,
+#    조회할 때 원본 시그니처가 기록과 다르면 재구축한다 (구독자 알림 없이 원본을 다시 쓴 CLI 마이그레이션 등)
+#  - 행 변경 알림은 쓰기 잠금 안에서 잰 (변경 직전, 직후) 원본 시그니처를 함께 받는다.
+#    직전 시그니처가 기록과 같을 때만 차이를 반영하고, 직후 시그니처와 같으면 이미 반영된 것이므로 건너뛰며,
+#    그 밖에는(다른 프로세스의 재구축/쓰기와 엇갈림) 재구축한다. 따라서 같은 변경이 두 번 더해지지 않는다.
+#  - 잠금 순서: 원본 -> 집계별 잠금 -> 집계 파일. 집계 읽기 -> 반영 -> 저장은 집계 파일 잠금(프로세스 간) 안에서 수행
+SOURCE_SIG_SUFFIX = '.source.json'
+
+
+def define(file_path, table_columns, source_columns, compute, to_table, from_table, apply_delta,
+           relevant=None, source=SUGGESTION_FILE):
+    # compute(원본 df) -> 집계, to_table(집계) -> df, from_table(df) -> 집계,
+    # apply_delta(집계 사본, 변경 목록): 제자리에서 반영, relevant(변경 목록) -> 집계에 영향이 있는 변경만
+    agg = {
+        'file': file_path, 'columns': table_columns, 'source': source, 'source_columns': source_columns,
+        'compute': compute, 'to_table': to_table, 'from_table': from_table, 'apply_delta': apply_delta,
+        'relevant': relevant or (lambda changes: changes),
+        'lock': threading.RLock(), 'sig': None, 'source_sig': None, 'data': None,
+    }
+
+    def on_change(changes, sigs):
+        apply_changes(agg, changes, sigs)
+
+    storage.subscribe(source, on_change, source_columns)
+    return agg
+
+
+def to_number(value):
+    num = pd.to_numeric(value, errors='coerce')
+    if pd.isna(num):
+        return 0
+    return int(num) if float(num).is_integer() else float(num)
+
+
+# --- 함수: 원본 시그니처 기록 ---
+def _source_sig_path(agg):
+    return agg['file'] + SOURCE_SIG_SUFFIX
+
+
+def _sig_text(sig):
+    # 비교용 문자열 (파일에 기록한 값과 같은 모양)
+    return json.dumps(sig)
+
+
+def _read_source_sig(agg):
+    try:
+        with open(_source_sig_path(agg), encoding='utf-8') as f:
+            return _sig_text(json.load(f))
+    except (OSError, ValueError):
+        return None   # 기록이 없거나 쓰는 도중 중단됨 -> 재구축
+
+
+def _write_source_sig(agg, sig):
+    # 잃어버려도 재구축으로 복구되므로 fsync는 하지 않음
+    path = _source_sig_path(agg)
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(_sig_text(sig))
+    os.replace(tmp_path, path)
+    agg['source_sig'] = _sig_text(sig)
+    agg['sig'] = _signature(agg)
+
+
+def _signature(agg):
+    # 집계 파일 + 원본 시그니처 기록 파일의 시그니처 (다른 프로세스가 갱신했는지 확인용)
+    try:
+        st = os.stat(_source_sig_path(agg))
+        meta = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        meta = None
+    return storage.file_signature(agg['file']), meta
+
+
+# --- 함수: 집계 로드/저장 ---
+def _read(agg):
+    # 캐시와 무관하게 집계 파일과 원본 시그니처 기록을 다시 읽음
+    with storage.locked(agg['file'], exclusive=False):
+        sig = _signature(agg)
+        storage.invalidate(agg['file'])
+        df = storage.load_table(agg['file'], agg['columns'], key=agg['columns'][0])
+        # 집계 파일이 없으면(지워서 재구축을 요청한 경우 등) 기록이 남아 있어도 재구축
+        source_sig = _read_source_sig(agg) if sig[0][0] is not None else None
+        agg.update(sig=sig, source_sig=source_sig, data=agg['from_table'](df))
+    return agg['data']
+
+
+def _save(agg, data, source_sig):
+    # 기록을 먼저 지워, 집계 파일을 쓰는 도중 중단되면 다음 조회 때 재구축되게 함
+    path = _source_sig_path(agg)
+    if os.path.exists(path):
+        os.remove(path)
+    storage.save_table(agg['file'], agg['to_table'](data))
+    agg['data'] = data
+    _write_source_sig(agg, source_sig)
+
+
+def load(agg):
+    # 반환: 원본의 현재 내용과 일치하는 집계 (읽기 전용)
+    with agg['lock']:
+        if agg['sig'] != _signature(agg):
+            _read(agg)
+        if agg['source_sig'] == _sig_text(storage.file_signature(agg['source'])):
+            return agg['data']
+    return rebuild(agg)
+
+
+def stored(agg):
+    # 집계 파일에 저장된 내용 (원본과 맞는지 확인하지 않음: 검증용)
+    with agg['lock']:
+        return _read(agg)
+
+
+def rebuild(agg):
+    # 원본을 읽는 동안 원본 쓰기를 막고(CSV), 읽기 전후 시그니처가 같을 때의 내용만 사용(SQLite는 파일 잠금 밖에서 씀)
+    with storage.locked(agg['source'], exclusive=False), agg['lock'], storage.locked(agg['file']):
+        while True:
+            source_sig = storage.file_signature(agg['source'])
+            df = storage.snapshot(agg['source'], [], usecols=agg['source_columns'])
+            if storage.file_signature(agg['source']) == source_sig:
+                break
+        data = agg['compute'](df)
+        _save(agg, data, source_sig)
+        return data
+
+
+# --- 함수: 행 변경 반영 (storage 구독) ---
+def apply_changes(agg, changes, sigs):
+    # changes: [(이전 행, 새 행)] (전체 저장이면 None, 저널 병합이면 빈 목록), sigs: (직전, 직후) 원본 시그니처
+    before, after = sigs if sigs is not None else (None, None)
+    if changes is not None and before is not None:
+        with agg['lock'], storage.locked(agg['file']):
+            if agg['sig'] != _signature(agg):
+                _read(agg)
+            if agg['source_sig'] == _sig_text(after):
+                return  # 다른 프로세스의 재구축이 이미 이번 변경을 반영함
+            if agg['source_sig'] == _sig_text(before):
+                relevant = agg['relevant'](changes)
+                if relevant:
+                    data = copy.deepcopy(agg['data'])
+                    agg['apply_delta'](data, relevant)
+                    _save(agg, data, after)
+                else:
+                    _write_source_sig(agg, after)  # 집계 내용은 그대로, 반영한 시그니처만 갱신
+                return
+    # 전체 저장이거나 기록과 엇갈린 경우: 이번 변경이 이미 반영된 원본으로 재구축 (차이는 더하지 않음)
+    rebuild(agg)
@@ -0,0 +1,145 @@
+import hashlib
+import time
+from datetime import datetime
+
+import events
+import ids
+import images
+import storage
+from config import DRAFT_FILE, SUGGESTION_FILE
+
+# --- 설정: 임시 저장 글 (drafts.csv) ---
+# 작성 중인 글은 제안 테이블(suggestions.csv)이 아닌 drafts.csv 에 따로 저장한다.
+# 목록/집계가 읽는 제안 테이블에는 제출(접수)하는 순간 완성된 한 행으로만 들어간다.
+#  - 자동 저장: 편집 중 리런마다 autosave()를 호출하되, 내용이 바뀌었고 마지막 저장 후
+#    AUTOSAVE_INTERVAL초가 지났을 때만 기록 (바뀐 컬럼만 저널에 추가)
+#  - 미뤄 둔 변경은 편집 상태에 남겨 두고 flush()로 기록한다 (화면의 주기 실행 프래그먼트, 메뉴 이동/로그아웃 시)
+#  - 같은 글을 여러 창에서 고치면 마지막에 저장한 내용이 남는다 (버전 검사 없음)
+#  - 본문 이미지는 images.ingest_images()로 파일로 빼낸 뒤 크기를 잰다
+AUTOSAVE_INTERVAL = 10                    # 초
+MAX_DRAFT_BYTES = 2 * 1024 * 1024         # 글 1개 최대 크기 (이미지 제외 본문, 2MB)
+MAX_DRAFTS_PER_USER = 20                  # 사용자별 임시 저장 글 수
+
+DRAFT_COLUMNS = ['ID', '작성자ID', '유형', '최초작성일', '최종저장일', '제목', '내용']
+DRAFT_ID_PREFIX = 'D'
+SAVED_AT_FORMAT = '%Y-%m-%d %H:%M'
+
+
+class DraftError(Exception):
+    pass
+
+
+# --- 함수: 조회 ---
+def list_drafts(user_id):
+    # 최근 저장한 글부터 (본문 포함, 사용자 한 명의 글만)
+    df = storage.snapshot(DRAFT_FILE, DRAFT_COLUMNS)
+    mine = df[df['작성자ID'] == str(user_id)]
+    return mine.sort_values('최종저장일', ascending=False, kind='stable')
+
+
+def get_draft(draft_id, user_id=None):
+    if not draft_id:
+        return None
+    df = storage.snapshot(DRAFT_FILE, DRAFT_COLUMNS)
+    rows = df[df['ID'] == draft_id]
+    if rows.empty:
+        return None
+    row = rows.head(1).fillna("").iloc[0].to_dict()
+    if user_id is not None and row['작성자ID'] != str(user_id):
+        return None
+    return row
+
+
+# --- 함수: 저장 / 삭제 ---
+def save_draft(user_id, title, content, draft_id=None, kind="제안"):
+    # 반환: 저장한 글의 ID. 없는(삭제/제출된) 글이면 새로 만든다
+    body = images.ingest_images(content or "")
+    if len(body.encode('utf-8')) > MAX_DRAFT_BYTES:
+        raise DraftError(f"임시 저장 글은 최대 {MAX_DRAFT_BYTES // (1024 * 1024)}MB까지 저장할 수 있습니다.")
+    now = datetime.now().strftime(SAVED_AT_FORMAT)
+    current = get_draft(draft_id, user_id)
+    if current is None:
+        if len(list_drafts(user_id)) >= MAX_DRAFTS_PER_USER:
+            raise DraftError(f"임시 저장 글은 최대 {MAX_DRAFTS_PER_USER}개입니다. 사용하지 않는 글을 삭제해주세요.")
+        draft_id = ids.new_id(DRAFT_ID_PREFIX)
+        storage.insert_row(DRAFT_FILE, {
+            'ID': draft_id, '작성자ID': str(user_id), '유형': kind,
+            '최초작성일': now, '최종저장일': now, '제목': title or "", '내용': body,
+        })
+        return draft_id
+    # 바뀐 컬럼만 기록
+    changes = {col: value for col, value in [('제목', title or ""), ('내용', body)] if current.get(col) != value}
+    if changes:
+        storage.update_row(DRAFT_FILE, draft_id, dict(changes, 최종저장일=now))
+    return draft_id
+
+
+def delete_draft(draft_id):
+    storage.delete_row(DRAFT_FILE, draft_id)
+
+
+# --- 함수: 자동 저장 (편집 화면 상태 + 디바운스) ---
+def new_editor(round_no=0, draft=None):
+    # 편집 화면 상태: 편집 중인 글 ID, 마지막 저장 내용 다이제스트/시각, 위젯 키 구분용 회차
+    return {
+        'id': draft['ID'] if draft else None,
+        'title': draft['제목'] if draft else "",
+        'content': images.render_images(draft['내용']) if draft else "",
+        'digest': None, 'saved_at': 0.0, 'saved_label': draft['최종저장일'] if draft else "",
+        'pending': None,      # 아직 기록하지 않은 (제목, 내용)
+        'round': round_no,
+    }
+
+
+def _digest(title, content):
+    return hashlib.sha256(f"{title}\0{content}".encode('utf-8')).hexdigest()
+
+
+def autosave(editor, user_id, title, content, force=False):
+    # 반환: 'empty'(입력 없음) / 'saved'(저장된 상태) / 'pending'(다음 저장 대기)
+    if not title and not content:
+        editor['pending'] = None
+        return 'empty'
+    digest = _digest(title, content)
+    if editor['digest'] is None and editor['id'] and title == editor['title'] and content == editor['content']:
+        # 불러온 직후: 아직 고친 내용 없음
+        editor['digest'] = digest
+    if digest == editor['digest'] and not force:
+        editor['pending'] = None
+        return 'saved'
+    if not force and time.monotonic() - editor['saved_at'] < AUTOSAVE_INTERVAL:
+        editor['pending'] = (title, content)
+        return 'pending'
+    editor['id'] = save_draft(user_id, title, content, editor['id'])
+    editor['digest'] = digest
+    editor['saved_at'] = time.monotonic()
+    editor['saved_label'] = datetime.now().strftime(SAVED_AT_FORMAT)
+    editor['pending'] = None
+    return 'saved'
+
+
+def flush(editor, user_id, force=False):
+    # 디바운스로 미뤄 둔 변경을 기록. force가 아니면 마지막 저장 후 AUTOSAVE_INTERVAL초가 지났을 때만
+    # 반환: autosave()와 같음 (미뤄 둔 변경이 없으면 'saved')
+    if not editor or not editor.get('pending'):
+        return 'saved'
+    title, content = editor['pending']
+    return autosave(editor, user_id, title, content, force=force)
+
+
+# --- 함수: 제출 (편집 중인 글 -> 제안 테이블 '접수') ---
+def submit(user_id, user_name, dept, title, content, attachment="", draft_id=None):
+    # 화면의 제목/내용을 제안 테이블에 완성된 한 행으로 바로 추가하고, 편집하던 임시 저장 글이 있으면 지운다.
+    # 임시 저장을 거치지 않으므로 임시 저장 글 수/크기 한도는 적용하지 않는다. 반환: 새 제안 ID
+    row_id = ids.new_id()
+    row = {
+        'ID': row_id, '작성자ID': str(user_id), '작성자': user_name,
+        '날짜': datetime.now().strftime('%Y-%m-%d'),
+        '제목': title, '내용': images.ingest_images(content or ""), '첨부파일': attachment, '상태': "접수",
+        '부서': dept,  # 작성 당시 부서를 함께 기록
+    }
+    storage.insert_row(SUGGESTION_FILE, row)
+    events.record('submit', user_id, SUGGESTION_FILE, row_id, row=row)
+    if get_draft(draft_id, user_id) is not None:
+        delete_draft(draft_id)
+    return row_id
@@ -0,0 +1,298 @@
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import schema
+import storage
+from config import (
+    CIRCLE_FILE, CUBE_FILE, EVENT_LOG_FILE, LEADERBOARD_FILE, LEDGER_FILE, LEVEL_SETTINGS_FILE, SUGGESTION_FILE,
+    USER_FILE,
+)
+
+# --- 설정: 상태 변경 이벤트 로그 (events.jsonl) ---
+# 제출/회수/수정/채택/미채택/삭제, 계정 삭제, 레벨 기준 변경을 한 줄짜리 JSON으로 추가만 한다.
+#   {"ts": 시각, "type": 종류, "actor": 처리한 사번, "table": 파일, "id": 행 ID, "row"|"changes"|"rows": 내용}
+# 여러 세션이 동시에 기록하면 먼저 들어온 호출이 대기 중인 줄을 모아 한 번에 쓰고 fsync 한 번으로 끝낸다
+# (그룹 커밋). 호출은 자기 줄이 디스크에 기록된 뒤 반환한다.
+# 쓰기가 실패하면 그 묶음에 줄을 넣은 모든 호출이 같은 오류를 받는다.
+# 감사/파생 화면은 CSV를 다시 훑지 않고 read_since()로 마지막으로 읽은 위치 이후의 이벤트만 읽는다.
+#  - 로그 파일을 처음 만들 때 TABLE_KEYS 테이블의 현재 내용을 'snapshot' 이벤트로 먼저 기록한다
+#  - 행 단위로 나타낼 수 없는 전체 저장(스키마 마이그레이션, ID 재발급, 부서 채우기, 이미지 분리,
+#    빈 회원 행 삭제)은 저장한 테이블 전체를 'rewrite' 이벤트로 기록한다 (record_rewrite)
+# replay()는 snapshot(또는 로그 시작 시점 백업)에 이벤트를 차례로 적용하여 테이블과
+# 포인트 원장/명예의 전당/부서 집계를 지정한 폴더에 다시 만든다.
+# 추가 전용 로그는 나중에 지울 수 없으므로 REDACTED_COLUMNS(비밀번호 평문/해시)는 어떤 이벤트에도 기록하지 않는다.
+# 따라서 재생한 회원 테이블에는 비밀번호가 없다 (백업에서 복원하거나 관리자가 다시 지정).
+# 이 규칙 이전에 기록된 로그는 'python events.py redact'로 해당 컬럼을 지운다.
+EVENT_OPS = {
+    'submit': 'insert',
+    'recall': 'update',
+    'edit': 'update',
+    'approve': 'update',
+    'reject': 'update',
+    'delete': 'delete',
+    'account_delete': 'delete',
+    'level_change': 'replace',
+    'snapshot': 'replace',
+    'rewrite': 'replace',
+}
+TABLE_KEYS = {SUGGESTION_FILE: 'ID', CIRCLE_FILE: 'ID', USER_FILE: '사번', LEVEL_SETTINGS_FILE: None}
+REDACTED_COLUMNS = {USER_FILE: ('비밀번호',)}
+
+_cond = threading.Condition()
+_queue = {'batch': None, 'writing': False}   # batch: 다음에 기록할 묶음 {'lines', 'base', 'done', 'error'}
+
+
+# --- 함수: 기록 (그룹 커밋) ---
+def _cell(value):
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    return schema.to_cell(value)
+
+
+def _cells(values):
+    return {k: _cell(v) for k, v in values.items()}
+
+
+def redact(event):
+    # 이벤트의 행 내용(row/changes/rows)에서 기록하지 않는 컬럼을 제거. 제자리에서 수정하고 반환
+    hidden = REDACTED_COLUMNS.get(event.get('table'), ())
+    if not hidden:
+        return event
+    for name in ('row', 'changes'):
+        if isinstance(event.get(name), dict):
+            event[name] = {k: v for k, v in event[name].items() if k not in hidden}
+    if isinstance(event.get('rows'), list):
+        event['rows'] = [{k: v for k, v in r.items() if k not in hidden} for r in event['rows']]
+    return event
+
+
+def make_event(kind, actor="", table=SUGGESTION_FILE, row_id=None, **payload):
+    event = {'ts': datetime.now().isoformat(timespec='seconds'), 'type': kind, 'actor': str(actor or ""),
+             'table': table}
+    if row_id is not None:
+        event['id'] = str(row_id)
+    for name, value in payload.items():
+        if name == 'rows':
+            event[name] = [_cells(r) for r in value]
+        elif isinstance(value, dict):
+            event[name] = _cells(value)
+        else:
+            event[name] = value
+    return redact(event)
+
+
+def _new_batch():
+    return {'lines': [], 'base': None, 'done': False, 'error': None}
+
+
+def _base_lines():
+    # 로그를 시작하는 시점의 테이블 내용 (없는 테이블은 건너뜀)
+    lines = []
+    for file_path, key in TABLE_KEYS.items():
+        if not storage.file_signature(file_path)[0]:
+            continue
+        df = storage.snapshot(file_path, [], key=key or 'ID')
+        event = make_event('snapshot', "", file_path, rows=df.to_dict('records'))
+        lines.append(json.dumps(event, ensure_ascii=False) + "\n")
+    return lines
+
+
+def _write(lines, base):
+    with storage.locked(EVENT_LOG_FILE):
+        if os.path.exists(EVENT_LOG_FILE) and os.path.getsize(EVENT_LOG_FILE):
+            base = None   # 다른 프로세스가 먼저 로그를 시작함
+        with open(EVENT_LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write("".join((base or []) + lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def append(events):
+    # 반환: 기록한 이벤트 수. 다른 스레드가 쓰는 중이면 그 다음 묶음에 함께 기록된다
+    lines = [json.dumps(e, ensure_ascii=False) + "\n" for e in events]
+    if not lines:
+        return 0
+    # 로그가 아직 없으면 시작 시점 테이블 내용을 호출한 스레드에서 읽어 둠 (잠금을 쥔 채 다른 스레드를 기다리지 않도록)
+    base = None if os.path.exists(EVENT_LOG_FILE) else _base_lines()
+    with _cond:
+        if _queue['batch'] is None:
+            _queue['batch'] = _new_batch()
+        batch = _queue['batch']
+        batch['lines'].extend(lines)
+        if base is not None and batch['base'] is None:
+            batch['base'] = base
+        while not batch['done']:
+            if _queue['writing']:
+                _cond.wait()
+                continue
+            # 쓰는 스레드가 없으면 이 호출이 대기 중인 묶음 전체를 기록
+            _queue['batch'], _queue['writing'] = _new_batch(), True
+            _cond.release()
+            try:
+                _write(batch['lines'], batch['base'])
+            except Exception as e:
+                batch['error'] = e
+            finally:
+                _cond.acquire()
+                batch['done'], _queue['writing'] = True, False
+                _cond.notify_all()
+    if batch['error'] is not None:
+        raise batch['error']
+    return len(lines)
+
+
+def record(kind, actor="", table=SUGGESTION_FILE, row_id=None, **payload):
+    return append([make_event(kind, actor, table, row_id, **payload)])
+
+
+def record_rewrite(table, df, reason, actor=""):
+    # 전체 저장한 테이블 내용을 그대로 기록 (replay 시 테이블을 통째로 교체)
+    return record('rewrite', actor, table, reason=reason, rows=df.to_dict('records'))
+
+
+# --- 함수: 읽기 (이어 읽기) ---
+def read_since(offset=0, path=EVENT_LOG_FILE):
+    # 반환: (offset 이후의 완전한 줄의 이벤트 목록, 다음에 읽을 위치). 쓰는 중인 마지막 줄은 다음에 읽는다
+    if not os.path.exists(path):
+        return [], offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    events = []
+    for line in data[:end].splitlines():
+        if line.strip():
+            events.append(json.loads(line))
+    return events, offset + end
+
+
+def follow(offset=0, interval=1.0, path=EVENT_LOG_FILE):
+    # 새 이벤트가 추가될 때마다 하나씩 돌려주는 제너레이터 (tail -f)
+    while True:
+        events, offset = read_since(offset, path)
+        for event in events:
+            yield event
+        if not events:
+            time.sleep(interval)
+
+
+def redact_log(path=EVENT_LOG_FILE):
+    # 기존 로그에서 기록하지 않는 컬럼을 지움 (임시 파일에 다시 쓴 뒤 교체). 반환: 수정한 이벤트 수
+    if not os.path.exists(path):
+        return 0
+    with storage.locked(path):
+        events, _ = read_since(0, path)
+        changed = 0
+        lines = []
+        for event in events:
+            before = json.dumps(event, ensure_ascii=False)
+            line = json.dumps(redact(event), ensure_ascii=False)
+            changed += line != before
+            lines.append(line + "\n")
+        if not changed:
+            return 0
+        tmp_path = path + '.redact.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    return changed
+
+
+# --- 함수: 재생 (snapshot/백업 + 이벤트 -> 테이블/파생 데이터) ---
+def _keyed(records, key):
+    # {키: 행}. 키가 빈 행(빈 회원 행 등)도 잃지 않도록 위치로 구분
+    return {r.get(key) if r.get(key) is not None else f"#{i}": r for i, r in enumerate(records)}
+
+
+def apply_events(tables, events):
+    # tables: {파일: {키: 행 dict}} (키가 없는 테이블은 행 목록). 제자리에서 갱신
+    for event in events:
+        op = EVENT_OPS.get(event.get('type'))
+        table = event.get('table', SUGGESTION_FILE)
+        if op == 'replace':
+            rows = [dict(r) for r in event.get('rows', [])]
+            key = TABLE_KEYS.get(table)
+            tables[table] = rows if key is None else _keyed(rows, key)
+            continue
+        rows = tables.setdefault(table, {})
+        row_id = event.get('id')
+        if op == 'insert':
+            rows[row_id] = dict(event.get('row', {}))
+        elif op == 'update' and row_id in rows:
+            rows[row_id].update(event.get('changes', {}))
+        elif op == 'delete':
+            rows.pop(row_id, None)
+    return tables
+
+
+def _load_base(base_dir):
+    tables = {}
+    for file_path, key in TABLE_KEYS.items():
+        path = os.path.join(base_dir, file_path) if base_dir else None
+        df = pd.read_csv(path, dtype=str, encoding='utf-8-sig') if path and os.path.exists(path) else pd.DataFrame()
+        df = df.astype(object).where(df.notna(), None)
+        records = df.to_dict('records')
+        tables[file_path] = records if key is None else _keyed(records, key)
+    return tables
+
+
+def replay(out_dir, base_dir=None, path=EVENT_LOG_FILE):
+    # out_dir에 테이블과 포인트 원장/명예의 전당/부서 집계를 CSV로 만든다 (현재 폴더/저장소 설정은 건드리지 않음)
+    # 반환: 적용한 이벤트 수. 로그 앞부분에 snapshot이 없으면 로그 시작 시점 백업 폴더(base_dir)가 필요하다
+    import cube
+    import leaderboard
+    import ledger
+
+    events, _ = read_since(0, path)
+    if base_dir is None and (not events or events[0].get('type') != 'snapshot'):
+        raise ValueError(f"{path}: 로그가 테이블 snapshot으로 시작하지 않습니다. 로그 시작 시점 백업 폴더를 지정해주세요.")
+    tables = apply_events(_load_base(base_dir), events)
+    os.makedirs(out_dir, exist_ok=True)
+    for file_path, rows in tables.items():
+        records = rows if isinstance(rows, list) else list(rows.values())
+        if records:
+            pd.DataFrame(records).to_csv(os.path.join(out_dir, file_path), index=False)
+
+    suggestions = pd.DataFrame(list(tables.get(SUGGESTION_FILE, {}).values()))
+    derived = {
+        LEDGER_FILE: ledger.to_table(ledger.compute_from_table(suggestions)),
+        LEADERBOARD_FILE: leaderboard.to_table(*leaderboard.compute_from_table(suggestions)),
+        CUBE_FILE: cube.to_table(cube.compute_from_table(suggestions)),
+    }
+    for file_path, df in derived.items():
+        df.to_csv(os.path.join(out_dir, file_path), index=False)
+    return len(events)
+
+
+if __name__ == '__main__':
+    # 사용법: python events.py tail [--from-start]
+    #         python events.py redact   (기록하지 않는 컬럼이 남아 있는 이전 로그 정리)
+    #         python events.py replay <출력 폴더> [로그 시작 시점 백업 폴더 (로그에 snapshot이 없을 때)]
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == 'tail':
+        start = 0 if '--from-start' in sys.argv[2:] or not os.path.exists(EVENT_LOG_FILE) else os.path.getsize(EVENT_LOG_FILE)
+        try:
+            for event in follow(start):
+                print(json.dumps(event, ensure_ascii=False), flush=True)
+        except KeyboardInterrupt:
+            pass
+    elif command == 'redact':
+        print(f"{EVENT_LOG_FILE}: 이벤트 {redact_log()}건에서 {', '.join(c for cols in REDACTED_COLUMNS.values() for c in cols)} 컬럼을 지웠습니다.")
+    elif command == 'replay' and len(sys.argv) > 2:
+        base = os.path.abspath(sys.argv[3]) if len(sys.argv) > 3 else None
+        try:
+            count = replay(os.path.abspath(sys.argv[2]), base)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print(f"{EVENT_LOG_FILE}: 이벤트 {count}건을 재생하여 {sys.argv[2]} 에 테이블과 파생 데이터를 만들었습니다.")
+    else:
+        print("사용법: python events.py tail [--from-start] | redact | replay <출력 폴더> [백업 폴더]")
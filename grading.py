@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+# --- 함수: 등급 이모지 제거 (평가 등급: S, A, B, C) ---
+def add_grade_emoji(grade):
+    if pd.isna(grade) or str(grade).strip() == "": return ""
+    g_str = str(grade)
+    
+    # 구버전 데이터(골드 등)를 신버전(S~C)으로 매핑하여 표시
+    if "골드" in g_str: return "S"
+    if "실버" in g_str: return "A"
+    if "브론즈" in g_str: return "B"
+    if "참가상" in g_str: return "C"
+    
+    # 신버전 데이터 (이미 S, A, B, C인 경우 그대로 반환하거나, 이모지가 포함된 경우 제거)
+    if "S" in g_str: return "S"
+    if "A" in g_str: return "A"
+    if "B" in g_str: return "B"
+    if "C" in g_str: return "C"
+    
+    return g_str
+
+
+# --- 설정: 평가 기준 ---
+# 항목별 선택 가능한 점수 (합계 100점)
+SCORE_OPTIONS = {
+    '창의성': [0, 10, 20, 30],
+    '효과성': [0, 10, 20, 30],
+    '실행성': [0, 10, 15, 20],
+    '지속성': [0, 5, 10],
+    '표준화기여도': [0, 5, 10],
+}
+# (총점 하한, 등급, 부여 포인트) 높은 등급부터: S 90~100, A 70~89, B 60~69, C 60미만
+GRADE_RULES = [(90, "S", 20), (70, "A", 10), (60, "B", 5), (0, "C", 1)]
+
+
+# --- 함수: 총점 -> 등급/포인트 (벡터화) ---
+def grade_scores(totals):
+    # 반환: (등급 배열, 포인트 배열). 일괄 검토 표의 모든 행을 한 번에 판정
+    totals = np.asarray(totals, dtype=float)
+    conditions = [totals >= low for low, _, _ in GRADE_RULES]
+    grades = np.select(conditions, [g for _, g, _ in GRADE_RULES], default=GRADE_RULES[-1][1])
+    points = np.select(conditions, [p for _, _, p in GRADE_RULES], default=GRADE_RULES[-1][2])
+    return grades, points
+
+
+def grade_for_score(total):
+    grades, points = grade_scores([total])
+    return str(grades[0]), int(points[0])
@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import events
+import storage
+from config import ID_STATE_FILE, SUGGESTION_FILE, CIRCLE_FILE, DRAFT_FILE
+
+# --- 설정: ID 발급 ---
+# ID = [접두어] + 'YYYYMMDDHHMMSS' + 3자리 순번
+#  - 같은 초에 여러 건이 들어오면 순번을 올림 (초당 1000건을 넘으면 다음 초로 넘어감)
+#  - 마지막 발급 시각/순번을 id_sequence.json 에 기록하고 잠금 안에서 갱신하므로
+#    여러 프로세스가 동시에 발급해도 겹치지 않으며, 시계가 뒤로 가도 항상 증가한다
+#  - 기존 14자리 ID와 문자열 정렬 순서가 그대로 시간 순서가 된다
+STAMP_FORMAT = "%Y%m%d%H%M%S"
+SEQUENCE_DIGITS = 3
+SEQUENCE_MAX = 10 ** SEQUENCE_DIGITS - 1
+
+ID_TABLES = [SUGGESTION_FILE, CIRCLE_FILE, DRAFT_FILE]
+
+
+# --- 함수: 발급 상태 읽기/쓰기 ---
+def _read_state():
+    if not os.path.exists(ID_STATE_FILE):
+        return {}
+    try:
+        with open(ID_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return {}
+
+
+def _write_state(state):
+    tmp_path = ID_STATE_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, ID_STATE_FILE)
+
+
+# --- 함수: ID 발급 ---
+def new_id(prefix="", now=None):
+    now = now or datetime.now()
+    with storage.locked(ID_STATE_FILE):
+        state = _read_state()
+        stamp = now.strftime(STAMP_FORMAT)
+        last_stamp = state.get('stamp', "")
+        if stamp > last_stamp:
+            seq = 0
+        else:
+            # 같은 초이거나 시계가 뒤로 간 경우: 마지막 시각 기준으로 순번 증가
+            stamp, seq = last_stamp, state.get('seq', 0) + 1
+            if seq > SEQUENCE_MAX:
+                stamp = (datetime.strptime(stamp, STAMP_FORMAT) + timedelta(seconds=1)).strftime(STAMP_FORMAT)
+                seq = 0
+        _write_state({'stamp': stamp, 'seq': seq})
+    return f"{prefix}{stamp}{seq:0{SEQUENCE_DIGITS}d}"
+
+
+# --- 함수: 중복 ID 점검/복구 ---
+def find_duplicates(file_path):
+    df = storage.snapshot(file_path, [])
+    if df.empty or 'ID' not in df.columns:
+        return {}
+    counts = df['ID'].value_counts()
+    return counts[counts > 1].to_dict()
+
+
+def _repaired_id(old_id, taken):
+    # 원래 ID(작성 시각) 뒤에 순번을 붙여 시간 순서를 유지하면서 겹치지 않는 ID 생성
+    for seq in range(1, SEQUENCE_MAX + 1):
+        candidate = f"{old_id}{seq:0{SEQUENCE_DIGITS}d}"
+        if candidate not in taken:
+            return candidate
+    return new_id()
+
+
+def repair(file_path):
+    # 같은 ID의 두 번째 이후 행에 새 ID 부여 (첫 번째 행은 그대로 유지). 반환: [(이전 ID, 새 ID), ...]
+    with storage.locked(file_path):
+        df = storage.load_table(file_path, [])
+        if df.empty or 'ID' not in df.columns:
+            return []
+        taken = set(df['ID'].dropna().astype(str))
+        changed = []
+        for pos in df.index[df['ID'].duplicated(keep='first') & df['ID'].notna()]:
+            old_id = str(df.at[pos, 'ID'])
+            fixed = _repaired_id(old_id, taken)
+            taken.add(fixed)
+            df.at[pos, 'ID'] = fixed
+            changed.append((old_id, fixed))
+        if changed:
+            storage.save_table(file_path, df)
+            events.record_rewrite(file_path, df, 'ids_repair')
+    return changed
+
+
+if __name__ == '__main__':
+    # 사용법: python ids.py check|repair [파일 ...]
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    files = sys.argv[2:] or ID_TABLES
+    if command == 'check':
+        for path in files:
+            dups = find_duplicates(path)
+            print(f"{path}: 중복 ID {len(dups)}개" + (f" {dups}" if dups else ""))
+    elif command == 'repair':
+        for path in files:
+            changed = repair(path)
+            print(f"{path}: {len(changed)}건의 ID를 새로 부여했습니다.")
+            for old_id, fixed in changed:
+                print(f"  {old_id} -> {fixed}")
+    else:
+        print("사용법: python ids.py check|repair [suggestions.csv circle_activity.csv drafts.csv]")
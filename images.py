@@ -0,0 +1,233 @@
+import base64
+import hashlib
+import io
+import os
+import re
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from config import IMAGE_DIR, SUGGESTION_FILE
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 썸네일 없이 원본 표시
+    Image = None
+
+# --- 설정: 본문 이미지 저장소 ---
+# 에디터(st_quill)가 본문에 넣는 data URI 이미지를 해시 이름의 파일로 분리하고,
+# 본문에는 'tpm-image://<sha256>.<확장자>' 참조만 남긴다.
+IMAGE_REF_PREFIX = 'tpm-image://'
+
+DATA_URI_RE = re.compile(r'data:(image/[A-Za-z0-9.+-]+);base64,([A-Za-z0-9+/=\s]+)')
+IMAGE_REF_RE = re.compile(re.escape(IMAGE_REF_PREFIX) + r'([0-9a-f]{64}\.[a-z0-9]+)')
+
+MIME_EXT = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/jpg': 'jpg',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/bmp': 'bmp',
+    'image/svg+xml': 'svg',
+}
+# --- 설정: 상세 화면 썸네일 ---
+# 심사 상세 화면은 긴 변 THUMB_MAX_SIZE 픽셀로 줄인 썸네일을 보여주고, 원본은 요청 시에만 보낸다.
+# 썸네일은 'uploads/images/thumbs/<원본 해시>_<크기>.<확장자>' 로 한 번만 만들어 재사용하며,
+# 변환된 본문 HTML은 (행 ID, 본문 해시, 원본 여부) 별로 캐시한다.
+THUMB_DIR = os.path.join(IMAGE_DIR, 'thumbs')
+THUMB_MAX_SIZE = 640
+THUMB_JPEG_QUALITY = 80
+RENDER_CACHE_MAX = 64
+
+_rendered = OrderedDict()
+_rendered_lock = threading.Lock()
+
+EXT_MIME = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'bmp': 'image/bmp',
+    'svg': 'image/svg+xml',
+}
+
+
+# --- 함수: 이미지 파일 저장 (내용 해시 기준 중복 제거) ---
+def _write_file(directory, filename, data):
+    # 같은 폴더의 고유한 임시 파일에 쓴 뒤 rename (같은 이미지를 여러 세션/프로세스가 동시에 저장해도 겹치지 않도록)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=filename + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(directory, filename))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_image(data, mime):
+    ext = MIME_EXT.get(mime.lower(), 'bin')
+    filename = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+    if not os.path.exists(os.path.join(IMAGE_DIR, filename)):
+        _write_file(IMAGE_DIR, filename, data)
+    return filename
+
+
+# --- 함수: 본문 이미지 분리 (저장 전) ---
+def ingest_images(html):
+    if not isinstance(html, str) or 'data:image/' not in html:
+        return html
+
+    def replace(match):
+        try:
+            data = base64.b64decode(re.sub(r'\s', '', match.group(2)), validate=True)
+        except ValueError:
+            return match.group(0)
+        return IMAGE_REF_PREFIX + store_image(data, match.group(1))
+
+    return DATA_URI_RE.sub(replace, html)
+
+
+# --- 함수: 본문 이미지 복원 (화면 표시/에디터용) ---
+@lru_cache(maxsize=256)
+def _data_uri(filename):
+    # 파일명이 내용 해시이므로 같은 이름의 내용은 변하지 않음 -> 캐시 안전
+    file_path = os.path.join(IMAGE_DIR, filename)
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode()
+    mime = EXT_MIME.get(filename.rsplit('.', 1)[-1], 'application/octet-stream')
+    return f"data:{mime};base64,{encoded}"
+
+
+def render_images(html):
+    if not isinstance(html, str) or IMAGE_REF_PREFIX not in html:
+        return html
+
+    def replace(match):
+        uri = _data_uri(match.group(1))
+        return uri if uri is not None else match.group(0)
+
+    return IMAGE_REF_RE.sub(replace, html)
+
+
+def has_images(html):
+    return isinstance(html, str) and ('data:image/' in html or IMAGE_REF_PREFIX in html)
+
+
+# --- 함수: 썸네일 생성 (상세 화면용) ---
+def _thumbnail_file(filename):
+    # 반환: 썸네일 파일명 (만들 수 없거나 원본이 이미 작으면 None -> 원본 사용)
+    ext = filename.rsplit('.', 1)[-1]
+    if Image is None or ext == 'svg':
+        return None
+    src_path = os.path.join(IMAGE_DIR, filename)
+    if not os.path.exists(src_path):
+        return None
+
+    stem = filename.rsplit('.', 1)[0]
+    for thumb_ext in ('jpg', 'png'):
+        thumb_name = f"{stem}_{THUMB_MAX_SIZE}.{thumb_ext}"
+        if os.path.exists(os.path.join(THUMB_DIR, thumb_name)):
+            return thumb_name
+
+    try:
+        with Image.open(src_path) as img:
+            if max(img.size) <= THUMB_MAX_SIZE:
+                return None
+            img.thumbnail((THUMB_MAX_SIZE, THUMB_MAX_SIZE))
+            # 투명 배경이 있으면 PNG, 아니면 JPEG로 저장
+            if img.mode in ('RGBA', 'LA', 'P'):
+                thumb_ext, fmt, options = 'png', 'PNG', {'optimize': True}
+                img = img.convert('RGBA')
+            else:
+                thumb_ext, fmt, options = 'jpg', 'JPEG', {'quality': THUMB_JPEG_QUALITY}
+                img = img.convert('RGB')
+            buf = io.BytesIO()
+            img.save(buf, fmt, **options)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+    thumb_name = f"{stem}_{THUMB_MAX_SIZE}.{thumb_ext}"
+    _write_file(THUMB_DIR, thumb_name, buf.getvalue())
+    return thumb_name
+
+
+@lru_cache(maxsize=512)
+def _thumb_data_uri(filename):
+    thumb_name = _thumbnail_file(filename)
+    if thumb_name is None:
+        return None
+    with open(os.path.join(THUMB_DIR, thumb_name), 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"data:{EXT_MIME[thumb_name.rsplit('.', 1)[-1]]};base64,{encoded}"
+
+
+def render_thumbnails(html):
+    if not isinstance(html, str) or IMAGE_REF_PREFIX not in html:
+        return html
+
+    def replace(match):
+        uri = _thumb_data_uri(match.group(1)) or _data_uri(match.group(1))
+        return uri if uri is not None else match.group(0)
+
+    return IMAGE_REF_RE.sub(replace, html)
+
+
+def render_detail(row_id, html, originals=False):
+    # 상세 화면 본문: 기본은 썸네일, originals=True면 원본. (행 ID, 본문 해시, 원본 여부)별 캐시
+    if not has_images(html):
+        return html
+    digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+    cache_key = (row_id, digest, originals)
+    with _rendered_lock:
+        if cache_key in _rendered:
+            _rendered.move_to_end(cache_key)
+            return _rendered[cache_key]
+
+    # 아직 분리되지 않은 본문 이미지(data URI)도 파일로 분리한 뒤 변환 (저장된 행은 바꾸지 않음)
+    html = ingest_images(html)
+    rendered = render_images(html) if originals else render_thumbnails(html)
+
+    with _rendered_lock:
+        _rendered[cache_key] = rendered
+        while len(_rendered) > RENDER_CACHE_MAX:
+            _rendered.popitem(last=False)
+    return rendered
+
+
+# --- 일회성 마이그레이션: 기존 행의 본문 이미지 분리 ---
+def migrate(file_path=SUGGESTION_FILE):
+    import events
+    import storage
+
+    with storage.locked(file_path):
+        df = storage.load_table(file_path, [])
+        if df.empty or '내용' not in df.columns:
+            print("변환할 데이터가 없습니다.")
+            return 0
+
+        converted = df['내용'].apply(ingest_images)
+        changed = int((converted.fillna('') != df['내용'].fillna('')).sum())
+        if changed:
+            df['내용'] = converted
+            storage.save_table(file_path, df)
+            events.record_rewrite(file_path, df, 'images_migrate')
+        print(f"{file_path}: {changed}건의 본문 이미지를 {IMAGE_DIR}로 분리했습니다.")
+        return changed
+
+
+if __name__ == '__main__':
+    # 사용법: python images.py migrate [파일경로]
+    if len(sys.argv) >= 2 and sys.argv[1] == 'migrate':
+        migrate(*sys.argv[2:3])
+    else:
+        print("사용법: python images.py migrate [suggestions.csv]")
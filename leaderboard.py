@@ -0,0 +1,145 @@
+import sys
+
+import pandas as pd
+
+import derived
+from config import LEADERBOARD_FILE, SUGGESTION_FILE
+
+# --- 설정: 명예의 전당 스냅샷 ---
+# 월별(연월 -> 작성자) 채택 포인트와 부서별 누적 채택 포인트를 미리 집계해 두고,
+# 채택 포인트가 바뀌는 변경이 있을 때만 해당 항목을 갱신한다.
+# 로드/저장/재구축/차이 반영은 derived.py가 처리한다. 집계 값은 (월별, 부서별) 두 dict의 튜플.
+SNAPSHOT_COLUMNS = ['구분', '연월', '작성자ID', '작성자', '부서', '포인트', '건수']
+SOURCE_COLUMNS = ['작성자ID', '작성자', '날짜', '상태', '포인트', '부서']
+KIND_MONTHLY = '월간'
+KIND_DEPT = '부서'
+
+_to_number = derived.to_number
+
+
+def _row_dept(row):
+    dept = row.get('부서')
+    if dept is None or pd.isna(dept) or str(dept).strip() == "":
+        return "-"
+    return dept
+
+
+def _row_month(row):
+    date_dt = pd.to_datetime(row.get('날짜'), errors='coerce')
+    if pd.isna(date_dt):
+        return None
+    return f"{date_dt.year:04d}-{date_dt.month:02d}"
+
+
+# --- 함수: 스냅샷 파일 변환 ---
+def from_table(df):
+    monthly, dept = {}, {}
+    for row in df.to_dict('records'):
+        entry = {'포인트': _to_number(row.get('포인트')), '건수': int(_to_number(row.get('건수')))}
+        if row.get('구분') == KIND_MONTHLY:
+            entry.update({'작성자': row.get('작성자'), '부서': row.get('부서')})
+            monthly.setdefault(row.get('연월'), {})[row.get('작성자ID')] = entry
+        elif row.get('구분') == KIND_DEPT:
+            dept[row.get('부서')] = entry
+    return monthly, dept
+
+
+def to_table(monthly, dept):
+    rows = []
+    for ym in sorted(monthly):
+        for uid, entry in monthly[ym].items():
+            if entry['건수'] > 0:
+                rows.append({'구분': KIND_MONTHLY, '연월': ym, '작성자ID': uid, '작성자': entry['작성자'],
+                             '부서': entry['부서'], '포인트': entry['포인트'], '건수': entry['건수']})
+    for dept_name, entry in sorted(dept.items(), key=lambda kv: str(kv[0])):
+        if entry['건수'] > 0:
+            rows.append({'구분': KIND_DEPT, '부서': dept_name, '포인트': entry['포인트'], '건수': entry['건수']})
+    return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+
+def _apply(monthly, dept, row, sign):
+    if row is None or row.get('상태') != '채택':
+        return
+    points = _to_number(row.get('포인트'))
+    dept_name = _row_dept(row)
+
+    d_entry = dept.setdefault(dept_name, {'포인트': 0, '건수': 0})
+    d_entry['포인트'] = _to_number(d_entry['포인트'] + sign * points)
+    d_entry['건수'] += sign
+
+    ym = _row_month(row)
+    if ym is not None:
+        m_entry = monthly.setdefault(ym, {}).setdefault(row.get('작성자ID'), {'포인트': 0, '건수': 0})
+        m_entry['포인트'] = _to_number(m_entry['포인트'] + sign * points)
+        m_entry['건수'] += sign
+        if sign > 0:
+            m_entry.update({'작성자': row.get('작성자'), '부서': dept_name})
+
+
+def compute_from_table(suggestions_df):
+    # 반환: (월별, 부서별) 집계
+    monthly, dept = {}, {}
+    if not suggestions_df.empty and '상태' in suggestions_df.columns:
+        for row in suggestions_df[suggestions_df['상태'] == '채택'].to_dict('records'):
+            _apply(monthly, dept, row, 1)
+    return monthly, dept
+
+
+# --- 함수: 행 변경 반영 (derived.apply_changes에서 호출) ---
+def _relevant(changes):
+    # 채택 포인트에 영향이 없는 변경(접수, 내용 수정 등)은 스냅샷을 다시 쓰지 않음
+    return [
+        (old, new) for old, new in changes
+        if (old is not None and old.get('상태') == '채택') or (new is not None and new.get('상태') == '채택')
+    ]
+
+
+def _apply_delta(snapshot, changes):
+    monthly, dept = snapshot
+    for old_row, new_row in changes:
+        _apply(monthly, dept, old_row, -1)
+        _apply(monthly, dept, new_row, 1)
+
+
+def _snapshot_table(snapshot):
+    return to_table(*snapshot)
+
+
+_leaderboard = derived.define(LEADERBOARD_FILE, SNAPSHOT_COLUMNS, SOURCE_COLUMNS, compute_from_table, _snapshot_table,
+                              from_table, _apply_delta, relevant=_relevant)
+
+
+def _load():
+    return derived.load(_leaderboard)
+
+
+def rebuild():
+    return derived.rebuild(_leaderboard)
+
+
+# --- 함수: 조회 ---
+def monthly_top(year, month, n=3):
+    monthly, _ = _load()
+    ym = f"{year:04d}-{month:02d}"
+    rows = [
+        {'작성자': e['작성자'], '부서': e['부서'], '포인트': e['포인트']}
+        for e in monthly.get(ym, {}).values() if e['건수'] > 0
+    ]
+    df = pd.DataFrame(rows, columns=['작성자', '부서', '포인트'])
+    return df.sort_values('포인트', ascending=False, kind='stable').head(n).reset_index(drop=True)
+
+
+def dept_ranking(n=5):
+    _, dept = _load()
+    rows = [{'부서': d, '포인트': e['포인트']} for d, e in dept.items() if e['건수'] > 0]
+    df = pd.DataFrame(rows, columns=['부서', '포인트'])
+    return df.sort_values('포인트', ascending=False, kind='stable').head(n).reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    # 사용법: python leaderboard.py rebuild
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        rebuild()
+        print(f"{LEADERBOARD_FILE}: 명예의 전당 스냅샷을 재구축했습니다.")
+    else:
+        print("사용법: python leaderboard.py rebuild")
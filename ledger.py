@@ -0,0 +1,153 @@
+import sys
+
+import pandas as pd
+
+import derived
+import storage
+from config import LEDGER_FILE, SUGGESTION_FILE
+
+# --- 설정: 사용자별 포인트 원장 ---
+# 작성자ID -> 채택 포인트 합계 / 채택 건수 / 등급별 건수.
+# 채택·미채택·삭제 시 변경된 행의 차이만 반영하므로 조회 비용이 전체 이력 크기와 무관함.
+# 로드/저장/재구축/차이 반영은 derived.py가 처리하고, 여기에는 원장 계산만 둔다.
+LEDGER_KEY = '작성자ID'
+GRADES = ['S', 'A', 'B', 'C']
+LEDGER_COLUMNS = [LEDGER_KEY, '포인트', '채택건수'] + GRADES
+SOURCE_COLUMNS = ['작성자ID', '상태', '포인트', '등급']
+
+
+def _empty_entry():
+    return {'포인트': 0, '채택건수': 0, **{g: 0 for g in GRADES}}
+
+
+_to_number = derived.to_number
+
+
+# --- 함수: 전체 테이블로부터 원장 계산 ---
+def compute_from_table(suggestions_df):
+    if suggestions_df.empty or '상태' not in suggestions_df.columns:
+        return {}
+    approved = suggestions_df[suggestions_df['상태'] == '채택'].copy()
+    approved = approved[approved['작성자ID'].notna()]
+    if approved.empty:
+        return {}
+
+    if '포인트' in approved.columns:
+        approved['포인트'] = pd.to_numeric(approved['포인트'], errors='coerce').fillna(0)
+    else:
+        approved['포인트'] = 0
+    if '등급' not in approved.columns:
+        approved['등급'] = ""
+
+    data = {}
+    points = approved.groupby('작성자ID')['포인트'].sum()
+    counts = approved.groupby('작성자ID').size()
+    grades = approved.groupby(['작성자ID', '등급'], observed=True).size()
+    for uid in points.index:
+        entry = _empty_entry()
+        entry['포인트'] = _to_number(points[uid])
+        entry['채택건수'] = int(counts[uid])
+        for g in GRADES:
+            entry[g] = int(grades.get((uid, g), 0))
+        data[uid] = entry
+    return data
+
+
+# --- 함수: 원장 파일 변환 ---
+def from_table(df):
+    data = {}
+    for row in df.to_dict('records'):
+        entry = _empty_entry()
+        for col in entry:
+            entry[col] = _to_number(row.get(col))
+        data[row[LEDGER_KEY]] = entry
+    return data
+
+
+def to_table(data):
+    rows = [{LEDGER_KEY: uid, **entry} for uid, entry in data.items() if entry['채택건수'] or entry['포인트']]
+    return pd.DataFrame(rows, columns=LEDGER_COLUMNS)
+
+
+# --- 함수: 행 변경 반영 (derived.apply_changes에서 호출) ---
+def _contribution(row):
+    if row is None or row.get('상태') != '채택':
+        return None
+    uid = row.get('작성자ID')
+    if uid is None or pd.isna(uid):
+        return None
+    grade = row.get('등급')
+    return uid, _to_number(row.get('포인트')), "" if grade is None or pd.isna(grade) else str(grade)
+
+
+def _relevant(changes):
+    # 채택 포인트에 영향이 없는 변경(접수, 내용 수정 등)은 원장을 다시 쓰지 않음
+    return [(old, new) for old, new in changes if _contribution(old) is not None or _contribution(new) is not None]
+
+
+def _apply_delta(data, changes):
+    for old_row, new_row in changes:
+        for row, sign in ((old_row, -1), (new_row, 1)):
+            contrib = _contribution(row)
+            if contrib is None:
+                continue
+            uid, points, grade = contrib
+            entry = data.setdefault(uid, _empty_entry())
+            entry['포인트'] = _to_number(entry['포인트'] + sign * points)
+            entry['채택건수'] += sign
+            if grade in GRADES:
+                entry[grade] += sign
+
+
+_ledger = derived.define(LEDGER_FILE, LEDGER_COLUMNS, SOURCE_COLUMNS, compute_from_table, to_table, from_table,
+                         _apply_delta, relevant=_relevant)
+
+
+def _load():
+    return derived.load(_ledger)
+
+
+def rebuild():
+    return derived.rebuild(_ledger)
+
+
+# --- 함수: 조회 ---
+def get_user_summary(user_id):
+    return dict(_load().get(user_id, _empty_entry()))
+
+
+def get_user_points(user_id):
+    return _load().get(user_id, _empty_entry())['포인트']
+
+
+def points_by_user():
+    return {uid: entry['포인트'] for uid, entry in _load().items()}
+
+
+# --- 함수: 검증 (원장 파일 vs 전체 재계산) ---
+def verify():
+    df = storage.snapshot(SUGGESTION_FILE, [], usecols=SOURCE_COLUMNS)
+    expected = compute_from_table(df)
+    actual = derived.stored(_ledger)
+    mismatches = []
+    for uid in sorted(set(expected) | set(actual)):
+        exp = expected.get(uid, _empty_entry())
+        act = actual.get(uid, _empty_entry())
+        if exp != act:
+            mismatches.append((uid, exp, act))
+    return mismatches
+
+
+if __name__ == '__main__':
+    # 사용법: python ledger.py rebuild | verify
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ''
+    if cmd == 'rebuild':
+        print(f"{LEDGER_FILE}: {len(rebuild())}명의 포인트 원장을 재구축했습니다.")
+    elif cmd == 'verify':
+        problems = verify()
+        for uid, exp, act in problems:
+            print(f"불일치 {uid}: 기대값 {exp} / 원장 {act}")
+        print("원장이 전체 재계산 결과와 일치합니다." if not problems else f"{len(problems)}건 불일치")
+        sys.exit(1 if problems else 0)
+    else:
+        print("사용법: python ledger.py rebuild | verify")
@@ -0,0 +1,104 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import storage
+from config import LEVEL_SETTINGS_FILE
+
+# --- 설정: 레벨 테이블 ---
+# level_settings.csv를 필요점수 오름차순 배열로 한 번만 변환해 두고(파일 mtime 기준 캐시),
+# 포인트 -> 레벨 판별은 np.searchsorted 한 번으로 처리한다.
+LevelTable = namedtuple('LevelTable', ['thresholds', 'names', 'emojis', 'labels'])
+
+_lock = threading.Lock()
+_compiled = {'sig': None, 'table': None}
+
+
+# --- 함수: 레벨 설정 로드 ---
+def load_level_settings():
+    if not storage.file_signature(LEVEL_SETTINGS_FILE)[0]:
+        data = {
+            "이모지": ["🌱", "🥉", "🥈", "🥇", "👑"],
+            "등급명": ["새싹", "브론즈", "실버", "골드", "마스터"],
+            "필요점수": [0, 50, 200, 500, 1000]
+        }
+        df = pd.DataFrame(data)
+        storage.save_table(LEVEL_SETTINGS_FILE, df)
+        return df
+    
+    df = storage.load_table(LEVEL_SETTINGS_FILE, [], key='등급명')
+    df['필요점수'] = pd.to_numeric(df['필요점수'], errors='coerce')
+    # 기존 파일에 '이모지' 컬럼이 없으면 추가 (하위 호환성)
+    if '이모지' not in df.columns:
+        def get_emoji(name):
+            val = str(name)
+            if "새싹" in val: return "🌱"
+            elif "브론즈" in val: return "🥉"
+            elif "실버" in val: return "🥈"
+            elif "골드" in val: return "🥇"
+            elif "마스터" in val: return "👑"
+            else: return "🔹"
+        
+        # '등급명' 컬럼이 있으면 그 앞에, 없으면 맨 앞에 추가
+        loc_idx = df.columns.get_loc('등급명') if '등급명' in df.columns else 0
+        df.insert(loc_idx, '이모지', df['등급명'].apply(get_emoji))
+        
+    return df
+
+
+# --- 함수: 레벨 테이블 생성 ---
+def compile_levels(level_df):
+    df = level_df.copy()
+    df['필요점수'] = pd.to_numeric(df['필요점수'], errors='coerce')
+    df = df[df['필요점수'].notna()].sort_values('필요점수', ascending=True, kind='stable')
+
+    names = df['등급명'].astype(str).to_numpy(dtype=object)
+    if '이모지' in df.columns:
+        emojis = df['이모지'].astype(str).to_numpy(dtype=object)
+    else:
+        emojis = np.full(len(df), "", dtype=object)
+    labels = np.array([f"{e} {n}" for e, n in zip(emojis, names)], dtype=object)
+    return LevelTable(df['필요점수'].to_numpy(dtype=float), names, emojis, labels)
+
+
+def load_level_table():
+    sig = storage.file_signature(LEVEL_SETTINGS_FILE)
+    with _lock:
+        if _compiled['table'] is None or _compiled['sig'] != sig:
+            _compiled['table'] = compile_levels(load_level_settings())
+            _compiled['sig'] = storage.file_signature(LEVEL_SETTINGS_FILE)
+        return _compiled['table']
+
+
+# --- 함수: 포인트 -> 레벨 판별 (벡터화) ---
+def level_index(points, table):
+    # 필요점수 <= 포인트 를 만족하는 마지막 레벨의 위치 (없으면 -1)
+    pts = np.asarray(points, dtype=float)
+    return np.searchsorted(table.thresholds, pts, side='right') - 1
+
+
+def level_labels(points, table, default="🌱 새싹"):
+    idx = level_index(points, table)
+    if len(table.labels) == 0:
+        return np.full(idx.shape, default, dtype=object)
+    return np.where(idx >= 0, table.labels[np.clip(idx, 0, None)], default)
+
+
+def level_status(points, table, default="새싹"):
+    # 현재 레벨, 다음 레벨, 다음 레벨까지 필요 포인트, 다음 레벨 기준점, 현재 레벨 기준점
+    idx = int(level_index(points, table))
+    current = table.labels[idx] if idx >= 0 else default
+    prev_threshold = table.thresholds[idx] if idx >= 0 else 0
+
+    if idx + 1 < len(table.thresholds):
+        next_name = table.names[idx + 1]
+        next_total = table.thresholds[idx + 1]
+        points_needed = next_total - points
+    else:
+        # 더 이상 레벨이 없는 경우
+        next_name = "MAX"
+        next_total = points
+        points_needed = 0
+    return current, next_name, points_needed, next_total, prev_threshold
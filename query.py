@@ -0,0 +1,197 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import search
+import storage
+import tracing
+from config import SUGGESTION_FILE
+
+# --- 설정: 제안 조회 인덱스 ---
+# 목록 화면에 필요한 컬럼(본문 '내용' 제외)만 읽어 테이블 버전(파일 시그니처)마다 한 번 색인한다.
+#  - 날짜 정렬 순서(date_order/sorted_days): 날짜 범위 -> 행 위치를 이진 탐색으로 계산
+#  - 상태/등급 비트맵(bool 배열): 선택값에 해당하는 행을 즉시 선택
+# 조회 시에는 행 위치 배열만 다루고, 화면에 표시할 페이지 행만 DataFrame으로 꺼낸다.
+# 필터 결과(행 위치)는 인덱스 버전 + 필터 조건마다 한 번만 계산해 재사용한다
+# (한 번의 화면 실행에서 목록/건수, 검토 대상 제목, 선택한 행 조회가 같은 필터를 반복하지 않도록).
+MATCH_CACHE_SIZE = 8
+LIST_COLUMNS = ['ID', '작성자ID', '작성자', '날짜', '제목', '상태', '등급', '포인트', '평가점수', '부서', '버전']
+
+SuggestionIndex = namedtuple('SuggestionIndex', ['df', 'date_order', 'sorted_days', 'status_bits', 'grade_bits'])
+
+_lock = threading.Lock()
+_cached = {'sig': None, 'index': None, 'matches': (None, {})}
+
+
+# --- 함수: 목록 데이터 정리 ---
+# 구버전 데이터 정리(점수/작성날짜 컬럼명, '반려' 상태, 빈 부서)는 schema.migrate()가 파일에 한 번 반영하므로
+# 여기서는 빈 테이블 등에 없는 컬럼만 추가한다.
+def _normalize(df):
+    # 공유 스냅샷을 받으므로 원본을 수정하지 않고 필요할 때만 새 DataFrame을 만든다
+    missing = [col for col in ['날짜', '등급', '포인트', '평가점수', '부서'] if col not in df.columns]
+    if missing:
+        df = df.assign(**dict.fromkeys(missing))
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index(drop=True)
+    return df
+
+
+def _bitmaps(series):
+    bits = {}
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 범주형: 문자열 비교 대신 정수 코드 비교
+        codes = series.cat.codes.to_numpy()
+        for code, val in enumerate(series.cat.categories):
+            if str(val).strip() != "":
+                bits[str(val)] = (codes == code)
+        return bits
+    values = series.to_numpy(dtype=object)
+    for val in pd.unique(values):
+        if pd.isna(val) or str(val).strip() == "":
+            continue
+        bits[str(val)] = (values == val)
+    return bits
+
+
+# --- 함수: 인덱스 생성/로드 ---
+def build_index(df):
+    df = _normalize(df)
+    days = pd.to_datetime(df['날짜'], errors='coerce').to_numpy(dtype='datetime64[D]')
+    valid = np.flatnonzero(~np.isnat(days))
+    date_order = valid[np.argsort(days[valid], kind='stable')]
+    return SuggestionIndex(
+        df=df,
+        date_order=date_order,
+        sorted_days=days[date_order],
+        status_bits=_bitmaps(df['상태']) if '상태' in df.columns else {},
+        grade_bits=_bitmaps(df['등급']),
+    )
+
+
+def load_index():
+    with _lock:
+        sig = storage.file_signature(SUGGESTION_FILE)
+        if _cached['index'] is None or _cached['sig'] != sig:
+            df = storage.snapshot(SUGGESTION_FILE, [], usecols=LIST_COLUMNS)
+            _cached['index'] = build_index(df)
+            _cached['sig'] = sig
+        return _cached['index']
+
+
+# --- 함수: 필터 조회 ---
+def _match_positions(index, filters):
+    n = len(index.df)
+    mask = np.ones(n, dtype=bool)
+
+    # 1. 날짜 필터 (정렬된 날짜에서 범위 탐색)
+    date_range = filters.get('date_range')
+    if date_range is not None:
+        start_d, end_d = date_range
+        lo = np.searchsorted(index.sorted_days, np.datetime64(start_d, 'D'), side='left')
+        hi = np.searchsorted(index.sorted_days, np.datetime64(end_d, 'D'), side='right')
+        date_mask = np.zeros(n, dtype=bool)
+        date_mask[index.date_order[lo:hi]] = True
+        mask &= date_mask
+
+    # 4. 상태 필터 / 5. 등급 필터 (비트맵)
+    status = filters.get('status', "전체")
+    if status != "전체":
+        mask &= index.status_bits.get(str(status), np.zeros(n, dtype=bool))
+    grade = filters.get('grade', "전체")
+    if grade != "전체":
+        mask &= index.grade_bits.get(str(grade), np.zeros(n, dtype=bool))
+
+    positions = np.flatnonzero(mask)
+
+    # 2. 이름 필터 (앞 단계에서 좁혀진 행만 검사)
+    keyword = filters.get('name')
+    if keyword and len(positions):
+        values = index.df['작성자'].take(positions)
+        positions = positions[values.str.contains(keyword, na=False).to_numpy()]
+
+    # 3. 제목/본문 키워드 (전문 검색 인덱스, 관련도 높은 순으로 정렬)
+    keyword = filters.get('title')
+    if keyword and len(positions):
+        scores = dict(search.search(keyword))
+        ids = index.df['ID'].to_numpy(dtype=object)[positions]
+        keep = np.fromiter((i in scores for i in ids), dtype=bool, count=len(ids))
+        positions, ids = positions[keep], ids[keep]
+        order = np.argsort(np.fromiter((-scores[i] for i in ids), dtype=float, count=len(ids)), kind='stable')
+        positions = positions[order]
+    return positions
+
+
+def _filtered(filters):
+    # 반환: (인덱스, 조건에 맞는 행 위치). 같은 인덱스 버전 + 같은 조건이면 이전 결과를 그대로 사용 (읽기 전용)
+    index = load_index()
+    key = tuple(sorted(filters.items()))
+    owner, matches = _cached['matches']
+    if owner is not index:
+        matches = {}  # 데이터가 바뀌면 이전 결과는 모두 버림
+    positions = matches.get(key)
+    if positions is None:
+        positions = _match_positions(index, filters)
+        positions.flags.writeable = False
+        if len(matches) >= MATCH_CACHE_SIZE:
+            matches = {}
+        matches = {**matches, key: positions}
+    _cached['matches'] = (index, matches)  # 다른 세션과 공유: 튜플 통째로 교체
+    return index, positions
+
+
+@tracing.traced('filter')
+def query_suggestions(filters, page, per_page):
+    # 반환: (현재 페이지 행, 전체 건수)
+    index, positions = _filtered(filters)
+    total = len(positions)
+    start = (page - 1) * per_page
+    page_df = index.df.take(positions[start:start + per_page]).copy()
+    return page_df, total
+
+
+@tracing.traced('filter')
+def filtered_titles(filters):
+    # 조건에 맞는 제목 목록만 (목록 페이지와 별도로 검토 대상 선택에 사용)
+    index, positions = _filtered(filters)
+    return pd.unique(index.df['제목'].to_numpy(dtype=object)[positions]).tolist()
+
+
+@tracing.traced('filter')
+def find_by_title(filters, title):
+    # 조건에 맞는 행 중 제목이 일치하는 첫 번째 행의 ID
+    index, positions = _filtered(filters)
+    titles = index.df['제목'].to_numpy(dtype=object)[positions]
+    hits = positions[titles == title]
+    return index.df['ID'].iat[hits[0]] if len(hits) else None
+
+
+@tracing.traced('filter')
+def review_queue(filters, statuses=('접수', '심사대기'), limit=None):
+    # 일괄 심사 대상: 조건에 맞는 행 중 심사 전 상태인 행을 오래된 순으로 (상태 필터는 무시)
+    # 반환: (대상 행, 전체 건수)
+    index, positions = _filtered(dict(filters, status="전체"))
+    n = len(index.df)
+    pending = np.zeros(n, dtype=bool)
+    for status in statuses:
+        pending |= index.status_bits.get(status, np.zeros(n, dtype=bool))
+    rank = np.full(n, n, dtype=np.int64)
+    rank[index.date_order] = np.arange(len(index.date_order))
+    positions = positions[pending[positions]]
+    positions = positions[np.argsort(rank[positions], kind='stable')]
+    total = len(positions)
+    if limit is not None:
+        positions = positions[:limit]
+    return index.df.take(positions).copy(), total
+
+
+# --- 함수: 상세 조회 (본문 포함, 선택한 한 건만) ---
+# 전체 테이블을 읽지 않고 ID로 한 행만 읽는다 (본문 '내용'도 이 행의 것만)
+def get_suggestion(row_id):
+    if row_id is None:
+        return None
+    rows = storage.lookup(SUGGESTION_FILE, row_id)
+    if rows.empty:
+        return None
+    return _normalize(rows).iloc[0]
@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+from config import CIRCLE_FILE, SCHEMA_STATE_FILE, SUGGESTION_FILE
+
+# --- 설정: 테이블 스키마 (컬럼 타입) / 버전 ---
+# 파일에는 문자열로 저장하고, 읽을 때(storage.load_table) 아래 타입으로 한 번 변환하여 캐시한다.
+#  - category: 값 종류가 적은 컬럼 (행마다 문자열 객체 대신 정수 코드 1~2바이트)
+#  - Int64: 점수/포인트/버전 (빈 값은 <NA>)
+#  - date: 'YYYY-MM-DD' 날짜 (datetime64, 빈 값은 NaT)
+# 변환할 수 없는 값이 섞인 컬럼은 데이터 손실을 막기 위해 문자열 그대로 둔다.
+# 구버전 데이터 정리(컬럼명 변경, '반려' 상태 등)는 읽을 때마다 하지 않고 migrate()로 파일에 한 번 반영한다.
+#  - v1: 제안 테이블 구버전 컬럼/값 정리
+#  - v2: 회원 비밀번호 해시 변환
+SCHEMA_VERSION = 2
+
+TABLE_TYPES = {
+    SUGGESTION_FILE: {
+        '상태': 'category', '등급': 'category', '부서': 'category',
+        '포인트': 'Int64', '평가점수': 'Int64', '버전': 'Int64',
+        '날짜': 'date',
+    },
+    CIRCLE_FILE: {
+        '상태': 'category',
+        '날짜': 'date',
+    },
+}
+DATE_FORMAT = '%Y-%m-%d'
+
+_checked = {'version': None}
+
+
+# --- 함수: 컬럼 타입 적용 ---
+def _as_int(values):
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return values.astype('Int64')
+    num = pd.to_numeric(values, errors='coerce')
+    if num.notna().sum() != values.notna().sum() or (num.dropna() % 1 != 0).any():
+        return values
+    return num.astype('Int64')
+
+
+def _as_date(values):
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+    dates = pd.to_datetime(values, errors='coerce', format=DATE_FORMAT)
+    if dates.notna().sum() != values.notna().sum():
+        return values
+    return dates
+
+
+def apply_types(file_path, df):
+    # 스키마에 정의된 컬럼만 변환 (없는 컬럼은 건너뜀)
+    types = TABLE_TYPES.get(os.path.basename(file_path))
+    if not types or df.empty:
+        return df
+    for col, kind in types.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if kind == 'category':
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                df[col] = values.astype('category')
+        elif kind == 'Int64':
+            df[col] = _as_int(values)
+        elif kind == 'date':
+            df[col] = _as_date(values)
+    return df
+
+
+def to_cell(value):
+    # 타입이 적용된 값을 저장용 문자열로 (날짜는 'YYYY-MM-DD')
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+# --- 함수: 스키마 버전 기록 ---
+def read_version():
+    if not os.path.exists(SCHEMA_STATE_FILE):
+        return 0
+    try:
+        with open(SCHEMA_STATE_FILE, encoding='utf-8') as f:
+            return int(json.load(f).get('version', 0))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _write_version(version):
+    tmp_path = SCHEMA_STATE_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version}, f)
+    os.replace(tmp_path, SCHEMA_STATE_FILE)
+
+
+# --- 함수: 버전별 마이그레이션 ---
+def _merge_column(df, old, new):
+    # 구버전 컬럼(old)을 새 컬럼(new)으로 합침 (둘 다 있으면 new의 빈 값만 old로 채움)
+    if old not in df.columns:
+        return df
+    if new in df.columns:
+        df[new] = df[new].where(df[new].notna() & (df[new].astype(str) != ""), df[old])
+        return df.drop(columns=[old])
+    return df.rename(columns={old: new})
+
+
+def _migrate_v1():
+    # 제안 테이블: 점수 -> 포인트, 작성날짜 -> 날짜, '반려' -> '미채택', 등급 S~C 통일, 빈 부서 채움
+    import accounts
+    import events
+    import storage
+    from grading import add_grade_emoji
+
+    with storage.locked(SUGGESTION_FILE):
+        df = storage.load_table(SUGGESTION_FILE, [])
+        if df.empty:
+            return 0
+        df = df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+        before = df.copy()
+
+        df = _merge_column(df, '점수', '포인트')
+        df = _merge_column(df, '작성날짜', '날짜')
+        for col in ['등급', '포인트', '평가점수', '부서']:
+            if col not in df.columns:
+                df[col] = None
+        if '상태' in df.columns:
+            df['상태'] = df['상태'].replace('반려', '미채택')
+        grades = {g: add_grade_emoji(g) for g in pd.unique(df['등급'].dropna())}
+        df['등급'] = df['등급'].map(grades)
+        df['등급'] = df['등급'].where(df['등급'] != "")
+        missing = df['부서'].isna() | (df['부서'].astype(str).str.strip() == "")
+        if missing.any() and '작성자ID' in df.columns:
+            df.loc[missing, '부서'] = df.loc[missing, '작성자ID'].map(accounts.dept_map())
+
+        if df.columns.equals(before.columns) and df.equals(before):
+            return 0
+        storage.save_table(SUGGESTION_FILE, df)
+        events.record_rewrite(SUGGESTION_FILE, df, 'schema_v1')
+        return len(df)
+
+
+def _migrate_v2():
+    # 회원 테이블: 평문 비밀번호 -> 솔트 해시 (auth.py)
+    import auth
+
+    return auth.migrate_users()
+
+
+MIGRATIONS = {1: _migrate_v1, 2: _migrate_v2}
+
+
+def migrate():
+    # 기록된 버전 이후의 마이그레이션을 순서대로 실행. 반환: [(버전, 변경 행 수)]
+    import storage
+
+    done = []
+    with storage.locked(SCHEMA_STATE_FILE):
+        version = read_version()
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            done.append((target, MIGRATIONS[target]()))
+            _write_version(target)
+    _checked['version'] = SCHEMA_VERSION
+    return done
+
+
+def ensure_current():
+    # 앱 시작 시 호출: 프로세스마다 한 번만 버전 파일을 확인
+    if _checked['version'] == SCHEMA_VERSION:
+        return
+    if read_version() < SCHEMA_VERSION:
+        migrate()
+    _checked['version'] = SCHEMA_VERSION
+
+
+if __name__ == '__main__':
+    # 사용법: python schema.py migrate|status
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == 'migrate':
+        for target, count in migrate():
+            print(f"스키마 v{target}: {count}행 변환")
+        print(f"{SCHEMA_STATE_FILE}: 현재 버전 v{read_version()}")
+    elif command == 'status':
+        version = read_version()
+        print(f"{SCHEMA_STATE_FILE}: 현재 버전 v{version} (최신 v{SCHEMA_VERSION})"
+              + ("" if version >= SCHEMA_VERSION else " - 'python schema.py migrate' 필요"))
+    else:
+        print("사용법: python schema.py migrate|status")
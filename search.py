@@ -0,0 +1,216 @@
+import html
+import math
+import re
+import threading
+
+import pandas as pd
+
+import storage
+from config import SUGGESTION_FILE
+
+# --- 설정: 제안 전문 검색 인덱스 ---
+# 제목과 본문(HTML 태그 제거)을 단어 단위로 나눈 뒤 글자 2-gram(bigram)으로 색인한다.
+# 한글은 띄어쓰기 없이 붙여 쓰는 경우가 많아 형태소 분석 없이도 부분 일치 검색이 가능하다.
+#  - 단어 첫 글자에는 경계 토큰('^' + 글자)을 추가하여 접두어 검색('설비*')을 지원
+#  - 제목 일치는 본문보다 높은 가중치로 점수 계산
+# 제출/수정/삭제 시 storage 변경 알림으로 해당 문서만 다시 색인한다.
+TITLE_WEIGHT = 3
+WORD_START = '^'
+SOURCE_COLUMNS = ['ID', '제목', '내용']
+
+TAG_RE = re.compile(r'<[^>]+>')
+WORD_RE = re.compile(r'\w+')
+
+_lock = threading.RLock()
+_state = {
+    'sig': None,
+    'docs': {},        # 문서ID -> (정규화된 제목, 정규화된 본문)
+    'postings': {},    # 토큰 -> {문서ID: (제목 빈도, 본문 빈도)}
+    'char_tokens': {}, # 글자 -> 해당 글자를 포함하는 토큰 집합 (한 글자 검색용)
+}
+
+
+# --- 함수: 텍스트 정규화/토큰화 ---
+def normalize_text(value, is_html=False):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    text = str(value)
+    if is_html:
+        text = html.unescape(TAG_RE.sub(' ', text))
+    return ' '.join(WORD_RE.findall(text.lower()))
+
+
+def tokenize(text):
+    tokens = []
+    for word in text.split():
+        tokens.append(WORD_START + word[0])
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+# --- 함수: 문서 색인/제거 ---
+def _count(tokens):
+    counts = {}
+    for tok in tokens:
+        counts[tok] = counts.get(tok, 0) + 1
+    return counts
+
+
+def _remove_doc(doc_id):
+    doc = _state['docs'].pop(doc_id, None)
+    if doc is None:
+        return
+    for tok in set(tokenize(doc[0])) | set(tokenize(doc[1])):
+        posting = _state['postings'].get(tok)
+        if posting is not None:
+            posting.pop(doc_id, None)
+            if not posting:
+                del _state['postings'][tok]
+                for ch in set(tok.lstrip(WORD_START)):
+                    tokens = _state['char_tokens'].get(ch)
+                    if tokens is not None:
+                        tokens.discard(tok)
+
+
+def _add_doc(doc_id, title, body):
+    _remove_doc(doc_id)
+    title_n = normalize_text(title)
+    body_n = normalize_text(body, is_html=True)
+    _state['docs'][doc_id] = (title_n, body_n)
+    title_counts = _count(tokenize(title_n))
+    body_counts = _count(tokenize(body_n))
+    for tok in set(title_counts) | set(body_counts):
+        _state['postings'].setdefault(tok, {})[doc_id] = (title_counts.get(tok, 0), body_counts.get(tok, 0))
+        for ch in set(tok.lstrip(WORD_START)):
+            _state['char_tokens'].setdefault(ch, set()).add(tok)
+
+
+def rebuild():
+    with _lock:
+        # 시그니처를 먼저 잰다: 읽는 사이에 바뀌면 다음 확인 때 다시 색인 (반대 순서면 바뀐 내용을 놓침)
+        sig = storage.file_signature(SUGGESTION_FILE)
+        df = storage.snapshot(SUGGESTION_FILE, [], usecols=SOURCE_COLUMNS)
+        _state.update({'docs': {}, 'postings': {}, 'char_tokens': {}})
+        if not df.empty:
+            for row in df.to_dict('records'):
+                if row.get('ID') is not None and not pd.isna(row.get('ID')):
+                    _add_doc(row['ID'], row.get('제목'), row.get('내용'))
+        _state['sig'] = sig
+
+
+def _ensure_fresh():
+    # 다른 프로세스가 파일을 바꾼 경우(알림을 받지 못한 변경)에는 전체 재색인
+    if _state['sig'] != storage.file_signature(SUGGESTION_FILE):
+        rebuild()
+
+
+def ensure_index():
+    # 검색 없이 색인만 준비 (서버 시작 시 미리 읽기용)
+    with _lock:
+        _ensure_fresh()
+
+
+# --- 함수: 행 변경 반영 (storage 구독) ---
+def apply_changes(changes, sigs=None):
+    with _lock:
+        if _state['sig'] is None:
+            return  # 아직 색인 전이면 첫 검색 시 전체 색인
+        if changes is None:
+            rebuild()
+            return
+        for old_row, new_row in changes:
+            if (old_row is not None and new_row is not None
+                    and old_row.get('제목') == new_row.get('제목') and old_row.get('내용') == new_row.get('내용')):
+                continue  # 상태/점수만 바뀐 경우 재색인 불필요
+            if old_row is not None:
+                _remove_doc(old_row.get('ID'))
+            if new_row is not None and new_row.get('ID') is not None:
+                _add_doc(new_row['ID'], new_row.get('제목'), new_row.get('내용'))
+        # 쓰기 잠금 안에서 잰 (직전, 직후) 시그니처: 색인이 직전 상태였을 때만 최신으로 표시하고,
+        # 그 사이 다른 쓰기(다른 프로세스 등)가 있었으면 다음 검색 때 전체 재색인
+        before, after = sigs or (None, None)
+        _state['sig'] = after if before is not None and _state['sig'] == before else None
+
+
+storage.subscribe(SUGGESTION_FILE, apply_changes, SOURCE_COLUMNS)
+
+
+# --- 함수: 검색 ---
+def _candidates(term, prefix):
+    postings = _state['postings']
+    if len(term) == 1:
+        # 한 글자: 그 글자를 포함하는(접두어면 그 글자로 시작하는) 토큰의 문서 합집합
+        tokens = [WORD_START + term] if prefix else _state['char_tokens'].get(term, ())
+        docs = set()
+        for tok in tokens:
+            docs.update(postings.get(tok, {}))
+        return docs, list(tokens)
+
+    tokens = [term[i:i + 2] for i in range(len(term) - 1)]
+    if prefix:
+        tokens = [WORD_START + term[0]] + tokens
+    docs = None
+    for tok in sorted(set(tokens), key=lambda t: len(postings.get(t, ()))):
+        posting = postings.get(tok)
+        if not posting:
+            return set(), tokens
+        docs = set(posting) if docs is None else docs & posting.keys()
+        if not docs:
+            break
+    return docs or set(), tokens
+
+
+def _verify(doc, term, prefix):
+    # bigram 교집합은 인접하지 않은 조합도 포함하므로 원문에서 실제 일치 여부를 확인
+    for text in doc:
+        if prefix:
+            if any(word.startswith(term) for word in text.split()):
+                return True
+        elif term in text:
+            return True
+    return False
+
+
+def search(query, limit=None):
+    # 반환: 점수 내림차순 [(문서ID, 점수), ...]. 모든 검색어를 포함하는 문서만 (AND)
+    terms = []
+    for raw in str(query).split():
+        prefix = raw.endswith('*')
+        term = normalize_text(raw.rstrip('*'))
+        for word in term.split():
+            terms.append((word, prefix))
+    if not terms:
+        return []
+
+    with _lock:
+        _ensure_fresh()
+        postings = _state['postings']
+        n_docs = max(len(_state['docs']), 1)
+        scores = None
+        for term, prefix in terms:
+            docs, tokens = _candidates(term, prefix)
+            docs = {d for d in docs if _verify(_state['docs'][d], term, prefix)}
+            term_scores = {}
+            for tok in tokens:
+                posting = postings.get(tok, {})
+                if not posting:
+                    continue
+                idf = math.log(1 + n_docs / len(posting))
+                for d in docs:
+                    tf = posting.get(d)
+                    if tf is not None:
+                        term_scores[d] = term_scores.get(d, 0.0) + idf * (TITLE_WEIGHT * tf[0] + tf[1])
+            for d in docs:
+                term_scores.setdefault(d, 0.0)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: scores[d] + s for d, s in term_scores.items() if d in scores}
+            if not scores:
+                return []
+
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+    return ranked[:limit] if limit else ranked
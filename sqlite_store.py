@@ -0,0 +1,298 @@
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import schema
+from config import (
+    DATABASE_FILE, USER_FILE, SUGGESTION_FILE, CIRCLE_FILE, LEVEL_SETTINGS_FILE, DRAFT_FILE, ATTACHMENT_FILE,
+)
+
+# --- 설정: SQLite 저장소 (WAL 모드) ---
+# storage.py의 CSV 파일 하나를 테이블 하나로 대응시킨다 (파일명 -> 테이블명).
+# WAL 모드에서는 읽기가 쓰기를 막지 않고, 쓰기는 BEGIN IMMEDIATE로 직렬화되어
+# 여러 세션/프로세스가 동시에 수정해도 변경이 유실되지 않는다.
+# 테이블별 버전(_table_versions)을 쓰기 트랜잭션마다 올려 캐시 시그니처로 사용한다.
+#  - 숫자 컬럼은 INTEGER, 그 외는 TEXT (날짜는 'YYYY-MM-DD' 문자열이라 정렬/범위 비교 가능)
+#  - 읽을 때는 CSV 백엔드와 같게 모든 값을 문자열(빈 값은 NaN)로 돌려준다 (컬럼 타입은 storage에서 schema로 적용)
+BUSY_TIMEOUT = 10.0   # 초. 다른 쓰기 트랜잭션이 끝나기를 기다리는 최대 시간
+VERSION_TABLE = '_table_versions'
+
+# 파일 -> (테이블명, 키 컬럼, 컬럼 타입, 인덱스 컬럼)
+TABLES = {
+    SUGGESTION_FILE: ('suggestions', 'ID', {'포인트': 'INTEGER', '평가점수': 'INTEGER', '버전': 'INTEGER'},
+                      ['ID', '작성자ID', '상태', '날짜']),
+    USER_FILE: ('users', '사번', {}, ['사번']),
+    CIRCLE_FILE: ('circle_activity', 'ID', {}, ['ID', '작성자ID', '날짜']),
+    LEVEL_SETTINGS_FILE: ('level_settings', '등급명', {'필요점수': 'INTEGER'}, []),
+    DRAFT_FILE: ('drafts', 'ID', {}, ['ID', '작성자ID']),
+    ATTACHMENT_FILE: ('attachments', '파일ID', {'크기': 'INTEGER'}, ['파일ID', '업로더ID', '다이제스트']),
+}
+
+_local = threading.local()
+
+
+# --- 함수: 연결/트랜잭션 ---
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def table_name(file_path):
+    spec = TABLES.get(os.path.basename(file_path))
+    if spec is not None:
+        return spec[0]
+    # 등록되지 않은 파일(파생 데이터 등)은 파일명을 테이블명으로 사용
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def connect():
+    # 스레드마다 연결 하나 (sqlite3 연결은 스레드 간 공유 불가)
+    path = os.path.abspath(DATABASE_FILE)
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (name TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        conns[path] = conn
+    return conn
+
+
+def _version(conn, table):
+    row = conn.execute(f'SELECT version FROM {VERSION_TABLE} WHERE name = ?', (table,)).fetchone()
+    return row[0] if row else None
+
+
+@contextmanager
+def _write(table):
+    # 트랜잭션 직전/직후 테이블 버전을 스레드별로 기억 (written_signatures)
+    conn = connect()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        before = _version(conn, table)
+        yield conn
+        conn.execute(
+            f'INSERT INTO {VERSION_TABLE} (name, version) VALUES (?, 1) '
+            f'ON CONFLICT(name) DO UPDATE SET version = version + 1', (table,))
+        after = _version(conn, table)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    if getattr(_local, 'written', None) is None:
+        _local.written = {}
+    _local.written[table] = (before, after)
+
+
+# --- 함수: 스키마 ---
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({_quote(table)})')]
+
+
+def _column_def(file_path, column):
+    spec = TABLES.get(os.path.basename(file_path))
+    col_type = spec[2].get(column, 'TEXT') if spec is not None else 'TEXT'
+    return f'{_quote(column)} {col_type}'
+
+
+def _ensure_table(conn, file_path, columns, key=None):
+    table = table_name(file_path)
+    existing = _table_columns(conn, table)
+    if not existing:
+        columns = list(dict.fromkeys(list(columns) + ([key] if key else [])))
+        if not columns:
+            return table  # 컬럼 정보가 없으면 첫 쓰기 때 생성
+        conn.execute(f'CREATE TABLE {_quote(table)} ({", ".join(_column_def(file_path, c) for c in columns)})')
+        existing = columns
+    else:
+        # CSV처럼 새 컬럼이 들어오면 테이블에 추가
+        for col in columns:
+            if col not in existing:
+                conn.execute(f'ALTER TABLE {_quote(table)} ADD COLUMN {_column_def(file_path, col)}')
+                existing.append(col)
+
+    spec = TABLES.get(os.path.basename(file_path))
+    index_columns = list(spec[3]) if spec is not None else []
+    if key and key not in index_columns:
+        index_columns.append(key)
+    for col in index_columns:
+        if col in existing:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {_quote(f"idx_{table}_{col}")} '
+                         f'ON {_quote(table)} ({_quote(col)})')
+    return table
+
+
+def _cell(value):
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return schema.to_cell(value)
+
+
+def _text(value):
+    # 읽기 결과를 CSV 백엔드(dtype=str)와 같은 형태로 변환
+    return np.nan if value is None else str(value)
+
+
+# --- 함수: 조회 ---
+def signature(file_path):
+    # storage.file_signature와 같은 모양 (첫 항목이 None이면 테이블 없음)
+    return (_version(connect(), table_name(file_path)), None, None)
+
+
+def written_signatures(file_path):
+    # 이 스레드의 마지막 쓰기 트랜잭션 직전/직후 시그니처
+    before, after = (getattr(_local, 'written', None) or {}).get(table_name(file_path), (None, None))
+    return (before, None, None), (after, None, None)
+
+
+def read_table(file_path, columns, key='ID', usecols=None):
+    conn = connect()
+    table = table_name(file_path)
+    existing = _table_columns(conn, table)
+    if not existing:
+        # 테이블이 없으면 빈 테이블 (CSV와 같이 읽기 경로에서는 만들지 않음: 첫 저장/추가 때 생김)
+        return pd.DataFrame(columns=[c for c in columns if usecols is None or c in usecols], dtype=object)
+
+    selected = [c for c in existing if usecols is None or c in usecols]
+    if not selected:
+        return pd.DataFrame(columns=selected)
+    rows = conn.execute(
+        f'SELECT {", ".join(_quote(c) for c in selected)} FROM {_quote(table)} ORDER BY rowid').fetchall()
+    data = {col: [_text(row[i]) for row in rows] for i, col in enumerate(selected)}
+    return pd.DataFrame(data, columns=selected, dtype=object)
+
+
+def _select_rows(conn, table, key, row_id, columns, first_only=False):
+    existing = _table_columns(conn, table)
+    cols = [c for c in columns if c in existing]
+    if not cols or key not in existing:
+        return [], []
+    sql = (f'SELECT rowid, {", ".join(_quote(c) for c in cols)} FROM {_quote(table)} '
+           f'WHERE {_quote(key)} = ? ORDER BY rowid')
+    if first_only:
+        sql += ' LIMIT 1'
+    rows = conn.execute(sql, (str(row_id),)).fetchall()
+    rowids = [row[0] for row in rows]
+    records = [{c: (None if row[i + 1] is None else str(row[i + 1])) for i, c in enumerate(cols)} for row in rows]
+    return rowids, records
+
+
+def read_row(file_path, row_id, key='ID'):
+    # 키가 row_id인 첫 번째 행 (모든 컬럼, 값은 read_table과 같은 형태). 없으면 None
+    conn = connect()
+    table = table_name(file_path)
+    rowids, records = _select_rows(conn, table, key, row_id, _table_columns(conn, table), first_only=True)
+    if not records:
+        return None
+    return {col: _text(value) for col, value in records[0].items()}
+
+
+# --- 함수: 저장 ---
+def write_table(file_path, df, key=None):
+    # 전체 저장: 테이블을 df 내용으로 교체 (한 트랜잭션)
+    table = table_name(file_path)
+    columns = [str(c) for c in df.columns]
+    with _write(table) as conn:
+        conn.execute(f'DROP TABLE IF EXISTS {_quote(table)}')
+        _ensure_table(conn, file_path, columns, key if key in columns else None)
+        if columns and len(df):
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(
+                f'INSERT INTO {_quote(table)} ({", ".join(_quote(c) for c in columns)}) VALUES ({placeholders})',
+                ([_cell(v) for v in row] for row in df.itertuples(index=False, name=None)))
+
+
+def insert_row(file_path, cells, key='ID'):
+    table = table_name(file_path)
+    columns = list(cells)
+    with _write(table) as conn:
+        _ensure_table(conn, file_path, columns, key)
+        conn.execute(
+            f'INSERT INTO {_quote(table)} ({", ".join(_quote(c) for c in columns)}) '
+            f'VALUES ({", ".join("?" for _ in columns)})', [cells[c] for c in columns])
+
+
+def _update_first(conn, file_path, table, row_id, cells, key, columns, expected_version):
+    # 키가 일치하는 첫 번째 행 수정 (버전 검사 포함). 반환: (변경 전 행 목록, 기록한 변경 내용)
+    import storage
+
+    _ensure_table(conn, file_path, list(cells), key)
+    wanted = list(dict.fromkeys([key] + list(columns) + [storage.VERSION_COLUMN]))
+    rowids, old_rows = _select_rows(conn, table, key, row_id, wanted, first_only=True)
+    version = storage.next_version(old_rows[0] if old_rows else None, row_id, expected_version)
+    if version is not None:
+        cells = dict(cells, **{storage.VERSION_COLUMN: version})
+        _ensure_table(conn, file_path, [storage.VERSION_COLUMN], key)
+    if rowids and cells:
+        assignments = ", ".join(f'{_quote(c)} = ?' for c in cells)
+        conn.execute(f'UPDATE {_quote(table)} SET {assignments} WHERE rowid = ?', list(cells.values()) + rowids)
+    return old_rows, cells
+
+
+def update_row(file_path, row_id, cells, key='ID', columns=(), expected_version=None):
+    # CSV 백엔드와 같게 키가 일치하는 첫 번째 행만 수정. 반환: 변경 전 행 (columns 컬럼만)
+    table = table_name(file_path)
+    with _write(table) as conn:
+        old_rows, _ = _update_first(conn, file_path, table, row_id, cells, key, columns, expected_version)
+    return old_rows if columns else []
+
+
+def update_rows(file_path, batch, key='ID', columns=(), expected_versions=None):
+    # 여러 행을 한 트랜잭션으로 수정 (하나라도 버전이 맞지 않으면 전체 롤백). 반환: [(변경 전 행, 변경 후 행)]
+    expected_versions = expected_versions or {}
+    table = table_name(file_path)
+    changes = []
+    with _write(table) as conn:
+        for row_id, cells in batch:
+            old_rows, cells = _update_first(conn, file_path, table, row_id, cells, key, columns,
+                                            expected_versions.get(row_id))
+            if old_rows and columns:
+                changes.append((old_rows[0], {**old_rows[0], **cells}))
+    return changes
+
+
+def delete_row(file_path, row_id, key='ID', columns=()):
+    # 키가 일치하는 모든 행 삭제. 반환: 삭제된 행 (columns 컬럼만)
+    table = table_name(file_path)
+    with _write(table) as conn:
+        _ensure_table(conn, file_path, [], key)
+        _, old_rows = _select_rows(conn, table, key, row_id, list(dict.fromkeys([key] + list(columns))))
+        if key in _table_columns(conn, table):
+            conn.execute(f'DELETE FROM {_quote(table)} WHERE {_quote(key)} = ?', (str(row_id),))
+    return old_rows if columns else []
+
+
+# --- 일회성 마이그레이션: CSV -> SQLite ---
+def import_csv(files=None):
+    import storage
+
+    for file_path in files or list(TABLES):
+        if not os.path.exists(file_path) and not os.path.exists(storage.journal_path(file_path)):
+            print(f"{file_path}: 파일이 없어 건너뜁니다.")
+            continue
+        spec = TABLES.get(os.path.basename(file_path))
+        key = spec[1] if spec is not None else 'ID'
+        # 미병합 저널까지 반영된 CSV 내용을 그대로 가져옴
+        df = storage.read_csv_table(file_path, key=key)
+        write_table(file_path, df, key)
+        print(f"{file_path} -> {DATABASE_FILE}:{table_name(file_path)} ({len(df)}행)")
+
+
+if __name__ == '__main__':
+    # 사용법: python sqlite_store.py import [CSV 파일 ...]
+    if len(sys.argv) >= 2 and sys.argv[1] == 'import':
+        import_csv(sys.argv[2:])
+    else:
+        print("사용법: python sqlite_store.py import [users.csv suggestions.csv ...]")
@@ -0,0 +1,624 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+import schema
+import tracing
+from config import STORAGE_BACKEND
+
+# --- 설정: 저장소 백엔드 ---
+# 기본은 CSV + 변경 저널. TPM_STORAGE=sqlite 이면 같은 함수들이 SQLite(WAL) 테이블을 사용한다.
+# 로드 캐시와 변경 구독자 알림은 두 백엔드가 공유한다.
+if STORAGE_BACKEND == 'sqlite':
+    import sqlite_store as _sql
+else:
+    _sql = None
+
+# --- 설정: 변경 저널 ---
+# 한 행의 변경을 위해 CSV 전체를 다시 쓰지 않도록, 변경분(insert/update/delete)을
+# '<파일명>.journal' 에 한 줄씩 추가하고 로드 시 원본 CSV 위에 재생(replay)한다.
+JOURNAL_SUFFIX = '.journal'
+COMPACTING_SUFFIX = '.compacting'
+COMPACT_THRESHOLD = 200   # 저널 레코드가 이 개수를 넘으면 백그라운드에서 CSV로 병합
+
+_locks = {}
+_locks_guard = threading.Lock()
+_flocks = {}              # 파일별 잠금 파일 상태 {'fd', 'depth', 'exclusive'} (해당 파일의 RLock 안에서만 접근)
+_pending = {}             # 파일별 미병합 저널 레코드 수
+_compacting = set()       # 병합 스레드가 실행 중인 파일
+
+# --- 설정: 로드 캐시 ---
+# (경로, 키 컬럼, 요청 컬럼) -> (파일 시그니처, DataFrame). 프로세스 단위로 공유되므로
+# Streamlit 재실행(rerun)과 세션 사이에서 같은 파일을 다시 파싱하지 않는다.
+CACHE_MAX_ENTRIES = 32
+_cache = {}
+_cache_guard = threading.Lock()
+
+# --- 설정: 행 위치 색인 ---
+# 상세 화면이나 행 수정 전 확인처럼 몇 행만 필요할 때 전체 테이블(본문 포함)을 파싱하지 않도록,
+# 원본 CSV의 (키 -> 행의 바이트 위치/길이 목록)을 파일이 바뀔 때까지 기억한다. 저널 변경은 읽을 때 덧씌운다.
+_offsets = {}             # (경로, 키 컬럼) -> (원본 파일 시그니처, 헤더, {키: [(시작, 길이), ...]})
+
+# --- 설정: 잠금 / 행 버전 ---
+# 같은 파일을 여러 프로세스(Streamlit 워커, CLI)가 다루므로 '<파일명>.lock'에 flock을 건다.
+# 읽기는 공유 잠금, 저널 추가/전체 저장/병합은 배타 잠금.
+# 행에 '버전' 값이 있으면(또는 expected_version으로 수정하면) 수정할 때마다 1씩 올리고,
+# 화면에서 본 버전과 현재 버전이 다르면 StaleWriteError로 거부한다.
+LOCK_SUFFIX = '.lock'
+VERSION_COLUMN = '버전'
+
+
+class StaleWriteError(Exception):
+    pass
+
+
+# --- 설정: 변경 구독자 ---
+# 파생 데이터(포인트 원장 등)를 갱신하기 위해 행 변경 시 (이전 행, 새 행) 목록을 전달.
+# 전체 저장(save_table)처럼 행 단위 변경을 알 수 없으면 None을 전달하여 재구축을 요청.
+# 함께 전달하는 (변경 직전, 변경 직후) 파일 시그니처는 쓰기 잠금 안에서 잰 값이므로,
+# 구독자는 직전 시그니처가 자기가 반영한 상태와 같을 때만 직후 시그니처를 최신으로 기록할 수 있다.
+_subscribers = {}
+
+
+def _lock_for(file_path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(file_path), threading.RLock())
+
+
+@contextmanager
+def locked(file_path, exclusive=True):
+    # 프로세스 안에서는 RLock, 프로세스 사이에서는 잠금 파일로 직렬화 (중첩 호출 가능)
+    with _lock_for(file_path):
+        if fcntl is None:
+            yield
+            return
+        state = _flocks.setdefault(os.path.abspath(file_path), {'fd': None, 'depth': 0, 'exclusive': False})
+        if state['fd'] is None:
+            state['fd'] = os.open(file_path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        if state['depth'] == 0 or (exclusive and not state['exclusive']):
+            fcntl.flock(state['fd'], fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            state['exclusive'] = state['exclusive'] or exclusive
+        state['depth'] += 1
+        try:
+            yield
+        finally:
+            state['depth'] -= 1
+            if state['depth'] == 0:
+                fcntl.flock(state['fd'], fcntl.LOCK_UN)
+                state['exclusive'] = False
+
+
+def journal_path(file_path):
+    return file_path + JOURNAL_SUFFIX
+
+
+def _compacting_path(file_path):
+    return file_path + JOURNAL_SUFFIX + COMPACTING_SUFFIX
+
+
+# --- 함수: 저널 읽기/쓰기 ---
+def _read_journal(path):
+    records = []
+    if not os.path.exists(path):
+        return records
+    tracing.count('read_bytes', os.path.getsize(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # 쓰는 도중 중단된 마지막 줄은 무시
+                continue
+    return records
+
+
+def _to_cell(value):
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return schema.to_cell(value)
+
+
+def _append(file_path, records, key):
+    # 반환: (추가 직전, 추가 직후) 파일 시그니처
+    lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    tracing.count('write_bytes', len(lines.encode('utf-8')))
+    with locked(file_path):
+        before = file_signature(file_path)
+        with open(journal_path(file_path), 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        count = _pending.get(file_path)
+        if count is None:
+            count = len(_read_journal(journal_path(file_path)))
+        else:
+            count += len(records)
+        _pending[file_path] = count
+        invalidate(file_path)
+        after = file_signature(file_path)
+    if count >= COMPACT_THRESHOLD:
+        compact_in_background(file_path, key)
+    return before, after
+
+
+# --- 함수: 저널 재생 ---
+def _replay(df, records, key, usecols=None):
+    if not records:
+        return df
+    if usecols is not None:
+        wanted = set(usecols) | {key}
+        records = [
+            dict(rec, row={k: v for k, v in rec.get('row', {}).items() if k in wanted})
+            for rec in records
+        ]
+
+    columns = list(df.columns)
+    rows = df.to_dict('records')
+    positions = {}
+    for i, r in enumerate(rows):
+        positions.setdefault(r.get(key), []).append(i)
+
+    def add_columns(row):
+        for col in row:
+            if col not in columns:
+                columns.append(col)
+
+    for rec in records:
+        op = rec.get('op')
+        row_id = rec.get('id')
+        if op == 'insert':
+            row = dict(rec.get('row', {}))
+            add_columns(row)
+            positions.setdefault(row.get(key), []).append(len(rows))
+            rows.append(row)
+        elif op == 'update':
+            # 기존 동작과 동일하게 ID가 일치하는 첫 번째 행만 수정
+            for i in positions.get(row_id, []):
+                if rows[i] is not None:
+                    add_columns(rec.get('row', {}))
+                    rows[i].update(rec.get('row', {}))
+                    break
+        elif op == 'delete':
+            for i in positions.pop(row_id, []):
+                rows[i] = None
+
+    return pd.DataFrame([r for r in rows if r is not None], columns=columns)
+
+
+def _read_base(file_path, usecols=None):
+    if not os.path.exists(file_path):
+        return None
+    tracing.count('read_bytes', os.path.getsize(file_path))
+    with tracing.span('csv_parse'):
+        if usecols is None:
+            return pd.read_csv(file_path, dtype=str)
+        # 요청한 컬럼만 파싱 (파일에 없는 컬럼은 무시). 저널 재생을 위해 키 컬럼은 항상 포함
+        return pd.read_csv(file_path, dtype=str, usecols=lambda c: c in usecols)
+
+
+# --- 함수: 로드 캐시 ---
+def file_signature(file_path):
+    if _sql is not None:
+        return _sql.signature(file_path)
+    sig = []
+    for path in (file_path, _compacting_path(file_path), journal_path(file_path)):
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def invalidate(file_path):
+    path = os.path.abspath(file_path)
+    with _cache_guard:
+        for cache_key in [k for k in _cache if k[0] == path]:
+            del _cache[cache_key]
+
+
+def _cache_get(cache_key, sig):
+    with _cache_guard:
+        entry = _cache.get(cache_key)
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+    return None
+
+
+def _cache_put(cache_key, sig, df):
+    with _cache_guard:
+        _cache.pop(cache_key, None)
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            # 가장 오래 전에 저장된 항목부터 제거
+            del _cache[next(iter(_cache))]
+        _cache[cache_key] = (sig, df)
+
+
+# --- 함수: 테이블 로드/저장 ---
+def snapshot(file_path, columns, key='ID', usecols=None):
+    # 프로세스가 공유하는 캐시 DataFrame을 그대로 반환 (읽기 전용: 수정하려면 load_table 또는 copy() 사용)
+    # 캐시 확인 -> 파싱 -> 캐시 저장을 파일 잠금 안에서 하므로, 여러 세션이 동시에 같은 파일을 요청해도
+    # 한 스레드만 파싱하고 나머지는 기다렸다가 캐시된 결과를 받는다 (single-flight).
+    if usecols is not None:
+        usecols = tuple(dict.fromkeys(list(usecols) + [key]))
+    cache_key = (os.path.abspath(file_path), key, usecols)
+
+    with locked(file_path, exclusive=False):
+        sig = file_signature(file_path)
+        cached = _cache_get(cache_key, sig)
+        if cached is not None:
+            return cached
+
+        if _sql is not None:
+            with tracing.span('sqlite_read'):
+                df = _sql.read_table(file_path, columns, key, usecols)
+            df = schema.apply_types(file_path, df)
+            _cache_put(cache_key, sig, df)
+            return df
+
+        df = _read_base(file_path, usecols)
+        records = _read_journal(_compacting_path(file_path)) + _read_journal(journal_path(file_path))
+        if df is None:
+            df = pd.DataFrame(columns=list(columns))
+            if not records:
+                # 파일이 없으면 빈 테이블 (읽기 경로에서는 파일을 만들지 않음: 첫 저장/추가 때 생김)
+                if usecols is not None:
+                    df = df[[c for c in df.columns if c in usecols]]
+                return df
+
+        with tracing.span('journal_replay'):
+            df = _replay(df, records, key, usecols)
+        df = schema.apply_types(file_path, df)
+        _cache_put(cache_key, sig, df)
+        return df
+
+
+def load_table(file_path, columns, key='ID', usecols=None):
+    # 호출 측에서 컬럼 추가/수정을 하므로 사본을 반환
+    return snapshot(file_path, columns, key, usecols).copy()
+
+
+# --- 함수: 한 행 조회 ---
+def _row_offsets(file_path, key):
+    # 원본 CSV를 한 번 훑어 키별 행의 위치 목록을 기록 (따옴표 안의 줄바꿈은 같은 행으로 취급)
+    path = os.path.abspath(file_path)
+    st = os.stat(file_path)
+    sig = (st.st_mtime_ns, st.st_size)
+    with _cache_guard:
+        entry = _offsets.get((path, key))
+    if entry is not None and entry[0] == sig:
+        return entry[1], entry[2]
+
+    tracing.count('read_bytes', st.st_size)
+    offsets = {}
+    with open(file_path, 'rb') as f:
+        first = f.readline()
+        header = next(csv.reader([first.decode('utf-8-sig')]), [])
+        key_pos = header.index(key) if key in header else None
+        pos, start, parts = len(first), len(first), []
+        for line in f:
+            parts.append(line)
+            pos += len(line)
+            if sum(p.count(b'"') for p in parts) % 2:
+                continue
+            if key_pos is not None:
+                values = next(csv.reader(io.StringIO(b"".join(parts).decode('utf-8'))), [])
+                if key_pos < len(values) and values[key_pos] != "":
+                    offsets.setdefault(values[key_pos], []).append((start, pos - start))
+            start, parts = pos, []
+    with _cache_guard:
+        _offsets[(path, key)] = (sig, header, offsets)
+    return header, offsets
+
+
+def _read_base_rows(file_path, row_ids, key, usecols=None):
+    # 반환: ({키: [행, ...]}, 헤더). usecols가 있으면 그 컬럼만 담음
+    found = {row_id: [] for row_id in row_ids}
+    if not os.path.exists(file_path):
+        return found, []
+    header, offsets = _row_offsets(file_path, key)
+    with open(file_path, 'rb') as f:
+        for row_id in row_ids:
+            for start, length in offsets.get(row_id, []):
+                f.seek(start)
+                raw = f.read(length)
+                tracing.count('read_bytes', len(raw))
+                values = next(csv.reader(io.StringIO(raw.decode('utf-8'))), [])
+                # pd.read_csv와 같게 빈 칸은 NaN
+                found[row_id].append({
+                    col: (values[i] if i < len(values) and values[i] != "" else np.nan)
+                    for i, col in enumerate(header) if usecols is None or col in usecols
+                })
+    return found, header
+
+
+def _rows_by_key(file_path, row_ids, key, usecols=None):
+    # 키가 row_ids인 행만 원본에서 읽고 저널을 덧씌움. 반환: ({키: [행, ...]}, 원본 헤더)
+    # 저널 재생은 _replay와 같은 규칙: 추가는 뒤에, 수정은 남아 있는 첫 번째 행에, 삭제는 같은 키의 모든 행에
+    with locked(file_path, exclusive=False):
+        found, header = _read_base_rows(file_path, row_ids, key, usecols)
+        records = _read_journal(_compacting_path(file_path)) + _read_journal(journal_path(file_path))
+    for rec in records:
+        op = rec.get('op')
+        row = rec.get('row', {})
+        if usecols is not None:
+            row = {k: v for k, v in row.items() if k in usecols}
+        if op == 'insert' and str(rec.get('row', {}).get(key)) in found:
+            found[str(rec['row'][key])].append(dict(row))
+        elif op == 'update' and rec.get('id') in found and found[rec['id']]:
+            found[rec['id']][0].update(row)
+        elif op == 'delete' and rec.get('id') in found:
+            found[rec['id']] = []
+    return found, header
+
+
+def lookup(file_path, row_id, key='ID'):
+    # 키가 row_id인 첫 번째 행만 읽어 한 행짜리 DataFrame으로 반환 (없으면 빈 DataFrame)
+    # 컬럼 타입은 snapshot과 같게 schema로 적용
+    row_id = str(row_id)
+    if _sql is not None:
+        row = _sql.read_row(file_path, row_id, key)
+        columns = list(row) if row is not None else []
+    else:
+        found, columns = _rows_by_key(file_path, [row_id], key)
+        row = found[row_id][0] if found[row_id] else None
+        if row is not None:
+            columns = list(columns) + [c for c in row if c not in columns]
+    if row is None:
+        return pd.DataFrame(columns=columns)
+    return schema.apply_types(file_path, pd.DataFrame([row], columns=columns))
+
+
+def read_csv_table(file_path, key='ID'):
+    # 백엔드 설정과 관계없이 CSV + 저널 내용을 읽음 (SQLite 가져오기용)
+    with locked(file_path, exclusive=False):
+        df = _read_base(file_path)
+        records = _read_journal(_compacting_path(file_path)) + _read_journal(journal_path(file_path))
+    return _replay(df if df is not None else pd.DataFrame(), records, key)
+
+
+def _write_temp(file_path, df):
+    # 같은 폴더의 고유한 임시 파일에 기록 (프로세스끼리 임시 파일이 겹치지 않도록)
+    directory, name = os.path.split(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f, tracing.span('csv_write'):
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+            tracing.count('write_bytes', f.tell())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def _write_atomic(file_path, df):
+    # 임시 파일에 모두 쓴 뒤 rename: 읽는 쪽은 이전 파일 또는 완성된 새 파일만 보게 됨
+    os.replace(_write_temp(file_path, df), file_path)
+
+
+def save_table(file_path, df):
+    # 전체 저장: 저널 내용은 df에 이미 반영되어 있으므로 함께 정리
+    if _sql is not None:
+        _sql.write_table(file_path, df)
+        invalidate(file_path)
+        _notify(file_path, None, _sql.written_signatures(file_path))
+        return
+    with locked(file_path):
+        before = file_signature(file_path)
+        _write_atomic(file_path, df)
+        for path in (journal_path(file_path), _compacting_path(file_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        _pending[file_path] = 0
+        invalidate(file_path)
+        after = file_signature(file_path)
+    _notify(file_path, None, (before, after))
+
+
+# --- 함수: 변경 구독 ---
+def subscribe(file_path, callback, columns):
+    subs = _subscribers.setdefault(os.path.abspath(file_path), [])
+    if all(cb is not callback for cb, _ in subs):
+        subs.append((callback, list(columns)))
+
+
+def _subscribed_columns(file_path):
+    columns = []
+    for _, cols in _subscribers.get(os.path.abspath(file_path), []):
+        columns.extend(c for c in cols if c not in columns)
+    return columns
+
+
+def _notify(file_path, changes, sigs):
+    for callback, _ in list(_subscribers.get(os.path.abspath(file_path), [])):
+        callback(changes, sigs)
+
+
+def _current_rows(file_path, row_ids, key):
+    # 변경 전 행: 해당 키의 행만, 구독자가 필요로 하는 컬럼(+ 키, 행 버전)만 읽음 (본문 등은 파싱하지 않음)
+    # 반환: {키: [행, ...]} (값 타입은 snapshot과 같게 schema로 적용)
+    row_ids = list(dict.fromkeys(str(row_id) for row_id in row_ids))
+    usecols = set(_subscribed_columns(file_path)) | {key, VERSION_COLUMN}
+    found, _ = _rows_by_key(file_path, row_ids, key, usecols)
+    rows = [row for row_id in row_ids for row in found[row_id]]
+    if not rows:
+        return found
+    columns = list(dict.fromkeys(col for row in rows for col in row))
+    typed = schema.apply_types(file_path, pd.DataFrame(rows, columns=columns)).to_dict('records')
+    start = 0
+    for row_id in row_ids:
+        count = len(found[row_id])
+        found[row_id] = typed[start:start + count]
+        start += count
+    return found
+
+
+# --- 함수: 행 단위 변경 ---
+def insert_row(file_path, row, key='ID'):
+    cells = {k: _to_cell(v) for k, v in row.items()}
+    if _sql is not None:
+        _sql.insert_row(file_path, cells, key)
+        sigs = _sql.written_signatures(file_path)
+    else:
+        sigs = _append(file_path, [{'op': 'insert', 'id': cells.get(key), 'row': cells}], key)
+    _notify(file_path, [(None, cells)], sigs)
+
+
+def row_version(row):
+    # 버전 값이 없는 기존 행은 0
+    value = row.get(VERSION_COLUMN) if row is not None else None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def next_version(old_row, row_id, expected_version):
+    # 수정 시 기록할 새 버전 (버전 관리 대상이 아니면 None). 화면에서 본 버전과 다르면 거부
+    if expected_version is not None:
+        if old_row is None:
+            raise StaleWriteError(f"{row_id}: 이미 삭제된 행입니다.")
+        if row_version(old_row) != int(expected_version):
+            raise StaleWriteError(f"{row_id}: 다른 사용자가 먼저 수정했습니다. (버전 {expected_version} -> {row_version(old_row)})")
+    elif old_row is None or _to_cell(old_row.get(VERSION_COLUMN)) is None:
+        return None
+    return str(row_version(old_row) + 1)
+
+
+def update_row(file_path, row_id, changes, key='ID', expected_version=None):
+    cells = {k: _to_cell(v) for k, v in changes.items()}
+    if _sql is not None:
+        # 변경 전 행 확인과 버전 검사를 같은 쓰기 트랜잭션 안에서 수행
+        old_rows = _sql.update_row(file_path, row_id, cells, key, _subscribed_columns(file_path), expected_version)
+        sigs = _sql.written_signatures(file_path)
+    else:
+        # 읽기(버전 확인) -> 저널 추가를 하나의 배타 잠금 안에서 수행
+        with locked(file_path):
+            old_rows = _current_rows(file_path, [row_id], key)[str(row_id)]
+            version = next_version(old_rows[0] if old_rows else None, row_id, expected_version)
+            if version is not None:
+                cells[VERSION_COLUMN] = version
+            sigs = _append(file_path, [{'op': 'update', 'id': str(row_id), 'row': cells}], key)
+    if old_rows:
+        _notify(file_path, [(old_rows[0], {**old_rows[0], **cells})], sigs)
+
+
+def update_rows(file_path, updates, key='ID', expected_versions=None):
+    # 여러 행 수정을 한 번의 쓰기로: updates = {행 ID: 변경 내용}, expected_versions = {행 ID: 화면에서 본 버전}
+    # 버전이 하나라도 맞지 않으면 아무것도 기록하지 않고 StaleWriteError. 구독자에게는 한 번만 알림
+    expected_versions = expected_versions or {}
+    batch = [(str(row_id), {k: _to_cell(v) for k, v in changes.items()}) for row_id, changes in updates.items()]
+    if not batch:
+        return
+    if _sql is not None:
+        changes = _sql.update_rows(file_path, batch, key, _subscribed_columns(file_path),
+                                   {str(k): v for k, v in expected_versions.items()})
+        sigs = _sql.written_signatures(file_path)
+    else:
+        with locked(file_path):
+            found = _current_rows(file_path, [row_id for row_id, _ in batch], key)
+            current = {row_id: rows[0] for row_id, rows in found.items() if rows}
+            records, changes = [], []
+            for row_id, cells in batch:
+                old_row = current.get(row_id)
+                version = next_version(old_row, row_id, expected_versions.get(row_id))
+                if version is not None:
+                    cells = dict(cells, **{VERSION_COLUMN: version})
+                records.append({'op': 'update', 'id': row_id, 'row': cells})
+                if old_row is not None:
+                    changes.append((old_row, {**old_row, **cells}))
+            sigs = _append(file_path, records, key)
+    if changes:
+        _notify(file_path, changes, sigs)
+
+
+def delete_row(file_path, row_id, key='ID'):
+    if _sql is not None:
+        old_rows = _sql.delete_row(file_path, row_id, key, _subscribed_columns(file_path))
+        sigs = _sql.written_signatures(file_path)
+    else:
+        with locked(file_path):
+            old_rows = _current_rows(file_path, [row_id], key)[str(row_id)] if os.path.abspath(file_path) in _subscribers else []
+            sigs = _append(file_path, [{'op': 'delete', 'id': str(row_id)}], key)
+    if old_rows:
+        _notify(file_path, [(old, None) for old in old_rows], sigs)
+
+
+# --- 함수: 저널 병합 (compaction) ---
+def compact(file_path, key='ID'):
+    # 병합은 내용을 바꾸지 않으므로 구독자에게는 빈 변경 목록과 시그니처만 알림
+    with locked(file_path):
+        # 현재 저널을 병합용으로 돌려놓고, 이후 변경은 새 저널에 기록되게 함
+        before = file_signature(file_path)
+        src = journal_path(file_path)
+        dst = _compacting_path(file_path)
+        if os.path.exists(src):
+            if os.path.exists(dst):
+                with open(src, 'r', encoding='utf-8') as f_src, open(dst, 'a', encoding='utf-8') as f_dst:
+                    f_dst.write(f_src.read())
+                os.remove(src)
+            else:
+                os.replace(src, dst)
+        if not os.path.exists(dst):
+            return
+        _pending[file_path] = 0
+        base = _read_base(file_path)
+        records = _read_journal(dst)
+        sig = file_signature(file_path)
+        dst_sig = sig[:2]
+    _notify(file_path, [], (before, sig))
+
+    # 무거운 CSV 쓰기는 잠금 밖에서 수행
+    if base is None:
+        base = pd.DataFrame()
+    tmp_path = _write_temp(file_path, _replay(base, records, key))
+
+    with locked(file_path):
+        if file_signature(file_path)[:2] != dst_sig:
+            # 병합 중 save_table()로 전체 저장되었거나 다른 프로세스가 병합 대상을 바꾼 경우: 결과는 버림
+            os.remove(tmp_path)
+            return
+        before = file_signature(file_path)
+        os.replace(tmp_path, file_path)
+        os.remove(dst)
+        invalidate(file_path)
+        after = file_signature(file_path)
+    _notify(file_path, [], (before, after))
+
+
+def compact_in_background(file_path, key='ID'):
+    with _locks_guard:
+        if file_path in _compacting:
+            return
+        _compacting.add(file_path)
+
+    def worker():
+        try:
+            compact(file_path, key)
+        finally:
+            with _locks_guard:
+                _compacting.discard(file_path)
+
+    threading.Thread(target=worker, name=f"compact:{file_path}", daemon=True).start()
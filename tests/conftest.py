@@ -0,0 +1,19 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA_FILES = ['users.csv', 'suggestions.csv', 'circle_activity.csv', 'level_settings.csv']
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # 저장소의 기본 데이터 파일 사본이 있는 임시 폴더에서 실행 (데이터 파일 경로는 현재 폴더 기준)
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,99 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cube
+import derived
+import leaderboard
+import ledger
+import storage
+from config import SUGGESTION_FILE
+
+from conftest import ROOT
+
+
+@pytest.fixture(autouse=True)
+def subscribed(data_dir):
+    # 구독은 가져올 때의 절대 경로 기준이므로 임시 폴더에서 다시 등록
+    importlib.reload(ledger)
+
+
+def _pending_ids():
+    df = storage.snapshot(SUGGESTION_FILE, [], usecols=['상태'])
+    return df.loc[df['상태'].isin(['접수', '심사대기']), 'ID'].tolist()
+
+
+def _approve(row_id, points):
+    storage.update_row(SUGGESTION_FILE, row_id, {'상태': '채택', '등급': 'A', '포인트': points})
+
+
+def test_row_change_applies_delta_without_rebuild(data_dir, monkeypatch):
+    ledger.points_by_user()
+    rebuilds = []
+    original = derived.rebuild
+    monkeypatch.setattr(derived, 'rebuild', lambda agg: rebuilds.append(agg['file']) or original(agg))
+
+    _approve(_pending_ids()[0], 20)
+    ledger.points_by_user()
+    assert ledger.verify() == []
+    assert rebuilds == []
+
+
+def test_rebuild_racing_a_write_does_not_double_count(data_dir, monkeypatch):
+    ledger.points_by_user()
+    delivered = []
+    monkeypatch.setattr(storage, '_notify', lambda file_path, changes, sigs: delivered.append((file_path, changes, sigs)))
+    _approve(_pending_ids()[0], 20)
+    monkeypatch.undo()
+
+    # 알림이 전달되기 전에 (다른 프로세스의) 재구축이 이미 바뀐 원본을 읽음
+    ledger.rebuild()
+    for file_path, changes, sigs in delivered:
+        storage._notify(file_path, changes, sigs)
+    assert ledger.verify() == []
+
+
+def test_rewrite_without_subscribers_is_detected(data_dir):
+    ledger.points_by_user()
+    # 구독자 없이 원본 전체를 다시 쓰는 CLI (마이그레이션 등)
+    row_id = _pending_ids()[0]
+    script = (
+        "import storage\n"
+        f"df = storage.load_table({SUGGESTION_FILE!r}, []).astype(object)\n"
+        f"df.loc[df['ID'] == {row_id!r}, ['상태', '등급', '포인트']] = ['채택', 'A', 20]\n"
+        f"storage.save_table({SUGGESTION_FILE!r}, df)\n"
+    )
+    subprocess.run([sys.executable, '-c', script], check=True, env=dict(os.environ, PYTHONPATH=ROOT))
+    storage.invalidate(SUGGESTION_FILE)
+
+    author = storage.lookup(SUGGESTION_FILE, row_id).iloc[0]['작성자ID']
+    expected = ledger.compute_from_table(storage.snapshot(SUGGESTION_FILE, [], usecols=ledger.SOURCE_COLUMNS))
+    assert ledger.get_user_points(author) == expected[author]['포인트']
+    assert ledger.verify() == []
+
+
+def test_deleted_ledger_file_is_rebuilt(data_dir):
+    ledger.points_by_user()
+    os.remove(ledger.LEDGER_FILE)   # 시그니처 기록은 남아 있음
+    _approve(_pending_ids()[0], 20)
+    assert ledger.verify() == []
+
+
+def test_leaderboard_follows_row_changes(data_dir):
+    importlib.reload(leaderboard)
+    leaderboard.dept_ranking()
+    _approve(_pending_ids()[0], 20)
+    expected = leaderboard.compute_from_table(storage.snapshot(SUGGESTION_FILE, [], usecols=leaderboard.SOURCE_COLUMNS))
+    assert derived.stored(leaderboard._leaderboard) == expected
+
+
+def test_cube_follows_row_changes(data_dir):
+    importlib.reload(cube)
+    cube.dept_counts(*cube.trailing_months(1), [])
+    row_id = _pending_ids()[0]
+    _approve(row_id, 20)
+    storage.update_row(SUGGESTION_FILE, _pending_ids()[0], {'부서': '새부서'})
+    assert cube.verify() == []
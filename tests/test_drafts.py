@@ -0,0 +1,24 @@
+import pytest
+
+import drafts
+import storage
+from config import SUGGESTION_FILE
+
+
+def test_submit_ignores_draft_quotas(data_dir):
+    for i in range(drafts.MAX_DRAFTS_PER_USER):
+        drafts.save_draft('u1', f"글 {i}", "본문")
+    with pytest.raises(drafts.DraftError):
+        drafts.save_draft('u1', "새 글", "본문")
+
+    body = "가" * drafts.MAX_DRAFT_BYTES
+    row_id = drafts.submit('u1', "사용자", "부서", "큰 제안", body)
+    row = storage.lookup(SUGGESTION_FILE, row_id).iloc[0]
+    assert row['제목'] == "큰 제안" and row['상태'] == "접수" and len(row['내용']) == len(body)
+
+
+def test_submit_removes_edited_draft(data_dir):
+    draft_id = drafts.save_draft('u1', "제목", "본문")
+    row_id = drafts.submit('u1', "사용자", "부서", "제목", "고친 본문", draft_id=draft_id)
+    assert drafts.get_draft(draft_id) is None
+    assert storage.lookup(SUGGESTION_FILE, row_id).iloc[0]['내용'] == "고친 본문"
@@ -0,0 +1,58 @@
+import json
+
+import pandas as pd
+
+import events
+import schema
+import storage
+from config import EVENT_LOG_FILE, USER_FILE
+
+
+def _passwords(df):
+    values = df['비밀번호'].dropna().astype(str)
+    return [v for v in values if v.strip()]
+
+
+def _assert_no_credentials(secrets):
+    with open(EVENT_LOG_FILE, encoding='utf-8') as f:
+        text = f.read()
+    # 짧은 값('1' 등)은 다른 내용과 우연히 겹치므로 본문 검색은 6자 이상만 (컬럼 자체는 아래에서 모두 확인)
+    for secret in secrets:
+        if len(secret) >= 6:
+            assert secret not in text
+    for line in text.splitlines():
+        event = json.loads(line)
+        rows = [event.get('row') or {}, event.get('changes') or {}] + (event.get('rows') or [])
+        assert all('비밀번호' not in row for row in rows), event['type']
+
+
+def test_no_credentials_in_event_log(data_dir):
+    plain = _passwords(pd.read_csv(USER_FILE, dtype=str))
+    assert 'hhjj7890&' in plain
+
+    # v1(이벤트 로그 시작 + snapshot) -> v2(비밀번호 해시) 순서로 실행
+    schema.migrate()
+    users = storage.load_table(USER_FILE, [], key='사번')
+    hashed = _passwords(users)
+
+    events.record_rewrite(USER_FILE, users, 'account_delete', 'administrator')
+    row = users.iloc[0].to_dict()
+    events.record('account_delete', 'administrator', USER_FILE, row['사번'], row=row, changes={'비밀번호': hashed[0]})
+
+    _assert_no_credentials(plain + hashed)
+
+
+def test_redact_log_removes_old_credentials(data_dir):
+    old = {'ts': '2026-01-01T00:00:00', 'type': 'snapshot', 'actor': '', 'table': USER_FILE,
+           'rows': [{'사번': 'u1', '비밀번호': 'plain-secret', '이름': 'a'}]}
+    other = {'ts': '2026-01-01T00:00:01', 'type': 'submit', 'actor': 'u1', 'table': 'suggestions.csv',
+             'id': 'S1', 'row': {'ID': 'S1', '제목': 't'}}
+    with open(EVENT_LOG_FILE, 'w', encoding='utf-8') as f:
+        for event in (old, other):
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    assert events.redact_log() == 1
+    _assert_no_credentials(['plain-secret'])
+    logged, _ = events.read_since(0)
+    assert logged[0]['rows'] == [{'사번': 'u1', '이름': 'a'}]
+    assert logged[1] == other
@@ -0,0 +1,32 @@
+import query
+import storage
+from config import SUGGESTION_FILE
+
+
+def _count_matches(monkeypatch):
+    calls = []
+    original = query._match_positions
+
+    def counting(index, filters):
+        calls.append(dict(filters))
+        return original(index, filters)
+
+    monkeypatch.setattr(query, '_match_positions', counting)
+    return calls
+
+
+def test_filter_runs_once_per_data_version(data_dir, monkeypatch):
+    calls = _count_matches(monkeypatch)
+    filters = {'status': "전체", 'grade': "전체", 'name': "", 'title': ""}
+
+    page_df, total = query.query_suggestions(filters, 1, 15)
+    titles = query.filtered_titles(filters)
+    row_id = query.find_by_title(filters, titles[0])
+    assert len(calls) == 1
+    assert total == len(storage.snapshot(SUGGESTION_FILE, [], usecols=['ID']))
+    assert row_id is not None and len(page_df) == min(total, 15)
+
+    # 데이터가 바뀌면 다시 계산
+    storage.update_row(SUGGESTION_FILE, row_id, {'제목': "바뀐 제목"}, key='ID')
+    assert "바뀐 제목" in query.filtered_titles(filters)
+    assert len(calls) == 2
@@ -0,0 +1,16 @@
+import sqlite_store
+
+
+def test_read_missing_table_does_not_create_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = 'drafts.csv'
+    table = sqlite_store.table_name(path)
+
+    df = sqlite_store.read_table(path, ['ID', '제목', '내용'], usecols=('ID', '제목'))
+    assert df.empty and list(df.columns) == ['ID', '제목']
+    assert sqlite_store._table_columns(sqlite_store.connect(), table) == []
+    assert sqlite_store.signature(path)[0] is None
+
+    sqlite_store.insert_row(path, {'ID': '1', '제목': "첫 글", '내용': "본문"})
+    df = sqlite_store.read_table(path, ['ID', '제목', '내용'])
+    assert df.to_dict('records') == [{'ID': '1', '제목': "첫 글", '내용': "본문"}]
@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+import pandas as pd
+
+from config import TRACE_ENABLED, TRACE_LOG_FILE
+
+# --- 설정: 성능 추적 (리런 단위 구간 시간 / 입출력 바이트) ---
+# TPM_TRACE=1 로 서버를 시작했을 때만 기록한다. 꺼져 있으면
+#  - traced()는 함수를 그대로 돌려주고 (호출 비용 없음)
+#  - span()/count()는 전역 플래그 하나만 확인하고 바로 반환한다.
+# 켜져 있으면 스크립트 실행(리런)마다 구간별 (호출 수, 누적 ms)와 카운터(읽기/쓰기 바이트)를 모아
+# 리런이 끝날 때 trace.jsonl 에 한 줄로 추가하고, 세션별 누적값과 최근 기록을 메모리에 보관한다.
+# 구간이 중첩되면 바깥 구간 시간에 안쪽 구간 시간이 포함된다.
+# 프래그먼트만 다시 실행될 때는 스크립트 위쪽의 begin_rerun()이 실행되지 않으므로, fragment()로 감싼
+# 프래그먼트 본문은 그 자체를 하나의 리런 기록('fragment'에 이름)으로 남긴다. 전체 리런 안에서는 구간으로 기록.
+# 세션별 누적값은 최근 기록한 SESSION_TOTALS_MAX개 세션만, 마지막 기록 후 SESSION_IDLE_TTL초까지 보관한다.
+ENABLED = TRACE_ENABLED
+RECENT_RERUNS = 200       # 진단 화면에 보여줄 최근 리런 기록 수 (전체 세션)
+SESSION_TOTALS_MAX = 500
+SESSION_IDLE_TTL = 24 * 3600   # 초
+
+_local = threading.local()   # 현재 스레드(스크립트 실행)의 리런 기록
+_guard = threading.Lock()
+_sessions = OrderedDict()    # 세션 ID -> {'reruns', 'ms', 'spans', 'counters', 'last'} (오래 기록이 없던 세션부터)
+_recent = deque(maxlen=RECENT_RERUNS)
+_NULL_SPAN = nullcontext()
+
+
+# --- 함수: 구간/카운터 기록 ---
+def _current():
+    return getattr(_local, 'run', None)
+
+
+@contextmanager
+def _span(run, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = run['spans'].setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += (time.perf_counter() - start) * 1000
+
+
+def span(name):
+    # with tracing.span('이름'): ...  (리런 밖이거나 꺼져 있으면 아무것도 하지 않음)
+    if not ENABLED:
+        return _NULL_SPAN
+    run = _current()
+    if run is None:
+        return _NULL_SPAN
+    return _span(run, name)
+
+
+def traced(name):
+    # 함수 전체를 하나의 구간으로 기록하는 데코레이터
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def fragment(name, context):
+    # 프래그먼트 함수용 데코레이터 (@st.fragment 아래에 붙임). context() -> (세션 ID, 사번)
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current() is not None:
+                with span(name):
+                    return func(*args, **kwargs)
+            session_id, user_id = context()
+            begin_rerun(session_id, user_id, fragment=name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_rerun()
+        return wrapper
+    return decorate
+
+
+def count(name, amount):
+    # 카운터 누적 (예: 'read_bytes', 'write_bytes')
+    if not ENABLED:
+        return
+    run = _current()
+    if run is not None:
+        run['counters'][name] = run['counters'].get(name, 0) + amount
+
+
+# --- 함수: 리런 시작/종료 ---
+def begin_rerun(session_id, user_id="", fragment=""):
+    if not ENABLED:
+        return
+    if _current() is not None:
+        end_rerun()  # 이전 실행이 예외로 끝나 종료 기록이 빠진 경우
+    _local.run = {'session': session_id, 'user': user_id, 'fragment': fragment, 'start': time.perf_counter(),
+                  'spans': {}, 'counters': {}}
+
+
+def end_rerun():
+    if not ENABLED:
+        return None
+    run = _current()
+    if run is None:
+        return None
+    _local.run = None
+    record = {
+        'ts': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'session': run['session'],
+        'user': run['user'],
+        'fragment': run['fragment'],
+        'ms': round((time.perf_counter() - run['start']) * 1000, 2),
+        'spans': {name: [n, round(ms, 2)] for name, (n, ms) in run['spans'].items()},
+        'counters': run['counters'],
+    }
+    now = time.monotonic()
+    with _guard:
+        total = _sessions.setdefault(run['session'], {'reruns': 0, 'ms': 0.0, 'spans': {}, 'counters': {}})
+        total['last'] = now
+        _sessions.move_to_end(run['session'])
+        while _sessions:
+            oldest = next(iter(_sessions.values()))
+            if len(_sessions) <= SESSION_TOTALS_MAX and now - oldest['last'] <= SESSION_IDLE_TTL:
+                break
+            _sessions.popitem(last=False)
+        total['reruns'] += 1
+        total['ms'] += record['ms']
+        for name, (n, ms) in record['spans'].items():
+            entry = total['spans'].setdefault(name, [0, 0.0])
+            entry[0] += n
+            entry[1] += ms
+        for name, amount in record['counters'].items():
+            total['counters'][name] = total['counters'].get(name, 0) + amount
+        _recent.append(record)
+        try:
+            with open(TRACE_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # 로그 파일을 쓸 수 없어도 앱 동작에는 영향 없음
+    return record
+
+
+# --- 함수: 진단 화면용 조회 ---
+def recent_reruns(session_id=None):
+    with _guard:
+        records = list(_recent)
+    if session_id is not None:
+        records = [r for r in records if r['session'] == session_id]
+    return records
+
+
+def session_totals():
+    with _guard:
+        return {sid: dict(total, spans=dict(total['spans']), counters=dict(total['counters']))
+                for sid, total in _sessions.items()}
+
+
+def span_summary(records):
+    # 리런 기록들의 구간별 합계: 구간, 호출 수, 누적 ms, 리런당 평균 ms
+    totals = {}
+    for record in records:
+        for name, (n, ms) in record['spans'].items():
+            entry = totals.setdefault(name, [0, 0.0])
+            entry[0] += n
+            entry[1] += ms
+    df = pd.DataFrame([(name, n, ms) for name, (n, ms) in totals.items()], columns=['구간', '호출 수', '누적 ms'])
+    df['리런당 ms'] = df['누적 ms'] / max(len(records), 1)
+    return df.sort_values('누적 ms', ascending=False).reset_index(drop=True)
+
+
+def rerun_table(records):
+    return pd.DataFrame([{
+        '시각': r['ts'],
+        '세션': r['session'],
+        '사용자': r['user'],
+        '프래그먼트': r.get('fragment', ""),
+        '리런 ms': r['ms'],
+        '읽기 KB': r['counters'].get('read_bytes', 0) / 1024,
+        '쓰기 KB': r['counters'].get('write_bytes', 0) / 1024,
+    } for r in records])
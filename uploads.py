@@ -0,0 +1,131 @@
+import hashlib
+import mimetypes
+import os
+import tempfile
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+import storage
+from config import ATTACHMENT_DIR, ATTACHMENT_FILE
+
+# --- 설정: 첨부파일 저장소 ---
+# 업로드 파일을 CHUNK_SIZE 단위로 임시 파일에 쓰면서 동시에 sha256을 계산하고,
+# 'uploads/files/<해시 앞 2자리>/<해시>' 에 한 번만 저장한다 (같은 내용은 중복 저장하지 않음).
+# 업로드마다 attachments.csv 에 메타데이터(파일명, 크기, MIME, 해시, 업로더)를 한 행 기록하고,
+# 제안/분임조 행의 '첨부파일' 컬럼에는 파일ID만 남긴다.
+CHUNK_SIZE = 1024 * 1024                  # 1MB
+MAX_FILE_SIZE = 100 * 1024 * 1024         # 파일 1개 최대 크기 (100MB)
+USER_QUOTA = 1024 * 1024 * 1024           # 사용자별 누적 용량 (1GB, 같은 내용은 한 번만 계산)
+
+ATTACHMENT_KEY = '파일ID'
+ATTACHMENT_COLUMNS = [ATTACHMENT_KEY, '다이제스트', '파일명', '크기', 'MIME', '업로더ID', '업로드일시']
+
+
+class UploadError(Exception):
+    pass
+
+
+def _format_size(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.0f}KB"
+
+
+def blob_path(digest):
+    return os.path.join(ATTACHMENT_DIR, digest[:2], digest)
+
+
+# --- 함수: 메타데이터 조회 ---
+def load_attachments():
+    return storage.load_table(ATTACHMENT_FILE, ATTACHMENT_COLUMNS, key=ATTACHMENT_KEY)
+
+
+def user_usage(user_id, df=None):
+    # 사용자가 올린 파일의 총 용량 (같은 내용을 여러 번 올려도 한 번만 계산)
+    if df is None:
+        df = load_attachments()
+    mine = df[df['업로더ID'] == str(user_id)].drop_duplicates('다이제스트')
+    return int(pd.to_numeric(mine['크기'], errors='coerce').fillna(0).sum())
+
+
+# --- 함수: 업로드 저장 (청크 단위 스트리밍 + 해시) ---
+def _check_quota(user_id, size, digest=None):
+    df = load_attachments()
+    if digest is not None and ((df['업로더ID'] == str(user_id)) & (df['다이제스트'] == digest)).any():
+        return  # 이미 올린 적 있는 내용은 용량을 더 차지하지 않음
+    used = user_usage(user_id, df)
+    if used + size > USER_QUOTA:
+        raise UploadError(f"업로드 용량을 초과했습니다. (사용 {_format_size(used)} / 한도 {_format_size(USER_QUOTA)})")
+
+
+def _stream_to_temp(source):
+    # 파일 전체를 메모리에 올리지 않고 CHUNK_SIZE씩 읽어 임시 파일에 기록하며 해시 계산
+    os.makedirs(ATTACHMENT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='upload.', suffix='.tmp', dir=ATTACHMENT_DIR)
+    sha = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise UploadError(f"파일 크기가 최대 {_format_size(MAX_FILE_SIZE)}를 초과합니다.")
+                sha.update(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, sha.hexdigest(), size
+
+
+def save_upload(uploaded_file, user_id):
+    # 반환: 파일ID ('첨부파일' 컬럼에 저장). 파일이 없으면 ""
+    if uploaded_file is None:
+        return ""
+
+    declared = getattr(uploaded_file, 'size', None)
+    if declared is not None:
+        # 스트리밍 전에 선언된 크기로 먼저 확인 (실제 크기는 쓰면서 다시 확인)
+        # 용량 한도는 중복 여부(해시)를 알아야 하므로 저장 직전에 확인
+        if declared > MAX_FILE_SIZE:
+            raise UploadError(f"파일 크기가 최대 {_format_size(MAX_FILE_SIZE)}를 초과합니다.")
+
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    tmp_path, digest, size = _stream_to_temp(uploaded_file)
+
+    name = os.path.basename(getattr(uploaded_file, 'name', '') or 'file')
+    mime = getattr(uploaded_file, 'type', None) or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    record = {
+        ATTACHMENT_KEY: f"{uuid.uuid4().hex[:16]}_{name}",
+        '다이제스트': digest,
+        '파일명': name,
+        '크기': size,
+        'MIME': mime,
+        '업로더ID': str(user_id),
+        '업로드일시': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    # 용량 확인 -> 파일 등록 -> 메타데이터 기록을 한 잠금 안에서 (동시 업로드로 한도를 넘지 않도록)
+    with storage.locked(ATTACHMENT_FILE):
+        try:
+            _check_quota(user_id, size, digest)
+            target = blob_path(digest)
+            if os.path.exists(target):
+                os.remove(tmp_path)  # 같은 내용이 이미 있음 -> 중복 저장하지 않음
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        storage.insert_row(ATTACHMENT_FILE, record, key=ATTACHMENT_KEY)
+    return record[ATTACHMENT_KEY]